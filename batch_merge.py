@@ -0,0 +1,166 @@
+"""여러 증빙 폴더를 한 번에 병합하는 일괄 처리
+
+상위 폴더 아래에서 병합할 파일이 들어 있는 하위 폴더를 모두 찾아 폴더마다 병합
+작업을 하나씩 큐에 넣고, 정해진 수만큼 동시에 실행합니다. 각 폴더에는 평소처럼
+<폴더명>_merged.pdf가 만들어지고, 끝나면 전체 결과를 하나의 요약으로 돌려줍니다.
+"""
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from merge_engine import (
+    MergeOptions, default_output_path, divide_workers, list_source_files, merge_folder, natural_sort_key,
+    own_backend
+)
+
+# 동시에 병합할 폴더 수 기본값
+DEFAULT_FOLDER_WORKERS = 2
+
+
+def _noop(*args, **kwargs):
+    pass
+
+
+def _display_name(root, folder):
+    try:
+        return folder.relative_to(root).as_posix()
+    except ValueError:
+        return folder.name
+
+
+def find_batch_folders(root):
+    """병합할 파일이 바로 안에 들어 있는 하위 폴더를 자연 정렬 순서로 찾습니다 (상위 폴더 자신 제외)."""
+    root = Path(root)
+    folders = []
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as it:
+                subdirs = [Path(entry.path) for entry in it
+                           if entry.is_dir(follow_symlinks=False) and not entry.name.startswith(('.', '__'))]
+        except OSError:
+            continue
+        for subdir in subdirs:
+            if list_source_files(subdir):
+                folders.append(subdir)
+            pending.append(subdir)
+    return sorted(folders, key=lambda folder: natural_sort_key(str(folder.relative_to(root))))
+
+
+@dataclass
+class BatchJob:
+    """폴더 하나의 병합 작업"""
+    folder: Path
+    output_path: Path
+    name: str = ""          # 상위 폴더 기준 상대 경로 (로그/요약 표시용)
+    report: object = None   # 병합이 끝나면 MergeReport
+    error: str = None       # 병합 자체가 실패하면 오류 메시지
+
+
+@dataclass
+class BatchReport:
+    """일괄 병합 결과 요약"""
+    root: Path = None
+    jobs: list = field(default_factory=list)
+
+    @property
+    def failed_jobs(self):
+        return [job for job in self.jobs if job.error is not None]
+
+    @property
+    def partial_jobs(self):
+        """병합은 됐지만 일부 파일이 빠진 폴더"""
+        return [job for job in self.jobs if job.report is not None and job.report.failed_files]
+
+    def summary_lines(self):
+        """로그에 출력할 요약 줄 목록"""
+        done = [job for job in self.jobs if job.report is not None]
+        lines = [
+            "\n" + "="*60,
+            "📦 일괄 병합 요약",
+            "="*60,
+            f"상위 폴더: {self.root}",
+            f"총 폴더 수: {len(self.jobs)}개",
+            f"병합 완료: {len(done)}개 (일부 파일 제외: {len(self.partial_jobs)}개)",
+            f"병합 실패: {len(self.failed_jobs)}개",
+        ]
+
+        if done:
+            lines.append("\n✅ 병합된 폴더:")
+            for idx, job in enumerate(done, 1):
+                report = job.report
+                line = f"  {idx}. {job.name} - {len(report.successfully_merged)}/{report.total_files}개 파일"
+                lines.append(line + (f" (제외 {len(report.failed_files)}개)" if report.failed_files else ""))
+                for file_name, reason in report.failed_files:
+                    lines.append(f"      ⚠️ {file_name} - {reason}")
+                for file_name, reason in report.dropped_files:
+                    lines.append(f"      🔁 {file_name} - {reason}")
+
+        if self.failed_jobs:
+            lines.append("\n❌ 병합하지 못한 폴더:")
+            for idx, job in enumerate(self.failed_jobs, 1):
+                lines.append(f"  {idx}. {job.name} - {job.error}")
+
+        lines.append("="*60 + "\n")
+        return lines
+
+
+def run_batch(root, options=None, workers=DEFAULT_FOLDER_WORKERS, log=_noop, progress=_noop, folders=None):
+    """root 아래의 하위 폴더를 폴더마다 병합하고 BatchReport를 반환합니다.
+
+    workers: 동시에 병합할 폴더 수 (이미지/문서 변환 프로세스 수는 폴더 수로 나눠 씀)
+    folders: 병합할 폴더 목록 (None이면 find_batch_folders(root))
+    log/progress: GUI의 log, update_progress와 같은 형식의 콜백
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    root = Path(root)
+    options = options or MergeOptions()
+    folders = find_batch_folders(root) if folders is None else [Path(f) for f in folders]
+    report = BatchReport(root=root)
+    if not folders:
+        return report
+
+    workers = max(1, min(workers, len(folders)))
+    # 폴더마다 CPU 코어 수만큼 이미지 변환 프로세스, 종류별 한도만큼 문서 변환 프로세스를 띄우지 않도록 나눠 씀
+    options = divide_workers(options, workers)
+
+    report.jobs = [BatchJob(folder, default_output_path(folder), _display_name(root, folder)) for folder in folders]
+    log(f"폴더 {len(folders)}개를 일괄 병합합니다 (동시 {workers}개)...")
+
+    # 폴더별 진행률을 합쳐서 전체 진행률로 표시
+    job_progress = [0.0] * len(report.jobs)
+    lock = threading.Lock()
+
+    def run_job(index, job):
+        def job_log(message):
+            log(f"[{job.name}] {message}")
+
+        def job_progress_update(value, text):
+            with lock:
+                job_progress[index] = value
+                overall = sum(job_progress) / len(job_progress)
+            progress(overall, f"일괄 병합 중 ({job.name}: {text})")
+
+        paths = [job.folder / name for name in list_source_files(job.folder)]
+        return merge_folder(paths, job.output_path, own_backend(options), log=job_log,
+                            progress=job_progress_update)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_job, index, job): job for index, job in enumerate(report.jobs)}
+        finished = 0
+        for future in as_completed(futures):
+            job = futures[future]
+            finished += 1
+            try:
+                job.report = future.result()
+            except Exception as e:
+                job.error = str(e)
+                log(f"❌ [{job.name}] 병합 실패: {e}")
+            else:
+                log(f"✓ [{job.name}] 병합 완료 ({finished}/{len(report.jobs)})")
+
+    progress(100, "완료!")
+    return report
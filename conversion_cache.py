@@ -0,0 +1,130 @@
+"""변환된 PDF를 실행 간에 재사용하는 캐시
+
+원본 파일 내용의 해시, 변환기 종류, 변환 옵션을 키로 사용합니다. 사용자 캐시 폴더에
+저장하며 전체 크기가 상한을 넘으면 가장 오래 쓰지 않은 항목부터 지웁니다(LRU).
+"""
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# 키 형식이나 변환 결과가 바뀌면 올려서 이전 캐시를 무효화
+CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024  # 1 GB
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def default_cache_dir():
+    """사용자별 캐시 폴더 (Windows: %LOCALAPPDATA%, 그 외: ~/.cache)"""
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~\\AppData\\Local')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return Path(base) / 'pdf_merge' / 'conversions'
+
+
+def file_digest(path):
+    """파일 내용의 SHA-256 해시"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ConversionCache:
+    """내용 주소 기반 변환 결과 캐시"""
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = Path(directory) if directory else default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def key_for(self, source_path, converter, options=None, digest=None):
+        """원본 내용 해시 + 변환기 + 변환 옵션으로 캐시 키를 만듭니다."""
+        material = json.dumps({
+            'version': CACHE_VERSION,
+            'content': digest or file_digest(source_path),
+            'converter': converter,
+            'options': options or {},
+        }, sort_keys=True)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _path_for(self, key):
+        return self.directory / key[:2] / f"{key}.pdf"
+
+    def get(self, key):
+        """캐시된 PDF 경로를 돌려주고, 없으면 None (적중/미스는 MergeReport.cache_hits/misses에 기록)"""
+        path = self._path_for(key)
+        try:
+            # 최근 사용 시각 갱신 (LRU 기준)
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def put(self, key, pdf_path):
+        """변환된 PDF 파일을 캐시에 복사하고 캐시 안의 경로를 돌려줍니다."""
+        return self._store(key, lambda temp_name: shutil.copyfile(pdf_path, temp_name))
+
+    def put_bytes(self, key, data):
+        """메모리의 PDF 바이트를 캐시에 저장하고 캐시 안의 경로를 돌려줍니다."""
+        def write(temp_name):
+            with open(temp_name, 'wb') as f:
+                f.write(data)
+        return self._store(key, write)
+
+    def _store(self, key, write):
+        path = self._path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 다른 프로세스가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        fd, temp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        os.close(fd)
+        try:
+            write(temp_name)
+            os.replace(temp_name, path)
+        except BaseException:
+            if os.path.exists(temp_name):
+                os.remove(temp_name)
+            raise
+        return path
+
+    def _entries(self):
+        if not self.directory.is_dir():
+            return []
+        entries = []
+        for sub in os.scandir(self.directory):
+            if not sub.is_dir():
+                continue
+            for entry in os.scandir(sub.path):
+                if entry.is_file() and entry.name.endswith('.pdf'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def size(self):
+        """캐시 전체 크기 (바이트)"""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """전체 크기가 상한 이하가 될 때까지 오래 쓰지 않은 항목을 지우고, 지운 개수를 돌려줍니다."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        """캐시를 모두 지웁니다."""
+        if self.directory.is_dir():
+            shutil.rmtree(self.directory)
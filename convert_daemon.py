@@ -0,0 +1,314 @@
+"""문서 → PDF 변환 데몬 (daemon_client의 상대편)
+
+로컬 TCP 포트에서 기다리다가 한 줄에 JSON 하나인 요청을 받아 변환하고, 끝나는 순서대로
+응답합니다 (프로토콜은 daemon_client 참고). 연결이 없는 채로 --idle-timeout초가 지나면
+스스로 종료하고(멈춘 변환이 남아 있어도), {"command": "exit"} 줄을 받으면 변환 중이던
+문서를 버리고 바로 종료합니다 (토큰을 가진 클라이언트라면 누구든 멈춘 데몬을 끝낼 수 있음).
+
+포트를 연 뒤 띄울 때마다 새 토큰을 만들어 토큰 파일(daemon_client.token_path)에 쓰고,
+요청마다 토큰을 확인해 맞지 않으면 연결을 끊습니다. 종료할 때 토큰 파일을 지웁니다.
+
+    python convert_daemon.py                # LibreOffice(soffice --headless)로 변환
+                                            # (uno를 불러올 수 있는 Python, 보통 LibreOffice의 program/python)
+    python convert_daemon.py --fake         # 빈 PDF를 쓰는 대역 (테스트/벤치마크용)
+
+LibreOffice 모드는 soffice를 하나 띄워 UNO로 연결해 두고 문서를 차례로 변환합니다.
+soffice가 죽으면 데몬도 종료하므로 클라이언트가 데몬을 다시 띄웁니다.
+"""
+import argparse
+import errno
+import hmac
+import json
+import os
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from daemon_client import DEFAULT_DAEMON_ADDRESS, EXIT_ADDRESS_IN_USE, new_token, token_path, write_token
+
+# 연결 없이 이 시간(초)이 지나면 데몬 종료
+DEFAULT_IDLE_TIMEOUT = 600
+
+
+class FakeConverter:
+    """Office 없이 빈 페이지 PDF를 쓰는 대역 변환기
+
+    fail_names는 변환 오류, hang_names는 hang_seconds초 멈춤, crash_names는 데몬을 즉시 종료
+    """
+
+    def __init__(self, latency=0.0, fail_names=(), hang_names=(), crash_names=(), hang_seconds=3600.0):
+        self.latency = latency
+        self.fail_names = set(fail_names)
+        self.hang_names = set(hang_names)
+        self.crash_names = set(crash_names)
+        self.hang_seconds = hang_seconds
+
+    def convert(self, kind, input_path, output_path):
+        from converters import write_dummy_pdf
+
+        name = os.path.basename(input_path)
+        if name in self.crash_names:
+            os._exit(1)
+        if self.latency:
+            time.sleep(self.latency)
+        if name in self.hang_names:
+            time.sleep(self.hang_seconds)
+        if name in self.fail_names:
+            raise Exception("가짜 변환 오류")
+        write_dummy_pdf(output_path, name)
+
+
+class UnoConverter:
+    """soffice --headless 하나에 UNO로 연결해 문서를 변환합니다 (한 번에 하나씩)."""
+
+    FILTERS = {
+        'word': "writer_pdf_Export",
+        'hwp': "writer_pdf_Export",
+        'excel': "calc_pdf_Export",
+        'powerpoint': "impress_pdf_Export",
+    }
+
+    def __init__(self, soffice="soffice", port=DEFAULT_DAEMON_ADDRESS[1] + 1):
+        try:
+            import uno
+        except ImportError as e:
+            raise Exception(f"LibreOffice의 uno 모듈을 불러올 수 없습니다 "
+                            f"(LibreOffice에 포함된 Python으로 실행하거나 --daemon-python으로 지정하세요): {e}")
+        self._uno = uno
+        self._lock = threading.Lock()
+        accept = f"socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext"
+        self._process = subprocess.Popen(
+            [soffice, "--headless", "--invisible", "--nologo", "--norestore", "--nodefault", f"--accept={accept}"],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        local = uno.getComponentContext()
+        resolver = local.ServiceManager.createInstanceWithContext("com.sun.star.bridge.UnoUrlResolver", local)
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                context = resolver.resolve(f"uno:{accept}")
+                break
+            except Exception:
+                if self._process.poll() is not None or time.monotonic() > deadline:
+                    raise Exception("soffice에 연결할 수 없습니다")
+                time.sleep(0.2)
+        self._desktop = context.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", context)
+
+    def _property(self, name, value):
+        prop = self._uno.createUnoStruct("com.sun.star.beans.PropertyValue")
+        prop.Name, prop.Value = name, value
+        return prop
+
+    def convert(self, kind, input_path, output_path):
+        with self._lock:
+            try:
+                document = self._desktop.loadComponentFromURL(
+                    self._uno.systemPathToFileUrl(input_path), "_blank", 0,
+                    (self._property("Hidden", True), self._property("ReadOnly", True)))
+                if document is None:
+                    raise Exception("문서를 열 수 없습니다")
+                try:
+                    document.storeToURL(self._uno.systemPathToFileUrl(output_path),
+                                        (self._property("FilterName", self.FILTERS[kind]),))
+                finally:
+                    document.close(True)
+            except Exception:
+                if self._process.poll() is not None:
+                    # soffice가 죽음: 데몬을 끝내 클라이언트가 새로 띄우게 함
+                    os._exit(2)
+                raise
+
+    def kill(self):
+        """멈췄을 수 있는 soffice를 강제 종료합니다."""
+        self._process.kill()
+
+    def close(self):
+        try:
+            self._desktop.terminate()
+        except Exception:
+            pass
+        try:
+            self._process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """연결 하나: 요청 줄을 읽어 변환 스레드에 넘기고, 응답은 끝나는 대로 씀"""
+
+    def handle(self):
+        server = self.server
+        write_lock = threading.Lock()
+
+        def reply(message):
+            data = (json.dumps(message, ensure_ascii=False) + "\n").encode('utf-8')
+            with write_lock:
+                try:
+                    self.wfile.write(data)
+                except OSError:
+                    pass  # 클라이언트가 먼저 끊음
+
+        server.touch(1)
+        try:
+            for line in self.rfile:
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    continue
+                if not isinstance(request, dict) or not hmac.compare_digest(
+                        str(request.get('token', '')).encode('utf-8'), server.token.encode('utf-8')):
+                    print("토큰이 맞지 않는 요청을 받아 연결을 끊음", file=sys.stderr, flush=True)
+                    break
+                if request.get('command') == 'hello':
+                    reply({'event': 'ready'})
+                    continue
+                if request.get('command') == 'exit':
+                    # 변환 스레드가 멈춰 있어도 처리하도록 이 스레드에서 바로 종료
+                    server.terminate("종료 요청을 받음")
+                server.executor.submit(server.run_request, request, reply)
+        except OSError:
+            pass
+        finally:
+            server.touch(-1)
+
+
+class ConvertDaemon(socketserver.ThreadingTCPServer):
+    """변환 요청을 여러 연결에서 받아 workers개 스레드로 변환하는 서버"""
+    daemon_threads = True
+    # Windows의 SO_REUSEADDR는 같은 포트에 두 데몬이 뜨게 하므로 POSIX에서만 사용
+    allow_reuse_address = os.name == 'posix'
+
+    def __init__(self, address, converter, workers=1, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        super().__init__(address, _Handler)
+        self.token = new_token()
+        self.converter = converter
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._connections = 0
+        self._running = 0
+        self._last_active = time.monotonic()
+
+    def touch(self, connections=0, running=0):
+        with self._lock:
+            self._connections += connections
+            self._running += running
+            self._last_active = time.monotonic()
+
+    def run_request(self, request, reply):
+        request_id = request.get('id')
+        self.touch(running=1)
+        reply({'id': request_id, 'event': 'start'})
+        try:
+            self.converter.convert(request['kind'], request['input'], request['output'])
+        except Exception as e:
+            reply({'id': request_id, 'event': 'done', 'error': str(e)})
+        else:
+            reply({'id': request_id, 'event': 'done'})
+        finally:
+            self.touch(running=-1)
+
+    def terminate(self, reason):
+        """변환 중인 문서를 기다리지 않고 프로세스를 끝냄 (변환 프로그램도 강제 종료)"""
+        print(f"변환 데몬 종료: {reason}", file=sys.stderr, flush=True)
+        # 연결이 끊긴 클라이언트가 다시 연결할 때 죽어 가는 이 데몬에 붙지 않도록 먼저 닫음
+        self.server_close()
+        self.remove_token()
+        kill = getattr(self.converter, 'kill', None)
+        if kill is not None:
+            try:
+                kill()
+            except Exception:
+                pass
+        os._exit(0)
+
+    def publish_token(self):
+        """같은 사용자의 클라이언트가 읽을 수 있게 토큰 파일을 씁니다."""
+        write_token(self.server_address, self.token)
+
+    def remove_token(self):
+        """이 데몬의 토큰 파일을 지웁니다 (다른 데몬이 이미 바꿔 썼으면 그대로 둠)."""
+        path = token_path(self.server_address)
+        try:
+            if path.read_text(encoding='ascii').strip() == self.token:
+                path.unlink()
+        except OSError:
+            pass
+
+    def watch_idle(self):
+        """연결이 없는 채로 idle_timeout이 지나면 서버를 멈춤
+
+        응답을 받을 연결이 없는데도 끝나지 않은 변환은 멈춘 것으로 보고 강제 종료
+        """
+        while True:
+            time.sleep(1)
+            with self._lock:
+                idle = not self._connections and time.monotonic() - self._last_active > self.idle_timeout
+                running = self._running
+            if idle and running:
+                self.terminate(f"연결 없이 멈춘 변환 {running}개")
+            if idle:
+                self.shutdown()
+                return
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="문서를 PDF로 변환하는 로컬 데몬")
+    parser.add_argument("--host", default=DEFAULT_DAEMON_ADDRESS[0])
+    parser.add_argument("--port", type=int, default=DEFAULT_DAEMON_ADDRESS[1])
+    parser.add_argument("--workers", type=int, metavar="N",
+                        help="동시에 변환할 문서 수 (기본값: LibreOffice 1, --fake 4)")
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT, metavar="SEC",
+                        help=f"연결 없이 이 시간이 지나면 종료 (기본값: {DEFAULT_IDLE_TIMEOUT}초)")
+    parser.add_argument("--soffice", default="soffice", help="LibreOffice 실행 파일 (기본값: soffice)")
+    parser.add_argument("--fake", action="store_true", help="변환하지 않고 빈 PDF를 쓰는 대역")
+    parser.add_argument("--latency", type=float, default=0.0, help="--fake: 문서마다 기다릴 시간 (초)")
+    parser.add_argument("--fail", action="append", default=[], metavar="NAME", help="--fake: 변환 오류를 낼 파일 이름")
+    parser.add_argument("--hang", action="append", default=[], metavar="NAME", help="--fake: 멈출 파일 이름")
+    parser.add_argument("--crash", action="append", default=[], metavar="NAME",
+                        help="--fake: 받으면 데몬이 바로 죽는 파일 이름")
+    args = parser.parse_args(argv)
+
+    # 포트를 먼저 잡아서 다른 데몬이 이미 떠 있으면 변환 프로그램을 띄우지 않음
+    try:
+        server = ConvertDaemon((args.host, args.port), None, args.workers or (4 if args.fake else 1),
+                               args.idle_timeout)
+    except OSError as e:
+        if e.errno in (errno.EADDRINUSE, getattr(errno, 'WSAEADDRINUSE', errno.EADDRINUSE)):
+            print(f"이미 다른 변환 데몬이 {args.host}:{args.port}에서 실행 중입니다.", file=sys.stderr)
+            return EXIT_ADDRESS_IN_USE
+        raise
+    try:
+        server.publish_token()
+    except OSError as e:
+        server.server_close()
+        print(f"오류: 토큰 파일을 쓸 수 없습니다: {e}", file=sys.stderr)
+        return 1
+    if args.fake:
+        converter = FakeConverter(args.latency, args.fail, args.hang, args.crash)
+    else:
+        try:
+            converter = UnoConverter(args.soffice, args.port + 1)
+        except Exception as e:
+            server.server_close()
+            server.remove_token()
+            print(f"오류: {e}", file=sys.stderr)
+            return 1
+    server.converter = converter
+    print(f"변환 데몬 대기 중: {args.host}:{args.port}", file=sys.stderr, flush=True)
+    threading.Thread(target=server.watch_idle, daemon=True).start()
+    try:
+        server.serve_forever(poll_interval=0.5)
+    finally:
+        server.server_close()
+        server.remove_token()
+        if getattr(converter, 'close', None):
+            converter.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
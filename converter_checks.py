@@ -0,0 +1,318 @@
+"""변환기 동작 검사 (Office/한글 없이 대역 변환기로, Linux에서도 실행 가능)
+
+    python converter_checks.py              # 전체 검사
+    python converter_checks.py watchdog     # 이름을 주면 그 검사만
+
+검사마다 임시 폴더에 자리 표시 문서를 만들고 대역 변환기(FakeBackend 등)로 변환/병합한
+뒤 결과를 확인합니다. 하나라도 실패하면 종료 코드 1을 돌려줍니다.
+"""
+import multiprocessing
+import sys
+import tempfile
+import time
+import traceback
+from pathlib import Path
+
+# 이름 -> 검사 함수 (등록 순서대로 실행)
+CHECKS = {}
+
+
+class CheckFailed(Exception):
+    """검사 조건이 맞지 않음"""
+
+
+def check(func):
+    CHECKS[func.__name__.removeprefix('check_')] = func
+    return func
+
+
+def expect(condition, message):
+    # assert는 python -O에서 빠지므로 직접 확인
+    if not condition:
+        raise CheckFailed(message)
+
+
+def _placeholders(folder, names):
+    """자리 표시 문서를 만들고 경로 목록을 돌려줍니다 (내용이 서로 다르게)."""
+    paths = []
+    for number, name in enumerate(names):
+        path = Path(folder) / name
+        path.write_bytes(f"placeholder {number} {name}".encode('utf-8'))
+        paths.append(path)
+    return paths
+
+
+@check
+def check_pool(folder):
+    """종류마다 인스턴스를 하나만 띄워 재사용하고, max_uses/오류 뒤에만 새로 띄우는지"""
+    from converters import ConverterPool, FakeBackend
+
+    backend = FakeBackend(fail_names={"bad.docx"})
+    paths = _placeholders(folder, ["a.docx", "b.docx", "c.docx", "d.hwp", "e.hwp", "bad.docx", "f.docx"])
+    out = Path(folder) / "out"
+    out.mkdir()
+    failures = []
+    with ConverterPool(backend, max_uses=2) as pool:
+        for path in paths:
+            try:
+                pool.convert(path, out / f"{path.stem}.pdf")
+            except Exception as e:
+                failures.append(str(e))
+        opened = [(instance.kind, instance.converted) for instance in backend.opened]
+
+    expect(failures == ["bad.docx 변환 실패: 가짜 변환 오류"], f"bad.docx만 실패해야 함: {failures}")
+    # word: a,b → 재시작 → c, bad(오류로 버림) → 새 인스턴스 → f / hwp: d,e
+    expect(opened == [('word', 2), ('word', 1), ('hwp', 2), ('word', 1)],
+           f"인스턴스를 띄운 순서/변환 수가 다름: {opened}")
+    expect(backend.conversions == 6, f"변환 수가 다름: {backend.conversions}")
+    expect(len(backend.closed) == len(backend.opened) and all(i.closed for i in backend.opened),
+           f"닫지 않은 인스턴스가 있음: {len(backend.closed)}/{len(backend.opened)}")
+    expect(all((out / f"{path.stem}.pdf").exists() for path in paths if path.name != "bad.docx"),
+           "변환한 PDF가 없음")
+
+
+@check
+def check_watchdog(folder):
+    """멈춘 변환기를 시간 제한에 강제 종료하고, 다음 문서는 새 변환 프로세스로 변환하는지"""
+    from dataclasses import replace
+
+    from converters import FakeBackend
+    from merge_engine import MergeOptions, merge_folder
+
+    # 한/글 변환 프로세스가 하나뿐이라 c.hwp는 b.hwp의 프로세스를 죽이고 새로 띄운 뒤에야 변환됨
+    paths = _placeholders(folder, ["a.hwp", "b.hwp", "c.hwp", "d.docx"])
+    options = MergeOptions(
+        converter_backend=FakeBackend(hang_names={"b.hwp"}),
+        doc_worker_limits={'hwp': 1, 'word': 1},
+        convert_timeouts={'hwp': 1.0, 'word': 30.0},
+        cache=None, incremental=False, resume=False, optimize_output=False,
+    )
+    started = time.monotonic()
+    report = merge_folder(paths, Path(folder) / "out.pdf", options)
+    elapsed = time.monotonic() - started
+
+    failed = dict(report.failed_files)
+    expect(list(failed) == ["b.hwp"], f"b.hwp만 실패해야 함: {report.failed_files}")
+    expect("시간 초과" in failed["b.hwp"], f"시간 초과 사유가 아님: {failed['b.hwp']}")
+    expect(report.successfully_merged == ["a.hwp", "c.hwp", "d.docx"],
+           f"나머지 문서가 병합되지 않음: {report.successfully_merged}")
+    expect(elapsed < 30, f"멈춘 변환기를 기다림 ({elapsed:.1f}초)")
+    expect(not multiprocessing.active_children(),
+           f"변환 프로세스가 남아 있음: {multiprocessing.active_children()}")
+
+    # 시간 초과로 강제 종료한 횟수가 재시작 한도(MAX_RESTARTS)를 넘어도 남은 문서는 변환됨
+    hung = [f"h{number}.hwp" for number in range(1, 5)]
+    healthy = [f"ok{number}.hwp" for number in range(1, 5)]
+    many = Path(folder) / "many"
+    many.mkdir()
+    paths = _placeholders(many, hung + healthy)
+    options = replace(options, converter_backend=FakeBackend(hang_names=set(hung)))
+    report = merge_folder(paths, many / "out.pdf", options)
+    failed = dict(report.failed_files)
+    expect(sorted(failed) == hung, f"멈춘 문서만 실패해야 함: {report.failed_files}")
+    expect(all("시간 초과" in reason for reason in failed.values()), f"시간 초과 사유가 아님: {report.failed_files}")
+    expect(report.successfully_merged == healthy,
+           f"시간 초과가 여러 번 난 뒤 나머지 문서가 병합되지 않음: {report.successfully_merged}")
+
+
+@check
+def check_resume(folder):
+    """중단된 병합의 작업 폴더에 추가하지 못한 문서 변환 결과만 남고, 다음 실행이 그것을 다시 쓰는지"""
+    import threading
+    from dataclasses import replace
+
+    from PIL import Image
+
+    from converters import FakeBackend
+    from merge_engine import MergeCancelled, MergeOptions, merge_folder
+    from merge_events import FileAppended
+    from merge_journal import work_dir_for
+
+    # a.docx가 멈춘 동안 b, c가 변환되고, b를 추가하자마자 취소
+    paths = _placeholders(folder, ["a.docx", "b.docx", "c.docx"])
+    image = Path(folder) / "d.png"
+    Image.new('RGB', (20, 20), 'white').save(image)
+    paths.append(image)
+    output = Path(folder) / "out.pdf"
+    cancel = threading.Event()
+
+    def on_event(event):
+        if isinstance(event, FileAppended) and event.path.name == "b.docx":
+            cancel.set()
+
+    options = MergeOptions(
+        converter_backend=FakeBackend(hang_names={"a.docx"}),
+        convert_timeouts={'word': 1.0}, image_workers=1,
+        cache=None, incremental=False, optimize_output=False, cancel=cancel, on_event=on_event,
+    )
+    try:
+        merge_folder(paths, output, options)
+    except MergeCancelled:
+        pass
+    else:
+        raise CheckFailed("병합이 취소되지 않음")
+    kept = sorted(path.name for path in work_dir_for(output).glob("*.pdf"))
+    expect(len(kept) == 1 and kept[0].endswith("_2.pdf"),
+           f"작업 폴더에 추가하지 못한 c.docx의 변환 결과만 남아야 함: {kept}")
+
+    options = replace(options, converter_backend=FakeBackend(), cancel=None, on_event=None)
+    report = merge_folder(paths, output, options)
+    expect(report.resumed_files == 1, f"보관한 변환 결과를 다시 쓰지 않음: {report.resumed_files}")
+    expect(report.successfully_merged == [path.name for path in paths],
+           f"이어서 병합한 결과가 다름: {report.successfully_merged}")
+    expect(not work_dir_for(output).exists(), "완료 뒤 작업 폴더가 남아 있음")
+
+
+def _free_port():
+    import socket
+
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _wait_exit(process, timeout):
+    """데몬 프로세스가 timeout초 안에 끝나면 True (끝나지 않으면 강제 종료)"""
+    import subprocess
+
+    try:
+        process.wait(timeout=timeout)
+        return True
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+        return False
+
+
+@check
+def check_daemon(folder):
+    """멈춘 데몬을 띄우지 않은 클라이언트도 종료시키고, 시작되지 않는 요청도 기다리지 않으며
+    토큰 없는 요청은 받지 않는지"""
+    from daemon_client import DaemonClient, daemon_command
+
+    address = ('127.0.0.1', _free_port())
+    command = daemon_command(address, fake=True, extra_args=['--workers', '1', '--hang', 'h.docx'])
+    a, b, c, h = (str(path) for path in _placeholders(folder, ["a.docx", "b.docx", "c.docx", "h.docx"]))
+
+    def pdf(path):
+        return str(Path(path).with_suffix('.pdf'))
+
+    # 1. 첫 병합이 데몬을 띄우고, 두 번째 병합(다른 클라이언트)에서 문서가 멈춤
+    first = DaemonClient(address, command)
+    first.convert('word', a, pdf(a), timeout=30)
+    first.close()
+    second = DaemonClient(address, command)
+    started = time.monotonic()
+    results = dict(second.convert_stream([('word', h, pdf(h)), ('word', b, pdf(b))], {'word': 1.0}))
+    elapsed = time.monotonic() - started
+    second.close()
+    expect(results[1] is None, f"멈춘 문서 다음 문서가 변환되지 않음: {results}")
+    expect(results[0] and "시간 초과" in results[0], f"시간 초과 사유가 아님: {results}")
+    expect(elapsed < 20, f"멈춘 데몬을 기다림 ({elapsed:.1f}초)")
+    expect(_wait_exit(first._process, 5), "첫 클라이언트가 띄운 멈춘 데몬이 종료되지 않음")
+
+    # 2. 다른 연결이 멈춘 문서를 보내고 떠남: 이 클라이언트의 요청은 시작조차 되지 않음
+    third = DaemonClient(address, command)
+    third.connect()
+    third._send('word', h, pdf(h))
+    time.sleep(0.5)
+    third.close()
+    fourth = DaemonClient(address, command)
+    started = time.monotonic()
+    results = dict(fourth.convert_stream([('word', c, pdf(c))], {'word': 1.0}))
+    elapsed = time.monotonic() - started
+    fourth.close()
+    expect(results == {0: None}, f"시작되지 않은 요청을 다시 보내지 않음: {results}")
+    expect(elapsed < 20, f"시작되지 않는 요청을 기다림 ({elapsed:.1f}초)")
+    expect(_wait_exit(second._process, 5), "시작되지 않는 요청 뒤 멈춘 데몬이 종료되지 않음")
+
+    # 3. 연결이 모두 끊기면 멈춘 변환이 있어도 유휴 시간 뒤 종료
+    idle = DaemonClient(address, daemon_command(address, fake=True, extra_args=[
+        '--workers', '1', '--hang', 'h.docx', '--idle-timeout', '1']))
+    idle.connect()
+    idle.restart()  # fourth가 띄운 데몬을 끝내고 유휴 시간이 짧은 데몬을 띄움
+    expect(_wait_exit(fourth._process, 5), "종료 요청으로 데몬이 끝나지 않음")
+    idle._send('word', h, pdf(h))
+    time.sleep(0.5)
+    idle.close()
+    expect(_wait_exit(idle._process, 10), "멈춘 변환이 남은 데몬이 유휴 시간 뒤 종료되지 않음")
+
+    # 4. 두 병합이 같은 DaemonBackend로 동시에 변환 (병합마다 연결을 따로 씀)
+    from concurrent.futures import ThreadPoolExecutor
+
+    from converters import DaemonBackend
+    from merge_engine import MergeOptions, merge_folder
+
+    backend = DaemonBackend(address, fake=True, daemon_args=['--latency', '0.2'])
+    options = MergeOptions(converter_backend=backend, convert_timeouts={'word': 30.0},
+                           cache=None, incremental=False, resume=False, optimize_output=False)
+    folders = []
+    for name in ("x", "y"):
+        sub = Path(folder) / name
+        sub.mkdir()
+        folders.append(_placeholders(sub, [f"{name}{number}.docx" for number in range(6)]))
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        reports = list(executor.map(lambda paths: merge_folder(paths, paths[0].parent / "out.pdf", options),
+                                    folders))
+    for paths, report in zip(folders, reports):
+        expect(not report.failed_files, f"동시 병합에서 변환 실패: {report.failed_files}")
+        expect(report.successfully_merged == [path.name for path in paths],
+               f"동시 병합 결과가 다름: {report.successfully_merged}")
+
+    # 5. 토큰이 없거나 틀린 요청은 연결을 끊고, 토큰 없는 종료 요청으로는 데몬이 끝나지 않음
+    import json
+    import socket
+
+    for token in (None, "0" * 32):
+        with socket.create_connection(address, timeout=5) as sock:
+            message = {'command': 'exit'} if token is None else {'token': token, 'id': 1, 'kind': 'word',
+                                                                  'input': a, 'output': pdf(a)}
+            sock.sendall(json.dumps(message).encode('utf-8') + b"\n")
+            expect(sock.recv(1024) == b"", f"토큰이 맞지 않는 요청에 응답함: {message}")
+    checker = DaemonClient(address)
+    checker.convert('word', b, pdf(b), timeout=30)
+    checker.close()
+
+    # 6. 띄운 데몬이 바로 종료되면 데몬의 오류 메시지를 알려 줌
+    broken = ('127.0.0.1', _free_port())
+    client = DaemonClient(broken, daemon_command(broken, fake=True, extra_args=['--workers', 'x']))
+    try:
+        client.connect()
+        error = None
+    except Exception as e:
+        error = str(e)
+    expect(error and "바로 종료됨" in error and "--workers" in error, f"데몬 시작 오류가 분명하지 않음: {error}")
+
+    stopper = DaemonClient(address)
+    stopper.connect()
+    stopper.shutdown()
+
+
+def main(argv=None):
+    names = (argv if argv is not None else sys.argv[1:]) or list(CHECKS)
+    unknown = [name for name in names if name not in CHECKS]
+    if unknown:
+        print(f"오류: 알 수 없는 검사: {', '.join(unknown)} (사용 가능: {', '.join(CHECKS)})", file=sys.stderr)
+        return 2
+
+    failures = 0
+    for name in names:
+        started = time.monotonic()
+        with tempfile.TemporaryDirectory(prefix=f"converter_check_{name}_") as folder:
+            try:
+                CHECKS[name](folder)
+            except CheckFailed as e:
+                failures += 1
+                print(f"❌ {name}: {e}")
+                continue
+            except Exception:
+                failures += 1
+                print(f"❌ {name}: 예기치 못한 오류\n{traceback.format_exc()}")
+                continue
+        print(f"✅ {name} ({time.monotonic() - started:.1f}초)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
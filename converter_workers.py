@@ -0,0 +1,340 @@
+"""여러 변환 프로세스로 문서를 동시에 변환합니다.
+
+각 작업 프로세스는 자기만의 COM 아파트와 프로그램 인스턴스(ConverterPool)를 가지며,
+문서 종류별 동시 실행 수(예: Word 3개, 한/글 1개)를 제한합니다. 결과는 끝나는
+순서대로 (목록 순번, ...)으로 돌려주고, 목록 순서로 맞추는 것은 merge_engine.merge_folder가
+병합하면서 합니다.
+
+문서 하나가 종류별 시간 제한(DEFAULT_CONVERT_TIMEOUTS)을 넘기면(예: 한/글이 대화상자를
+띄우고 멈춤) 그 변환 프로세스와 프로그램을 강제 종료하고 시간 초과로 실패 처리한 뒤
+새 변환 프로세스로 나머지 문서를 계속 변환합니다.
+"""
+import multiprocessing
+import os
+import queue
+import signal
+import time
+from pathlib import Path
+
+from converters import ConverterPool, Win32ComBackend, doc_kind
+
+# 문서 종류별 기본 동시 변환 프로세스 수
+DEFAULT_WORKER_LIMITS = {
+    'word': 3,
+    'excel': 2,
+    'powerpoint': 2,
+    'hwp': 1,
+}
+
+# 문서 종류별 기본 변환 시간 제한 (초, 0이면 제한 없음)
+DEFAULT_CONVERT_TIMEOUTS = {
+    'word': 120,
+    'excel': 120,
+    'powerpoint': 180,
+    'hwp': 120,
+}
+
+# 작업 프로세스 상태 확인 주기 (초)
+POLL_INTERVAL = 0.5
+# 문서 종류별 작업 프로세스 재시작 허용 횟수
+MAX_RESTARTS = 3
+
+
+def _noop(*args, **kwargs):
+    pass
+
+
+def parse_worker_limits(text):
+    """'word=3,hwp=1' 형식의 문자열을 {'word': 3, 'hwp': 1}로 바꿉니다."""
+    limits = dict(DEFAULT_WORKER_LIMITS)
+    for item in filter(None, (part.strip() for part in text.split(','))):
+        kind, _, count = item.partition('=')
+        kind = kind.strip().lower()
+        if kind not in DEFAULT_WORKER_LIMITS or not count.strip().isdigit():
+            raise ValueError(f"잘못된 동시 변환 수 설정: {item} (예: word=3,hwp=1)")
+        limits[kind] = max(1, int(count))
+    return limits
+
+
+def parse_convert_timeouts(text):
+    """'hwp=60,word=180' 형식(또는 모든 종류에 같은 값 '90')을 {'hwp': 60.0, ...}로 바꿉니다."""
+    timeouts = dict(DEFAULT_CONVERT_TIMEOUTS)
+    for item in filter(None, (part.strip() for part in text.split(','))):
+        kind, _, seconds = item.rpartition('=')
+        kind = kind.strip().lower()
+        try:
+            seconds = float(seconds)
+        except ValueError:
+            seconds = -1
+        if (kind and kind not in DEFAULT_CONVERT_TIMEOUTS) or seconds < 0:
+            raise ValueError(f"잘못된 변환 시간 제한 설정: {item} (예: hwp=60,word=180)")
+        for target in ([kind] if kind else DEFAULT_CONVERT_TIMEOUTS):
+            timeouts[target] = seconds
+    return timeouts
+
+
+def _worker_main(backend, max_uses, requests, results, traced=False):
+    """작업 프로세스: 요청 큐에서 문서를 받아 변환하고 결과 큐에 보고합니다."""
+    def log(message):
+        results.put(('log', None, message))
+
+    def trace(*span):
+        results.put(('trace', None, span))
+
+    def opened(kind, instance):
+        # 시간 초과 때 부모가 프로그램 프로세스도 종료할 수 있도록 PID를 알림
+        pid = backend.instance_pid(instance)
+        if pid:
+            results.put(('pid', None, (multiprocessing.current_process().name, pid)))
+
+    pool = ConverterPool(backend, max_uses, log, trace if traced else None, opened)
+    try:
+        while True:
+            job = requests.get()
+            if job is None:
+                break
+            index, doc_path, pdf_path = job
+            results.put(('start', index, multiprocessing.current_process().name))
+            try:
+                pool.convert(doc_path, pdf_path)
+            except Exception as e:
+                results.put(('done', index, str(e)))
+            else:
+                results.put(('done', index, None))
+    finally:
+        pool.close()
+
+
+class DocumentWorkers:
+    """문서 종류별로 제한된 수의 변환 프로세스를 띄워 문서를 동시에 변환합니다.
+
+    timeouts: 문서 종류별 변환 시간 제한 (초, 0이면 제한 없음)
+    """
+
+    def __init__(self, backend=None, limits=None, max_uses=50, log=_noop, trace=None, timeouts=None):
+        self.backend = backend if backend is not None else Win32ComBackend()
+        self.limits = limits or DEFAULT_WORKER_LIMITS
+        self.timeouts = DEFAULT_CONVERT_TIMEOUTS if timeouts is None else timeouts
+        self.max_uses = max_uses
+        self.log = log
+        self.trace = trace
+        self._context = multiprocessing.get_context('spawn')
+        self._results = None
+        self._requests = {}   # kind -> 요청 큐
+        self._workers = {}    # 프로세스 이름 -> (kind, Process)
+        self._in_flight = {}  # 프로세스 이름 -> 변환 중인 순번
+        self._started = {}    # 프로세스 이름 -> 변환 시작 시각 (monotonic)
+        self._app_pids = {}   # 프로세스 이름 -> 그 프로세스가 띄운 프로그램 PID
+        self._kinds = {}      # 순번 -> 문서 종류
+        self._restarts = {}   # kind -> 비정상 종료로 재시작한 횟수
+        self._timed_out = set()  # 시간 초과로 강제 종료한 프로세스 이름
+
+    def _start_worker(self, kind):
+        process = self._context.Process(
+            target=_worker_main,
+            args=(self.backend, self.max_uses, self._requests[kind], self._results, self.trace is not None),
+            daemon=True
+        )
+        process.start()
+        self._workers[process.name] = (kind, process)
+        return process
+
+    def run(self, jobs):
+        """jobs: [(문서 경로, PDF 경로)]
+
+        (순번, 오류 메시지 또는 None)을 변환이 끝나는 순서대로 yield 합니다.
+        """
+        jobs = list(jobs)
+        pending = set(range(len(jobs)))
+        by_kind = {}
+        for index, (doc_path, pdf_path) in enumerate(jobs):
+            try:
+                kind = doc_kind(doc_path)
+            except Exception as e:
+                pending.discard(index)
+                yield index, f"{Path(doc_path).name} 변환 실패: {str(e)}"
+                continue
+            by_kind.setdefault(kind, []).append((index, str(doc_path), str(pdf_path)))
+            self._kinds[index] = kind
+
+        if not by_kind:
+            return
+
+        self._results = self._context.Queue()
+        try:
+            for kind, kind_jobs in by_kind.items():
+                self._requests[kind] = self._context.Queue()
+                for job in kind_jobs:
+                    self._requests[kind].put(job)
+                worker_count = min(self.limits.get(kind, 1), len(kind_jobs))
+                for _ in range(worker_count):
+                    self._requests[kind].put(None)
+                for _ in range(worker_count):
+                    self._start_worker(kind)
+
+            last_check = time.monotonic()
+            while pending:
+                try:
+                    message, index, payload = self._results.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    message = None
+                # 메시지가 계속 들어와도 POLL_INTERVAL마다 시간 초과/비정상 종료를 확인
+                if message is None or time.monotonic() - last_check >= POLL_INTERVAL:
+                    last_check = time.monotonic()
+                    yield from self._kill_timed_out(jobs, pending)
+                    yield from self._reap_dead_workers(jobs, pending)
+                if message is None:
+                    continue
+
+                if message == 'log':
+                    self.log(payload)
+                elif message == 'trace':
+                    self.trace(*payload)
+                elif message == 'pid':
+                    name, pid = payload
+                    self._app_pids[name] = pid
+                elif message == 'start':
+                    self._in_flight[payload] = index
+                    self._started[payload] = time.monotonic()
+                    self.log(f"  -> 변환 중: {Path(jobs[index][0]).name}")
+                elif message == 'done':
+                    for name, running in list(self._in_flight.items()):
+                        if running == index:
+                            del self._in_flight[name]
+                            self._started.pop(name, None)
+                    if index in pending:
+                        pending.discard(index)
+                        yield index, payload
+        finally:
+            self.close()
+
+    def _kill_timed_out(self, jobs, pending):
+        """시간 제한을 넘긴 변환을 강제 종료하고 시간 초과로 실패 처리합니다.
+
+        종료된 프로세스는 다음 _reap_dead_workers에서 새 프로세스로 바뀝니다.
+        """
+        now = time.monotonic()
+        for name, index in list(self._in_flight.items()):
+            limit = self.timeouts.get(self._kinds.get(index)) or 0
+            if not limit or now - self._started.get(name, now) < limit:
+                continue
+            doc_name = Path(jobs[index][0]).name
+            self.log(f"    [변환기] {doc_name}: {limit:g}초 안에 끝나지 않아 변환 프로그램을 강제 종료합니다")
+            self._kill_worker(name)
+            self._timed_out.add(name)
+            del self._in_flight[name]
+            self._started.pop(name, None)
+            if index in pending:
+                pending.discard(index)
+                yield index, f"{doc_name} 변환 실패: 시간 초과 ({limit:g}초 동안 응답 없음)"
+
+    def _kill_worker(self, name):
+        """작업 프로세스와 그 프로세스가 띄운 프로그램(알고 있으면)을 강제 종료합니다."""
+        kind, process = self._workers[name]
+        process.kill()
+        process.join(timeout=5)
+        app_pid = self._app_pids.pop(name, None)
+        if app_pid:
+            try:
+                # Windows에서는 TerminateProcess
+                os.kill(app_pid, signal.SIGTERM)
+            except OSError:
+                pass  # 이미 종료됨
+
+    def _reap_dead_workers(self, jobs, pending):
+        """비정상 종료된 프로세스가 맡던 문서를 실패 처리하고 새 프로세스를 띄웁니다.
+
+        시간 초과로 강제 종료한 프로세스는 문서 하나를 이미 실패 처리했으므로 재시작 횟수에
+        세지 않고 항상 새로 띄웁니다 (재시작 한도는 예기치 않은 종료에만 적용).
+        """
+        for name, (kind, process) in list(self._workers.items()):
+            if process.is_alive():
+                continue
+            del self._workers[name]
+            self._started.pop(name, None)
+            self._app_pids.pop(name, None)
+            index = self._in_flight.pop(name, None)
+            if name in self._timed_out:
+                self._timed_out.discard(name)
+                self.log(f"    [변환기] 시간 초과 뒤 {kind} 변환 프로세스를 새로 띄웁니다")
+                self._start_worker(kind)
+                continue
+            if index is None and process.exitcode == 0:
+                continue  # 할 일을 마치고 정상 종료
+            reason = f"변환 프로세스가 비정상 종료됨 (종료 코드 {process.exitcode})"
+            if index is not None and index in pending:
+                pending.discard(index)
+                yield index, f"{Path(jobs[index][0]).name} 변환 실패: {reason}"
+            # 남은 요청을 처리할 프로세스를 보충 (종료 신호 None은 큐에 그대로 남아 있음)
+            self._restarts[kind] = self._restarts.get(kind, 0) + 1
+            if self._restarts[kind] <= MAX_RESTARTS * self.limits.get(kind, 1):
+                self.log(f"    [변환기] {kind} 변환 프로세스 재시작")
+                self._start_worker(kind)
+
+        # 살아 있는 프로세스가 없는 종류의 남은 문서는 더 처리될 수 없음
+        alive_kinds = {kind for kind, _ in self._workers.values()}
+        for index in sorted(pending):
+            if self._kinds.get(index) not in alive_kinds:
+                pending.discard(index)
+                yield index, f"{Path(jobs[index][0]).name} 변환 실패: 변환 프로세스가 비정상 종료됨"
+
+    def close(self):
+        """남은 작업 프로세스를 정리합니다."""
+        for name, (kind, process) in list(self._workers.items()):
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self._workers.clear()
+        self._in_flight.clear()
+        self._started.clear()
+        self._app_pids.clear()
+        self._kinds.clear()
+        self._timed_out.clear()
+        for requests in self._requests.values():
+            requests.close()
+        self._requests.clear()
+        if self._results is not None:
+            self._results.close()
+            self._results = None
+
+
+def iter_document_conversions(jobs, backend=None, limits=None, max_uses=50, log=_noop, processes=True,
+                              trace=None, timeouts=None):
+    """문서를 PDF로 변환하고 끝나는 순서대로 (순번, PDF 경로, 오류 메시지 또는 None)을 yield 합니다.
+
+    processes가 False이면 현재 스레드의 ConverterPool 하나로 차례로 변환합니다.
+    이때는 멈춘 변환을 끊을 수 없으므로 시간 제한(timeouts)이 적용되지 않습니다.
+    변환 데몬 백엔드(multiplexed)는 변환 프로세스 없이 모든 문서를 데몬 하나에 보냅니다.
+    trace: merge_trace 콜백 (변환 프로세스에서 잰 구간도 이 콜백으로 넘김)
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return
+    if getattr(backend, 'multiplexed', False):
+        completions = backend.iter_convert(jobs, log, DEFAULT_CONVERT_TIMEOUTS if timeouts is None else timeouts)
+        try:
+            for index, error in completions:
+                yield index, jobs[index][1], error
+        finally:
+            completions.close()
+        return
+    if not processes:
+        with ConverterPool(backend, max_uses, log, trace) as pool:
+            for index, (doc_path, pdf_path) in enumerate(jobs):
+                log(f"  -> 변환 중: {Path(doc_path).name}")
+                try:
+                    pool.convert(doc_path, pdf_path)
+                except Exception as e:
+                    yield index, pdf_path, str(e)
+                else:
+                    yield index, pdf_path, None
+        return
+
+    completions = DocumentWorkers(backend, limits, max_uses, log, trace, timeouts).run(jobs)
+    try:
+        for index, error in completions:
+            yield index, jobs[index][1], error
+    finally:
+        completions.close()
+
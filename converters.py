@@ -0,0 +1,456 @@
+"""문서(Office/HWP) → PDF 변환 백엔드와 변환기 풀
+
+문서마다 Dispatch/Quit를 반복하지 않도록 문서 종류별로 프로그램 인스턴스를
+하나씩 띄워 두고 재사용합니다. 인스턴스는 N개 문서를 변환했거나 오류가 나면
+새로 띄웁니다.
+"""
+import os
+import time
+from pathlib import Path
+
+from daemon_client import DEFAULT_DAEMON_ADDRESS, DaemonClient, daemon_command
+from merge_trace import worker_span
+
+
+# 확장자 → 문서 종류
+DOC_KINDS = {
+    '.docx': 'word', '.doc': 'word',
+    '.xlsx': 'excel', '.xls': 'excel',
+    '.pptx': 'powerpoint', '.ppt': 'powerpoint',
+    '.hwp': 'hwp', '.hwpx': 'hwp',
+}
+
+
+def _noop(*args, **kwargs):
+    pass
+
+
+def doc_kind(path):
+    """파일 확장자로 문서 종류(word/excel/powerpoint/hwp)를 구합니다."""
+    kind = DOC_KINDS.get(Path(path).suffix.lower())
+    if kind is None:
+        raise Exception(f"지원하지 않는 문서 형식입니다: {Path(path).suffix}")
+    return kind
+
+
+class ConverterBackend:
+    """변환 백엔드 인터페이스
+
+    - initialize/uninitialize: 변환을 수행하는 스레드에서 한 번씩 호출 (COM 아파트 등)
+    - open_instance: 문서 종류별 프로그램 인스턴스 시작
+    - convert: 인스턴스로 문서 하나를 PDF로 저장
+    - close_instance: 인스턴스 종료
+    - instance_pid: 인스턴스가 별도 프로그램 프로세스면 그 PID (시간 초과 시 강제 종료용)
+    """
+    name = "base"
+
+    def initialize(self):
+        pass
+
+    def uninitialize(self):
+        pass
+
+    def open_instance(self, kind, log=_noop):
+        raise NotImplementedError
+
+    def convert(self, instance, kind, input_path, output_path, log=_noop):
+        raise NotImplementedError
+
+    def close_instance(self, instance, kind):
+        pass
+
+    def instance_pid(self, instance):
+        return None
+
+
+class Win32ComBackend(ConverterBackend):
+    """MS Office / 한/글 COM 자동화 백엔드 (Windows 전용)"""
+    name = "win32com"
+
+    PROG_IDS = {
+        'word': "Word.Application",
+        'excel': "Excel.Application",
+        'powerpoint': "PowerPoint.Application",
+        'hwp': "HWPFrame.HwpObject",
+    }
+    # 시간 초과 시 강제 종료할 프로그램 실행 파일 이름
+    EXE_NAMES = {
+        'word': "winword.exe",
+        'excel': "excel.exe",
+        'powerpoint': "powerpnt.exe",
+        'hwp': "hwp.exe",
+    }
+    NOT_FOUND_MESSAGES = {
+        'word': "MS Word를 찾을 수 없습니다. Word가 설치되어 있는지 확인하세요.",
+        'excel': "MS Excel을 찾을 수 없습니다. Excel이 설치되어 있는지 확인하세요.",
+        'powerpoint': "MS PowerPoint를 찾을 수 없습니다. PowerPoint가 설치되어 있는지 확인하세요.",
+        'hwp': "한/글 프로그램을 찾을 수 없습니다. 한/글이 설치되어 있는지 확인하세요.",
+    }
+
+    def __init__(self, dedicated_instances=True):
+        # True면 DispatchEx로 항상 새 프로그램 프로세스를 띄움
+        # (사용자가 열어 둔 Word 등에 붙었다가 Quit으로 닫아버리는 일 방지, 변환 프로세스 간 격리)
+        self.dedicated_instances = dedicated_instances
+        self._pids = {}  # id(인스턴스) -> 프로그램 PID
+
+    def initialize(self):
+        # pywin32는 Windows에서 문서를 변환할 때만 필요
+        try:
+            import pythoncom
+        except ImportError as e:
+            raise Exception(f"pywin32를 불러올 수 없습니다. 문서 변환은 Windows에서만 지원됩니다. ({str(e)})")
+        pythoncom.CoInitialize()
+
+    def uninitialize(self):
+        import pythoncom
+        pythoncom.CoUninitialize()
+
+    def open_instance(self, kind, log=_noop):
+        import win32com.client
+
+        if kind == 'hwp':
+            log(f"    [디버그] 한/글 프로그램 초기화 중...")
+        before = _process_ids(self.EXE_NAMES[kind]) if self.dedicated_instances else None
+        try:
+            dispatch = win32com.client.DispatchEx if self.dedicated_instances else win32com.client.Dispatch
+            app = dispatch(self.PROG_IDS[kind])
+        except Exception as e:
+            raise Exception(f"{self.NOT_FOUND_MESSAGES[kind]} ({str(e)})")
+        if before is not None:
+            # DispatchEx는 새 프로세스를 띄우므로 새로 생긴 PID가 이 인스턴스
+            started = _process_ids(self.EXE_NAMES[kind]) - before
+            if len(started) == 1:
+                self._pids[id(app)] = started.pop()
+
+        if kind == 'word':
+            app.Visible = False
+        elif kind == 'excel':
+            app.Visible = False
+            app.DisplayAlerts = False
+        elif kind == 'hwp':
+            # 보안 경고 무시 설정
+            app.RegisterModule("FilePathCheckDLL", "FilePathCheckerModuleExample")
+            app.SetMessageBoxMode(0x00010000)  # 메시지 박스 자동 확인
+        return app
+
+    def convert(self, instance, kind, input_path, output_path, log=_noop):
+        if kind == 'word':
+            doc = instance.Documents.Open(input_path)
+            try:
+                doc.SaveAs(output_path, FileFormat=17)  # 17 = PDF
+            finally:
+                doc.Close(SaveChanges=False)
+
+        elif kind == 'excel':
+            workbook = instance.Workbooks.Open(input_path)
+            try:
+                # PDF 형식으로 저장 (0 = xlTypePDF)
+                workbook.ExportAsFixedFormat(0, output_path)
+            finally:
+                workbook.Close(SaveChanges=False)
+
+        elif kind == 'powerpoint':
+            presentation = instance.Presentations.Open(input_path, WithWindow=False)
+            try:
+                # PDF 형식으로 저장 (32 = ppSaveAsPDF)
+                presentation.SaveAs(output_path, 32)
+            finally:
+                presentation.Close()
+
+        elif kind == 'hwp':
+            self._convert_hwp(instance, input_path, output_path, log)
+
+    def _convert_hwp(self, hwp, input_path, output_path, log):
+        try:
+            # 파일 열기
+            log(f"    [디버그] 파일 열기 시도: {input_path}")
+            result = hwp.Open(input_path, "HWP", "forceopen:true")
+            if not result:
+                raise Exception("파일 열기 실패 (hwp.Open 반환값: False)")
+
+            log(f"    [디버그] 파일 열기 성공")
+
+            # PDF로 저장 - HAction 사용 방식
+            log(f"    [디버그] PDF 저장 시도: {output_path}")
+            act = hwp.CreateAction("FileSaveAs")
+            pset = act.CreateSet()
+            act.GetDefault(pset)
+            pset.SetItem("Format", "PDF")
+            pset.SetItem("FileName", output_path)
+            result = act.Execute(pset)
+
+            if not result:
+                raise Exception("PDF 저장 실패 (HAction.Execute 반환값: False)")
+
+            log(f"    [디버그] PDF 저장 완료")
+        except Exception as e:
+            raise Exception(f"한글 변환 중 오류: {str(e)}")
+        finally:
+            # 파일 닫기 (인스턴스는 재사용하므로 Quit 하지 않음)
+            try:
+                hwp.Clear(1)  # 1 = 저장하지 않고 닫기
+            except:
+                pass
+
+    def close_instance(self, instance, kind):
+        self._pids.pop(id(instance), None)
+        try:
+            instance.Quit()
+        except:
+            pass
+
+    def instance_pid(self, instance):
+        return self._pids.get(id(instance))
+
+
+def _process_ids(exe_name):
+    """실행 파일 이름이 exe_name인 프로세스 PID 집합 (Windows, 알 수 없으면 빈 집합)"""
+    try:
+        import win32api
+        import win32con
+        import win32process
+    except ImportError:
+        return set()
+    pids = set()
+    for pid in win32process.EnumProcesses():
+        try:
+            handle = win32api.OpenProcess(win32con.PROCESS_QUERY_INFORMATION | win32con.PROCESS_VM_READ, False, pid)
+        except Exception:
+            continue
+        try:
+            if os.path.basename(win32process.GetModuleFileNameEx(handle, None)).lower() == exe_name:
+                pids.add(pid)
+        except Exception:
+            pass
+        finally:
+            win32api.CloseHandle(handle)
+    return pids
+
+
+class FakeInstance:
+    """FakeBackend가 띄우는 가짜 프로그램 인스턴스"""
+
+    def __init__(self, kind, serial):
+        self.kind = kind
+        self.serial = serial
+        self.converted = 0
+        self.closed = False
+
+
+class FakeBackend(ConverterBackend):
+    """Office 없이 풀 동작을 확인하기 위한 프로세스 내 가짜 백엔드
+
+    latency초 기다린 뒤 빈 페이지 PDF를 씁니다. fail_names에 들어 있는 파일 이름은
+    변환 오류를 내고, hang_names에 들어 있는 파일 이름은 대화상자에 막힌 것처럼
+    hang_seconds초 동안 멈춥니다. 열고 닫은 인스턴스 수를 기록합니다.
+    """
+    name = "fake"
+
+    def __init__(self, latency=0.0, fail_names=(), startup_latency=0.0, hang_names=(), hang_seconds=3600.0):
+        self.latency = latency
+        self.startup_latency = startup_latency
+        self.fail_names = set(fail_names)
+        self.hang_names = set(hang_names)
+        self.hang_seconds = hang_seconds
+        self.opened = []
+        self.closed = []
+        self.conversions = 0
+
+    def open_instance(self, kind, log=_noop):
+        if self.startup_latency:
+            time.sleep(self.startup_latency)
+        instance = FakeInstance(kind, len(self.opened) + 1)
+        self.opened.append(instance)
+        return instance
+
+    def convert(self, instance, kind, input_path, output_path, log=_noop):
+        if self.latency:
+            time.sleep(self.latency)
+        if os.path.basename(input_path) in self.hang_names:
+            time.sleep(self.hang_seconds)
+        if os.path.basename(input_path) in self.fail_names:
+            raise Exception("가짜 변환 오류")
+        write_dummy_pdf(output_path, os.path.basename(input_path))
+        instance.converted += 1
+        self.conversions += 1
+
+    def close_instance(self, instance, kind):
+        instance.closed = True
+        self.closed.append(instance)
+
+
+class DaemonBackend(ConverterBackend):
+    """오래 떠 있는 변환 데몬(convert_daemon.py, LibreOffice 등)에 문서를 보내는 백엔드
+
+    인스턴스는 데몬 연결(DaemonClient) 하나입니다. 데몬이 여러 문서를 동시에 변환하므로
+    iter_document_conversions는 변환 프로세스를 띄우지 않고 iter_convert로 모든 문서를 한
+    연결에 보냅니다 (multiplexed). DaemonClient는 한 스레드에서만 쓸 수 있으므로 여러
+    병합이 같은 백엔드를 함께 써도 iter_convert 호출과 인스턴스마다 연결을 따로 엽니다.
+    fake: 데몬을 빈 PDF를 쓰는 대역(--fake)으로 띄움 (Office 없는 테스트용)
+    python: 데몬을 띄울 Python (LibreOffice의 program/python 등, daemon_command 참고)
+    """
+    name = "daemon"
+    multiplexed = True
+
+    def __init__(self, address=DEFAULT_DAEMON_ADDRESS, fake=False, daemon_args=(), python=None):
+        self.address = tuple(address)
+        self.fake = fake
+        self.daemon_args = tuple(daemon_args)
+        self.python = python
+        if fake:
+            # 대역이 만든 빈 PDF가 실제 변환 결과로 캐시되지 않도록 이름을 구분
+            self.name = "daemon-fake"
+
+    def new_client(self, log=_noop):
+        """새 데몬 연결 (호출한 스레드에서만 사용)"""
+        return DaemonClient(self.address, daemon_command(self.address, self.fake, self.daemon_args, self.python),
+                            log)
+
+    def open_instance(self, kind, log=_noop):
+        client = self.new_client(log)
+        client.connect()
+        return client
+
+    def convert(self, instance, kind, input_path, output_path, log=_noop):
+        instance.log = log
+        instance.convert(kind, input_path, output_path)
+
+    def close_instance(self, instance, kind):
+        instance.close()
+
+    def iter_convert(self, jobs, log=_noop, timeouts=None):
+        """jobs: [(문서 경로, PDF 경로)]를 한꺼번에 데몬에 보내고
+        끝나는 순서대로 (순번, 오류 메시지 또는 None)을 yield 합니다."""
+        requests = []
+        for index, (doc_path, pdf_path) in enumerate(jobs):
+            try:
+                kind = doc_kind(doc_path)
+            except Exception as e:
+                yield index, f"{Path(doc_path).name} 변환 실패: {str(e)}"
+                continue
+            requests.append((index, (kind, os.path.abspath(str(doc_path)), os.path.abspath(str(pdf_path)))))
+        if not requests:
+            return
+        client = self.new_client(log)
+        try:
+            client.connect()
+        except Exception as e:
+            for index, _ in requests:
+                yield index, f"{Path(jobs[index][0]).name} 변환 실패: {str(e)}"
+            return
+        def started(position):
+            log(f"  -> 변환 중: {Path(jobs[requests[position][0]][0]).name}")
+
+        try:
+            for position, error in client.convert_stream([request for _, request in requests], timeouts, started):
+                index = requests[position][0]
+                yield index, None if error is None else f"{Path(jobs[index][0]).name} 변환 실패: {error}"
+        finally:
+            client.close()
+
+
+def write_dummy_pdf(output_path, title=""):
+    """빈 A4 페이지 하나짜리 PDF를 씁니다."""
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    writer.add_blank_page(595, 842)
+    if title:
+        writer.add_metadata({"/Title": title})
+    with open(output_path, "wb") as f:
+        writer.write(f)
+
+
+# 이름 → 백엔드 클래스 (CLI --converter 옵션 등에서 사용)
+BACKENDS = {
+    Win32ComBackend.name: Win32ComBackend,
+    FakeBackend.name: FakeBackend,
+    DaemonBackend.name: DaemonBackend,
+}
+
+
+def make_backend(name, **kwargs):
+    """이름으로 변환 백엔드를 만듭니다."""
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"알 수 없는 변환 백엔드: {name} (사용 가능: {', '.join(BACKENDS)})")
+    return backend_class(**kwargs)
+
+
+class ConverterPool:
+    """문서 종류별로 프로그램 인스턴스를 하나씩 유지하는 변환기 풀
+
+    같은 스레드에서만 사용해야 합니다 (COM 아파트는 스레드 단위).
+    trace: merge_trace 콜백 (프로그램 실행 'startup'과 변환 'convert' 구간을 기록)
+    on_open: 인스턴스를 새로 띄울 때마다 on_open(종류, 인스턴스) 호출
+    """
+
+    def __init__(self, backend=None, max_uses=50, log=_noop, trace=None, on_open=None):
+        self.backend = backend if backend is not None else Win32ComBackend()
+        self.max_uses = max_uses
+        self.log = log
+        self.trace = trace
+        self.on_open = on_open
+        self._instances = {}  # kind -> [instance, 사용 횟수]
+        self._initialized = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _acquire(self, kind):
+        if not self._initialized:
+            self.backend.initialize()
+            self._initialized = True
+
+        entry = self._instances.get(kind)
+        if entry is not None and entry[1] >= self.max_uses:
+            self.log(f"    [변환기] {kind} 인스턴스 재시작 ({entry[1]}개 변환 완료)")
+            self._discard(kind)
+            entry = None
+        if entry is None:
+            start = time.perf_counter_ns()
+            entry = [self.backend.open_instance(kind, self.log), 0]
+            worker_span(self.trace, 'startup', 'convert', start, kind=kind)
+            if self.on_open is not None:
+                self.on_open(kind, entry[0])
+            self._instances[kind] = entry
+        return entry
+
+    def _discard(self, kind):
+        entry = self._instances.pop(kind, None)
+        if entry is not None:
+            self.backend.close_instance(entry[0], kind)
+
+    def convert(self, doc_path, output_pdf_path):
+        """문서를 PDF로 변환합니다. 실패하면 Exception("<파일명> 변환 실패: ...")"""
+        doc_path = Path(doc_path)
+        # 절대 경로로 변환하고 문자열로 변환
+        input_path = os.path.abspath(str(doc_path))
+        output_path = os.path.abspath(str(output_pdf_path))
+        try:
+            kind = doc_kind(doc_path)
+            entry = self._acquire(kind)
+            start = time.perf_counter_ns()
+            try:
+                self.backend.convert(entry[0], kind, input_path, output_path, self.log)
+            except Exception:
+                # 오류가 난 인스턴스는 상태를 믿을 수 없으므로 새로 띄움
+                self._discard(kind)
+                raise
+            finally:
+                worker_span(self.trace, 'convert', 'convert', start, file=doc_path.name, kind=kind)
+            entry[1] += 1
+        except Exception as e:
+            raise Exception(f"{doc_path.name} 변환 실패: {str(e)}")
+
+    def close(self):
+        """모든 인스턴스를 종료합니다."""
+        for kind in list(self._instances):
+            self._discard(kind)
+        if self._initialized:
+            self._initialized = False
+            self.backend.uninitialize()
@@ -0,0 +1,426 @@
+"""변환 데몬(convert_daemon.py) 클라이언트
+
+문서마다 변환 프로그램을 띄우지 않고, 오래 떠 있는 데몬 하나에 로컬 소켓으로 문서를
+여러 개 한꺼번에 보냅니다. 요청마다 번호(id)를 붙이고 응답은 끝나는 순서대로 받습니다.
+
+프로토콜 (한 줄에 JSON 하나, UTF-8):
+    요청  {"token": "...", "id": 1, "kind": "word", "input": "C:/.../a.docx", "output": "C:/.../a.pdf"}
+    응답  {"id": 1, "event": "start"}                      변환 시작
+          {"id": 1, "event": "done"}                       성공
+          {"id": 1, "event": "done", "error": "..."}       실패
+    종료  {"token": "...", "command": "exit"}              데몬이 바로 종료 (응답 없음)
+    확인  {"token": "...", "command": "hello"}             연결 직후 토큰 확인
+    응답  {"event": "ready"}
+
+데몬은 띄울 때마다 임의의 토큰을 만들어 사용자 폴더의 토큰 파일(token_path, 본인만 읽기)에
+쓰고, 토큰이 맞지 않는 요청은 처리하지 않고 연결을 끊습니다. 같은 사용자의 클라이언트만 토큰
+파일을 읽어 변환(임의 경로 읽기/쓰기)이나 종료를 요청할 수 있습니다.
+
+데몬은 LibreOffice의 uno 모듈을 불러올 수 있는 Python으로 실행해야 합니다 (보통
+LibreOffice에 포함된 program/python). daemon_command의 python으로 지정하고, 없으면
+LibreOffice 설치 폴더의 Python, 그것도 없으면 지금 실행 중인 Python을 씁니다.
+
+데몬에 연결할 수 없으면 데몬을 띄우고, 연결이 끊기면(데몬이 죽음) 다시 띄워서 처리 중이던
+요청을 한 번 더 보냅니다. 한 문서가 시간 제한을 넘기거나, 보낸 요청이 하나도 시작되지 않은
+채로 시간 제한의 QUEUE_TIMEOUT_FACTOR배가 지나면(다른 클라이언트의 문서에서 멈춘 데몬)
+데몬을 종료시키고 다시 띄웁니다. 데몬을 누가 띄웠든 종료 요청으로 끝내므로 멈춘 데몬에
+다시 연결하지 않습니다. 한 스레드에서만 사용해야 합니다.
+"""
+import json
+import os
+import queue
+import secrets
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+# 데몬 기본 주소 (로컬 전용)
+DEFAULT_DAEMON_ADDRESS = ('127.0.0.1', 47651)
+# 데몬을 띄운 뒤 연결될 때까지 기다리는 시간 (초)
+STARTUP_TIMEOUT = 30
+# 한 번 변환하는 동안 데몬을 다시 띄우는 최대 횟수
+MAX_RESTARTS = 3
+# 데몬이 죽어서 다시 보내는 것까지 포함한 요청 하나의 최대 시도 횟수
+MAX_ATTEMPTS = 2
+# 응답/시간 초과 확인 주기 (초)
+POLL_INTERVAL = 0.5
+# 요청이 시작되지 않은 채 기다릴 수 있는 시간 = 문서 종류별 시간 제한 × 이 값
+# (다른 연결의 변환이 앞에 있을 수 있으므로 여유를 둠)
+QUEUE_TIMEOUT_FACTOR = 2
+# 종료 요청 뒤 데몬 연결이 끊길 때까지 기다리는 시간 (초)
+SHUTDOWN_TIMEOUT = 5
+# 토큰이 거절될 때 토큰 파일을 다시 읽어 연결해 보는 시간 (초)
+TOKEN_TIMEOUT = 5
+# 다른 데몬이 이미 포트를 쓰고 있을 때 convert_daemon.py의 종료 코드
+EXIT_ADDRESS_IN_USE = 3
+
+
+def _noop(*args, **kwargs):
+    pass
+
+
+def daemon_state_dir():
+    """데몬 토큰/로그 파일 폴더 (사용자별, Windows: %LOCALAPPDATA%, 그 외: ~/.cache)"""
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~\\AppData\\Local')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return Path(base) / 'pdf_merge' / 'daemon'
+
+
+def token_path(address):
+    """포트별 데몬 토큰 파일"""
+    return daemon_state_dir() / f"daemon_{address[1]}.token"
+
+
+def log_path(address):
+    """클라이언트가 띄운 데몬의 오류 출력 파일 (바로 종료된 이유를 알리는 데 씀)"""
+    return daemon_state_dir() / f"daemon_{address[1]}.log"
+
+
+def new_token():
+    return secrets.token_hex(16)
+
+
+def write_token(address, token):
+    """토큰 파일을 본인만 읽을 수 있게 씁니다 (다 쓴 뒤 바꿔 넣음)."""
+    path = token_path(address)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    fd = os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='ascii') as f:
+        f.write(token)
+    os.replace(temp, path)
+    return path
+
+
+def read_token(address):
+    """데몬 토큰 (토큰 파일이 없으면 None)"""
+    try:
+        return token_path(address).read_text(encoding='ascii').strip() or None
+    except OSError:
+        return None
+
+
+def find_office_python():
+    """LibreOffice에 포함된 Python 경로 (찾지 못하면 None)"""
+    if sys.platform == 'win32':
+        roots = [os.environ.get(name) for name in ('ProgramFiles', 'ProgramFiles(x86)')]
+        candidates = [Path(root) / 'LibreOffice' / 'program' / 'python.exe' for root in roots if root]
+    elif sys.platform == 'darwin':
+        candidates = [Path('/Applications/LibreOffice.app/Contents/Resources/python')]
+    else:
+        # 리눅스 배포판은 보통 시스템 Python에 python3-uno 패키지로 uno를 넣음
+        candidates = [Path('/opt/libreoffice/program/python'), Path('/usr/lib/libreoffice/program/python')]
+    for candidate in candidates:
+        if candidate.is_file():
+            return str(candidate)
+    return None
+
+
+def parse_address(text):
+    """'host:port' 또는 'port'를 (host, port)로 바꿉니다."""
+    host, _, port = text.rpartition(':')
+    if not port.isdigit():
+        raise ValueError(f"잘못된 데몬 주소: {text} (예: 127.0.0.1:47651)")
+    return host or DEFAULT_DAEMON_ADDRESS[0], int(port)
+
+
+def daemon_command(address, fake=False, extra_args=(), python=None):
+    """convert_daemon.py를 실행하는 명령 (띄울 수 없으면 None)
+
+    python: 데몬을 실행할 Python (None이면 대역은 지금 Python, LibreOffice 모드는
+    find_office_python() 또는 지금 Python)
+    """
+    frozen = getattr(sys, 'frozen', False)
+    # 실행 파일(PyInstaller)로 묶였으면 sys.executable은 이 프로그램 자신이므로 옆의 스크립트를 씀
+    script = (Path(sys.executable).parent if frozen else Path(__file__).parent) / 'convert_daemon.py'
+    if python is None and not fake:
+        python = find_office_python()
+    if python is None and not frozen:
+        python = sys.executable
+    if python is None or not script.is_file():
+        return None
+    host, port = address
+    command = [python, str(script), '--host', host, '--port', str(port)]
+    if fake:
+        command.append('--fake')
+    return command + list(extra_args)
+
+
+def _read_line(sock):
+    """소켓에서 한 줄을 읽습니다 (다음 줄을 미리 읽지 않도록 한 바이트씩)."""
+    data = bytearray()
+    while not data.endswith(b"\n"):
+        chunk = sock.recv(1)
+        if not chunk:
+            break
+        data += chunk
+    return data.decode('utf-8')
+
+
+def _last_error(error_log):
+    """데몬 오류 출력의 마지막 줄 (': 내용' 형식, 없으면 빈 문자열)"""
+    try:
+        lines = error_log.read_text(encoding='utf-8', errors='replace').strip().splitlines()
+    except OSError:
+        return ""
+    return f": {lines[-1]}" if lines else ""
+
+
+class DaemonClient:
+    """변환 데몬 연결 하나
+
+    command: 연결할 수 없을 때 데몬을 띄울 명령 (None이면 띄우지 않고 오류)
+    """
+
+    def __init__(self, address=DEFAULT_DAEMON_ADDRESS, command=None, log=_noop):
+        self.address = tuple(address)
+        self.command = command
+        self.log = log
+        self._sock = None
+        self._process = None     # 이 클라이언트가 띄운 데몬
+        self._events = queue.Queue()  # (요청 id, 'start'/'done'/'lost', 오류 또는 연결 세대)
+        self._next_id = 1
+        self._generation = 0     # 연결할 때마다 1씩 증가 (끊긴 이전 연결의 알림 구분)
+        self._token = None
+
+    @property
+    def connected(self):
+        return self._sock is not None
+
+    def connect(self):
+        """데몬에 연결합니다. 연결할 수 없으면 데몬을 띄우고 기다립니다."""
+        if self._sock is not None:
+            return
+        try:
+            sock = socket.create_connection(self.address, timeout=1)
+        except OSError:
+            if self.command is None:
+                raise Exception(f"변환 데몬에 연결할 수 없습니다 ({self.address[0]}:{self.address[1]}). "
+                                f"convert_daemon.py를 LibreOffice의 Python으로 먼저 실행하거나 "
+                                f"--daemon-python으로 데몬을 띄울 Python을 지정하세요")
+            sock = self._launch()
+        sock = self._authenticate(sock)
+        sock.settimeout(None)
+        self._sock = sock
+        self._generation += 1
+        threading.Thread(target=self._read_loop, args=(sock, self._generation),
+                         name="daemon-reader", daemon=True).start()
+
+    def _authenticate(self, sock):
+        """토큰 파일의 토큰으로 확인 요청을 보내 데몬이 받아들인 연결을 돌려줍니다.
+
+        막 뜬 데몬은 포트를 연 뒤에 토큰 파일을 쓰므로, 거절되면(없거나 이전 데몬의 토큰)
+        잠시 뒤 토큰을 다시 읽어 새로 연결합니다.
+        """
+        deadline = time.monotonic() + TOKEN_TIMEOUT
+        while True:
+            self._token = read_token(self.address)
+            if self._token is not None:
+                try:
+                    # LibreOffice 모드 데몬은 soffice가 뜬 뒤에 응답함
+                    sock.settimeout(STARTUP_TIMEOUT)
+                    sock.sendall(json.dumps({'token': self._token, 'command': 'hello'}).encode('utf-8') + b"\n")
+                    if json.loads(_read_line(sock) or 'null') == {'event': 'ready'}:
+                        return sock
+                except (OSError, ValueError):
+                    pass
+            sock.close()
+            if time.monotonic() >= deadline:
+                raise Exception(f"변환 데몬이 연결을 받아들이지 않습니다 (토큰 파일: {token_path(self.address)})")
+            time.sleep(0.1)
+            sock = socket.create_connection(self.address, timeout=1)
+
+    def _launch(self):
+        self.log(f"    [변환기] 변환 데몬 시작: {self.address[0]}:{self.address[1]}")
+        error_log = log_path(self.address)
+        try:
+            error_log.parent.mkdir(parents=True, exist_ok=True)
+            with open(error_log, 'wb') as stderr:
+                self._process = subprocess.Popen(
+                    self.command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=stderr,
+                    # 병합이 끝나도 다음 실행에서 다시 쓰도록 데몬은 따로 떠 있음
+                    start_new_session=(os.name == 'posix')
+                )
+        except OSError as e:
+            raise Exception(f"변환 데몬을 실행할 수 없습니다 ({self.command[0]}): {e}")
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            try:
+                return socket.create_connection(self.address, timeout=1)
+            except OSError:
+                pass
+            exit_code = self._process.poll()
+            if exit_code is not None and exit_code != EXIT_ADDRESS_IN_USE:
+                # 포트를 다른 데몬이 먼저 잡은 경우(동시에 띄움)가 아니면 실패
+                raise Exception(f"변환 데몬이 바로 종료됨 (종료 코드 {exit_code}, {self.command[0]}){_last_error(error_log)}")
+            time.sleep(0.1)
+        raise Exception(f"변환 데몬이 {STARTUP_TIMEOUT}초 안에 응답하지 않습니다")
+
+    def _read_loop(self, sock, generation):
+        """응답을 읽어 이벤트 큐에 넣습니다 (읽기 스레드). 연결이 끊기면 'lost'"""
+        try:
+            with sock.makefile('r', encoding='utf-8') as reader:
+                for line in reader:
+                    try:
+                        message = json.loads(line)
+                    except ValueError:
+                        continue
+                    self._events.put((message.get('id'), message.get('event'), message.get('error')))
+        except (OSError, ValueError):
+            pass
+        self._events.put((None, 'lost', generation))
+
+    def _send(self, kind, input_path, output_path):
+        """요청 하나를 보내고 요청 id를 돌려줍니다. 보내지 못해도 연결이 끊긴 것은 읽기 스레드가 알림"""
+        request_id = self._next_id
+        self._next_id += 1
+        line = json.dumps({'token': self._token, 'id': request_id, 'kind': kind,
+                           'input': input_path, 'output': output_path}, ensure_ascii=False) + "\n"
+        try:
+            self._sock.sendall(line.encode('utf-8'))
+        except OSError:
+            pass
+        return request_id
+
+    def _shutdown_daemon(self):
+        """연결한 데몬에 종료를 요청하고 연결이 끊길 때까지 기다립니다 (다른 클라이언트가 띄운 데몬도)."""
+        generation = self._generation
+        try:
+            self._sock.sendall(json.dumps({'token': self._token, 'command': 'exit'}).encode('utf-8') + b"\n")
+        except OSError:
+            return
+        deadline = time.monotonic() + SHUTDOWN_TIMEOUT
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.log("    [변환기] 변환 데몬이 종료 요청에 응답하지 않음")
+                return
+            try:
+                # 다시 보낼 요청은 이미 정리했으므로 남은 응답은 버림
+                _, event, detail = self._events.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if event == 'lost' and detail == generation:
+                return
+
+    def restart(self, kill=True):
+        """연결을 끊고 다시 연결합니다.
+
+        kill: 데몬을 종료시킨 뒤 다시 띄움 (멈춘 데몬, 이 클라이언트가 띄운 데몬은 강제 종료)
+        """
+        if kill and self._sock is not None:
+            self._shutdown_daemon()
+        self.close()
+        if kill and self._process is not None and self._process.poll() is None:
+            self._process.kill()
+            self._process.wait()
+        self._process = None
+        self.connect()
+
+    def convert_stream(self, jobs, timeouts=None, started=_noop):
+        """jobs: [(문서 종류, 입력 경로, 출력 경로)]를 한꺼번에 보내고
+        끝나는 순서대로 (순번, 오류 메시지 또는 None)을 yield 합니다.
+
+        timeouts: 문서 종류별 시간 제한 (초, 데몬이 변환을 시작한 때부터, 0이면 제한 없음)
+        started: 데몬이 변환을 시작하면 started(순번) 호출
+        """
+        self.connect()
+        timeouts = timeouts or {}
+        pending = {}  # 요청 id -> [순번, 시도 횟수, 시작 시각 또는 None]
+        restarts = 0
+        last_progress = time.monotonic()  # 보낸 요청이 마지막으로 시작/완료된 시각
+
+        def submit(index, attempts):
+            kind, input_path, output_path = jobs[index]
+            pending[self._send(kind, input_path, output_path)] = [index, attempts, None]
+
+        for index in range(len(jobs)):
+            submit(index, 1)
+
+        while pending:
+            try:
+                request_id, event, detail = self._events.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                event = None
+
+            lost_reason = None
+            daemon_died = False
+            if event == 'start' and request_id in pending:
+                pending[request_id][2] = last_progress = time.monotonic()
+                started(pending[request_id][0])
+            elif event == 'done' and request_id in pending:
+                last_progress = time.monotonic()
+                index = pending.pop(request_id)[0]
+                yield index, detail
+            elif event == 'lost' and detail == self._generation:
+                lost_reason = "변환 데몬이 비정상 종료됨"
+                daemon_died = True
+
+            now = time.monotonic()
+            for request_id, (index, attempts, started_at) in list(pending.items()):
+                limit = timeouts.get(jobs[index][0]) or 0
+                if started_at is not None and limit and now - started_at >= limit:
+                    # 멈춘 데몬은 다른 요청도 처리하지 못하므로 다시 띄움
+                    del pending[request_id]
+                    lost_reason = lost_reason or "시간 초과로 변환 데몬 재시작"
+                    yield index, f"시간 초과 ({limit:g}초 동안 응답 없음)"
+            if lost_reason is None and not any(entry[2] is not None for entry in pending.values()):
+                # 보낸 요청이 하나도 시작되지 않음: 다른 연결의 문서에서 멈춘 데몬일 수 있음
+                for index, _, _ in pending.values():
+                    limit = timeouts.get(jobs[index][0]) or 0
+                    if limit and now - last_progress >= limit * QUEUE_TIMEOUT_FACTOR:
+                        lost_reason = "변환 데몬이 변환을 시작하지 않아 재시작"
+                        break
+
+            if lost_reason is None:
+                continue
+            restarts += 1
+            self.log(f"    [변환기] {lost_reason} ({restarts}/{MAX_RESTARTS})")
+            retry = sorted(pending.values())
+            pending.clear()
+            if restarts > MAX_RESTARTS:
+                for index, _, _ in retry:
+                    yield index, "변환 데몬이 계속 비정상 종료되어 변환하지 못함"
+                return
+            try:
+                self.restart(kill=not daemon_died)
+            except Exception as e:
+                for index, _, _ in retry:
+                    yield index, str(e)
+                return
+            last_progress = time.monotonic()
+            for index, attempts, started_at in retry:
+                if started_at is None:
+                    # 시작하지 못한 요청은 시도 횟수에 넣지 않음
+                    submit(index, attempts)
+                elif attempts < MAX_ATTEMPTS:
+                    submit(index, attempts + 1)
+                else:
+                    yield index, "변환 중 변환 데몬이 비정상 종료됨"
+
+    def convert(self, kind, input_path, output_path, timeout=0):
+        """문서 하나를 변환합니다. 실패하면 Exception"""
+        for _, error in self.convert_stream([(kind, input_path, output_path)], {kind: timeout}):
+            if error is not None:
+                raise Exception(error)
+
+    def shutdown(self):
+        """연결한 데몬을 종료시키고 연결을 끊습니다."""
+        if self._sock is not None:
+            self._shutdown_daemon()
+        self.close()
+
+    def close(self):
+        """연결을 끊습니다. 데몬은 다음 실행에서 다시 쓰도록 그대로 둠"""
+        if self._sock is not None:
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._sock.close()
+            self._sock = None
@@ -0,0 +1,115 @@
+"""중복 원본 찾기 (같은 영수증을 두 번 넣은 경우 등)
+
+두 단계로 찾습니다.
+1. 병합 전: 원본 파일 내용 해시를 여러 스레드로 한꺼번에 계산해, 내용이 같은 파일을
+   변환하기 전에 찾습니다 (영수증.jpg와 영수증 (1).jpg).
+2. 변환 후: 추가하기 직전에 페이지마다 내용 스트림과 페이지가 쓰는 이미지/폼 데이터의
+   해시(페이지 지문)를 구해, 모든 페이지가 앞에서 추가한 페이지와 같은 파일을 찾습니다
+   (바이트는 다르지만 같은 문서를 다시 저장한 PDF 등). 페이지를 한 번 더 읽고 이미지
+   압축도 풀어야 해서 병합보다 몇 배 오래 걸릴 수 있으므로 정책이 'off'가 아닐 때만 합니다.
+
+정책 (MergeOptions.duplicate_policy):
+    'off'  찾지 않음 (기본값)
+    'flag' 찾아서 로그와 요약에 표시하고 병합에는 포함
+    'skip' 병합에서 빼고 요약에 제외 목록으로 표시 (1단계에서 찾으면 변환도 하지 않음)
+"""
+import hashlib
+import os
+
+DUPLICATE_POLICIES = ('off', 'flag', 'skip')
+DEFAULT_DUPLICATE_POLICY = 'off'
+# 원본 해시를 계산할 최대 스레드 수 (디스크 읽기가 대부분이라 많을 필요 없음)
+MAX_HASH_WORKERS = 8
+# 폼 XObject 안의 자원을 따라갈 최대 깊이
+MAX_RESOURCE_DEPTH = 4
+
+
+def hash_sources(sources, digest_for, workers=0):
+    """원본마다 digest_for(경로)의 결과를 여러 스레드로 구합니다.
+
+    digest_for: MergeManifest.digest_for처럼 (내용 해시, 크기/수정 시각)을 돌려주는 함수
+    반환값: 원본 순서대로 (해시, 크기/수정 시각) 또는 읽을 수 없으면 None
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    def digest_or_none(src):
+        try:
+            return digest_for(src)
+        except OSError:
+            return None
+
+    workers = workers or min(MAX_HASH_WORKERS, (os.cpu_count() or 1) + 4)
+    if workers <= 1 or len(sources) <= 1:
+        return [digest_or_none(src) for src in sources]
+    with ThreadPoolExecutor(max_workers=min(workers, len(sources))) as executor:
+        return list(executor.map(digest_or_none, sources))
+
+
+def _update_with_resources(digest, resources, depth=0):
+    """페이지 모양을 바꾸는 자원(이미지/폼 XObject 데이터, 글꼴 이름)을 해시에 넣습니다."""
+    if resources is None or depth > MAX_RESOURCE_DEPTH:
+        return
+    resources = resources.get_object()
+    fonts = resources.get('/Font')
+    if fonts is not None:
+        fonts = fonts.get_object()
+        for name in sorted(fonts):
+            digest.update(name.encode('latin-1', 'replace'))
+            digest.update(str(fonts[name].get_object().get('/BaseFont', '')).encode('utf-8', 'replace'))
+    xobjects = resources.get('/XObject')
+    if xobjects is None:
+        return
+    xobjects = xobjects.get_object()
+    for name in sorted(xobjects):
+        xobject = xobjects[name].get_object()
+        digest.update(name.encode('latin-1', 'replace'))
+        digest.update(xobject.get_data())
+        if xobject.get('/Subtype') == '/Form':
+            _update_with_resources(digest, xobject.get('/Resources'), depth + 1)
+
+
+def page_fingerprint(page):
+    """페이지 지문: 크기, 내용 스트림, 쓰는 자원 데이터의 SHA-256"""
+    digest = hashlib.sha256()
+    digest.update(repr([round(float(value), 2) for value in page.mediabox]).encode('ascii'))
+    digest.update(repr(page.get('/Rotate', 0)).encode('ascii'))
+    contents = page.get_contents()
+    if contents is not None:
+        digest.update(contents.get_data())
+    _update_with_resources(digest, page.get('/Resources'))
+    return digest.hexdigest()
+
+
+def pdf_fingerprints(source, pages=None):
+    """PDF의 페이지 지문 목록
+
+    source: 경로, 파일 객체 또는 PdfReader, pages: range(페이지 순번) (None이면 전체)
+    """
+    from pypdf import PdfReader
+
+    if isinstance(source, PdfReader):
+        reader_pages = source.pages
+        return [page_fingerprint(reader_pages[i]) for i in (pages if pages is not None else range(len(reader_pages)))]
+    with PdfReader(source) as reader:
+        return pdf_fingerprints(reader, pages)
+
+
+class PageIndex:
+    """이미 추가한 페이지의 지문 -> 그 페이지를 가져온 파일 이름"""
+
+    def __init__(self):
+        self._owners = {}
+
+    def duplicate_of(self, fingerprints):
+        """모든 페이지가 이미 추가된 페이지와 같으면 처음 같은 페이지가 있던 파일 이름, 아니면 None"""
+        if not fingerprints or any(fingerprint not in self._owners for fingerprint in fingerprints):
+            return None
+        return self._owners[fingerprints[0]]
+
+    def repeated_pages(self, fingerprints):
+        """이미 추가된 페이지와 같은 페이지 수"""
+        return sum(1 for fingerprint in fingerprints if fingerprint in self._owners)
+
+    def add(self, name, fingerprints):
+        for fingerprint in fingerprints:
+            self._owners.setdefault(fingerprint, name)
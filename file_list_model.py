@@ -0,0 +1,120 @@
+"""파일 목록의 순서와 선택 상태 (화면과 분리된 모델)
+
+병합 순서는 이 모델의 items가 정하고, 화면(file_list_view)은 보이는 줄만 그립니다.
+여러 파일을 골라 한 칸씩/맨 위로/맨 아래로 옮기기, 열 기준 정렬, 한꺼번에 제외를
+위젯 조작 없이 목록 연산만으로 처리합니다. 이름(폴더 기준 상대 경로)은 목록 안에서
+중복되지 않는다고 가정합니다.
+"""
+
+
+class FileListModel:
+    """병합할 파일 이름 목록과 선택된 이름"""
+
+    def __init__(self, items=None):
+        self.items = list(items or [])
+        self.selected = set()
+        # Shift 클릭 범위 선택의 기준 위치
+        self.anchor = None
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def set_items(self, items):
+        """목록을 바꿉니다. 새 목록에 남아 있는 이름은 선택 상태 유지"""
+        self.items = list(items)
+        names = set(self.items)
+        self.selected &= names
+        self.anchor = None
+
+    def selected_indices(self):
+        """선택된 줄 번호 (오름차순)"""
+        if not self.selected:
+            return []
+        return [index for index, name in enumerate(self.items) if name in self.selected]
+
+    def is_selected(self, index):
+        return self.items[index] in self.selected
+
+    # --- 선택 ---
+
+    def select(self, index, toggle=False, extend=False):
+        """클릭한 줄을 선택합니다. toggle: Ctrl 클릭, extend: Shift 클릭(기준 위치부터 범위)"""
+        if not 0 <= index < len(self.items):
+            return
+        name = self.items[index]
+        if extend and self.anchor is not None:
+            low, high = sorted((self.anchor, index))
+            if not toggle:
+                self.selected.clear()
+            self.selected.update(self.items[low:high + 1])
+            return
+        if toggle:
+            self.selected.symmetric_difference_update((name,))
+        else:
+            self.selected = {name}
+        self.anchor = index
+
+    def select_all(self):
+        self.selected = set(self.items)
+
+    def clear_selection(self):
+        self.selected.clear()
+        self.anchor = None
+
+    # --- 순서 바꾸기 ---
+
+    def move_selected(self, delta):
+        """선택한 줄을 delta칸(음수면 위로) 옮깁니다. 끝에 닿은 줄은 멈추고 나머지만 움직임
+
+        옮긴 뒤 첫 번째 선택 줄의 번호를 돌려줍니다 (선택이 없으면 None).
+        """
+        if not self.selected or not delta:
+            return None
+        items = self.items
+        step = -1 if delta < 0 else 1
+        for _ in range(abs(delta)):
+            # 움직이는 방향의 앞쪽부터 한 칸씩 자리를 바꿈 (연속 선택은 덩어리째 움직임)
+            positions = range(len(items)) if step < 0 else range(len(items) - 1, -1, -1)
+            moved = False
+            for index in positions:
+                target = index + step
+                if 0 <= target < len(items) and items[index] in self.selected \
+                        and items[target] not in self.selected:
+                    items[index], items[target] = items[target], items[index]
+                    moved = True
+            if not moved:
+                break
+        self.anchor = None
+        indices = self.selected_indices()
+        return indices[0] if indices else None
+
+    def move_selected_to_top(self):
+        """선택한 줄을 순서를 유지한 채 맨 위로 옮깁니다."""
+        chosen = [name for name in self.items if name in self.selected]
+        self.items = chosen + [name for name in self.items if name not in self.selected]
+        self.anchor = None
+        return 0 if chosen else None
+
+    def move_selected_to_bottom(self):
+        """선택한 줄을 순서를 유지한 채 맨 아래로 옮깁니다."""
+        chosen = [name for name in self.items if name in self.selected]
+        self.items = [name for name in self.items if name not in self.selected] + chosen
+        self.anchor = None
+        return len(self.items) - len(chosen) if chosen else None
+
+    def sort_by(self, key, reverse=False):
+        """key(이름) 기준으로 정렬합니다 (같은 값은 현재 순서 유지)."""
+        self.items.sort(key=key, reverse=reverse)
+        self.anchor = None
+
+    def remove_selected(self):
+        """선택한 줄을 목록에서 빼고 뺀 이름 목록을 돌려줍니다 (파일은 그대로)."""
+        removed = [name for name in self.items if name in self.selected]
+        if removed:
+            self.items = [name for name in self.items if name not in self.selected]
+        self.selected.clear()
+        self.anchor = None
+        return removed
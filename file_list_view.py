@@ -0,0 +1,199 @@
+"""보이는 줄만 그리는 파일 목록 위젯 (FileListModel 표시용)
+
+Canvas에 화면에 보이는 줄만 그리므로 파일이 수만 개여도 그리는 비용은 창 높이에
+비례합니다. 순서 바꾸기는 모델에서 하고 위젯은 다시 그리기만 합니다. 열 제목을
+누르면 그 열로 정렬(다시 누르면 역순)합니다.
+
+선택: 클릭, Ctrl+클릭(추가/해제), Shift+클릭(범위), Ctrl+A(전체)
+선택이 바뀌면 '<<ListSelect>>', Delete 키를 누르면 '<<ListDelete>>' 가상 이벤트를 냅니다.
+"""
+import tkinter as tk
+from dataclasses import dataclass
+from tkinter import ttk
+
+# 목록 바탕색 (선택하지 않은 줄)
+ROW_BG = '#F8F9FA'
+
+
+@dataclass
+class ListColumn:
+    """목록의 열 하나"""
+    title: str
+    value: object          # 이름 -> 표시할 문자열
+    sort_key: object       # 이름 -> 정렬 키
+    width: int = 0         # 픽셀 너비 (0이면 남는 폭을 모두 씀, 첫 열만)
+    anchor: str = tk.W
+
+
+class FileListView(tk.Frame):
+    """FileListModel을 보여 주는 가상화 목록"""
+
+    def __init__(self, master, model, columns, font, colors, row_height=26, **kwargs):
+        super().__init__(master, bg=colors['card_bg'], **kwargs)
+        self.model = model
+        self.columns = columns
+        self.font = font
+        self.colors = colors
+        self.row_height = row_height
+        self.top = 0  # 맨 위에 보이는 줄 번호
+        self.sort_column = None
+        self.sort_reverse = False
+
+        self.header = tk.Frame(self, bg=colors['border'])
+        self.header.pack(side=tk.TOP, fill=tk.X)
+        self._header_labels = []
+        for position, column in enumerate(columns):
+            label = tk.Label(self.header, text=column.title, font=font, bg='#EEF1F4', fg=colors['text'],
+                             anchor=column.anchor, padx=8, cursor='hand2')
+            label.bind('<Button-1>', lambda e, p=position: self.sort_by_column(p))
+            self._header_labels.append(label)
+        self.header.config(height=row_height)
+
+        body = tk.Frame(self, bg=colors['card_bg'])
+        body.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self.scrollbar = ttk.Scrollbar(body, orient=tk.VERTICAL, command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas = tk.Canvas(body, bg=ROW_BG, highlightthickness=1,
+                                highlightbackground=colors['border'], highlightcolor=colors['primary'],
+                                takefocus=1, borderwidth=0)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.canvas.bind('<Configure>', lambda e: self.refresh())
+        self.canvas.bind('<Button-1>', self._on_click)
+        self.canvas.bind('<Control-Button-1>', lambda e: self._on_click(e, toggle=True))
+        self.canvas.bind('<Shift-Button-1>', lambda e: self._on_click(e, extend=True))
+        self.canvas.bind('<MouseWheel>', lambda e: self.scroll(-3 if e.delta > 0 else 3))
+        self.canvas.bind('<Button-4>', lambda e: self.scroll(-3))
+        self.canvas.bind('<Button-5>', lambda e: self.scroll(3))
+        self.canvas.bind('<Up>', lambda e: self._on_arrow(-1))
+        self.canvas.bind('<Down>', lambda e: self._on_arrow(1))
+        self.canvas.bind('<Prior>', lambda e: self.scroll(-self.visible_rows()))
+        self.canvas.bind('<Next>', lambda e: self.scroll(self.visible_rows()))
+        self.canvas.bind('<Control-a>', self._on_select_all)
+        self.canvas.bind('<Delete>', lambda e: self.event_generate('<<ListDelete>>'))
+
+    # --- 그리기 ---
+
+    def visible_rows(self):
+        return max(1, self.canvas.winfo_height() // self.row_height)
+
+    def _column_edges(self, width):
+        """열마다 (왼쪽 x, 오른쪽 x)"""
+        fixed = sum(column.width for column in self.columns[1:])
+        edges = [(0, max(80, width - fixed))]
+        for column in self.columns[1:]:
+            left = edges[-1][1]
+            edges.append((left, left + column.width))
+        return edges
+
+    def refresh(self):
+        """보이는 줄만 다시 그립니다 (모델이 바뀐 뒤 호출)."""
+        count = len(self.model)
+        rows = self.visible_rows()
+        self.top = max(0, min(self.top, count - rows))
+        width = self.canvas.winfo_width()
+        edges = self._column_edges(width)
+        self._layout_header(edges)
+
+        canvas = self.canvas
+        canvas.delete('all')
+        for row in range(min(rows + 1, count - self.top)):
+            index = self.top + row
+            name = self.model[index]
+            y = row * self.row_height
+            selected = self.model.is_selected(index)
+            if selected:
+                canvas.create_rectangle(0, y, width, y + self.row_height, fill=self.colors['primary'], width=0)
+            color = 'white' if selected else self.colors['text']
+            background = self.colors['primary'] if selected else ROW_BG
+            for position, (column, (left, right)) in enumerate(zip(self.columns, edges)):
+                if position:
+                    # 앞 열(긴 파일 이름)이 넘쳐 들어온 부분을 칸 배경으로 가림
+                    canvas.create_rectangle(left, y, right, y + self.row_height, fill=background, width=0)
+                x = right - 8 if column.anchor == tk.E else left + 8
+                canvas.create_text(x, y + self.row_height // 2, text=column.value(name), anchor=column.anchor,
+                                   font=self.font, fill=color)
+        if count:
+            self.scrollbar.set(self.top / count, min(1.0, (self.top + rows) / count))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _layout_header(self, edges):
+        for position, (label, (left, right)) in enumerate(zip(self._header_labels, edges)):
+            title = self.columns[position].title
+            if position == self.sort_column:
+                title += " ▼" if self.sort_reverse else " ▲"
+            label.config(text=title)
+            label.place(x=left, y=0, width=right - left, height=self.row_height)
+
+    # --- 스크롤 ---
+
+    def yview(self, *args):
+        """스크롤바 명령 ('moveto', 비율) 또는 ('scroll', n, 'units'/'pages')"""
+        count = len(self.model)
+        if not args:
+            return
+        if args[0] == 'moveto':
+            self.top = int(float(args[1]) * count)
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            self.top += amount * (self.visible_rows() if args[2] == 'pages' else 1)
+        self.refresh()
+
+    def scroll(self, rows):
+        self.top += rows
+        self.refresh()
+
+    def see(self, index):
+        """index 줄이 보이도록 스크롤합니다."""
+        rows = self.visible_rows()
+        if index < self.top:
+            self.top = index
+        elif index >= self.top + rows:
+            self.top = index - rows + 1
+        self.refresh()
+
+    # --- 입력 ---
+
+    def _on_click(self, event, toggle=False, extend=False):
+        self.canvas.focus_set()
+        index = self.top + event.y // self.row_height
+        if index < len(self.model):
+            self.model.select(index, toggle=toggle, extend=extend)
+        elif not (toggle or extend):
+            self.model.clear_selection()
+        self.refresh()
+        self.event_generate('<<ListSelect>>')
+        return 'break'
+
+    def _on_arrow(self, step):
+        indices = self.model.selected_indices()
+        if not len(self.model):
+            return 'break'
+        index = (indices[0] if step < 0 else indices[-1]) + step if indices else 0
+        index = max(0, min(index, len(self.model) - 1))
+        self.model.select(index)
+        self.see(index)
+        self.event_generate('<<ListSelect>>')
+        return 'break'
+
+    def _on_select_all(self, event):
+        self.model.select_all()
+        self.refresh()
+        self.event_generate('<<ListSelect>>')
+        return 'break'
+
+    def sort_by_column(self, position):
+        """열 제목 클릭: 그 열로 정렬, 같은 열을 다시 누르면 역순"""
+        if self.sort_column == position:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column, self.sort_reverse = position, False
+        self.model.sort_by(self.columns[position].sort_key, self.sort_reverse)
+        self.refresh()
+        self.event_generate('<<ListSelect>>')
+
+    def clear_sort_mark(self):
+        """직접 순서를 바꾸면 정렬 표시를 지움"""
+        self.sort_column = None
+        self.sort_reverse = False
@@ -0,0 +1,188 @@
+"""폴더의 병합 대상 파일을 빠르게 찾는 스캐너
+
+os.scandir로 폴더를 읽고(하위 폴더 포함 선택 가능), 파일마다 크기, 수정 시각,
+파일 형식(앞부분 바이트로 판별), 페이지 수를 디스크 색인에 저장합니다. 다시 읽을
+때는 크기나 수정 시각이 바뀐 파일만 다시 열어 보므로 네트워크 드라이브의 큰
+폴더에서도 빠르고, PDF를 다시 열지 않고 페이지 수를 보여 줄 수 있습니다.
+"""
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+from conversion_cache import default_cache_dir
+from merge_engine import (
+    TEMP_PREFIX, is_merge_output, is_supported_file, natural_sort_key, source_category
+)
+
+INDEX_VERSION = 1
+# 파일 앞부분 바이트 -> 실제 형식
+MAGIC_TYPES = [
+    (b"%PDF", 'pdf'),
+    (b"\xff\xd8\xff", 'jpeg'),
+    (b"\x89PNG\r\n\x1a\n", 'png'),
+    (b"PK\x03\x04", 'zip'),                  # docx/xlsx/pptx/hwpx
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", 'ole'),  # doc/xls/ppt/hwp
+]
+# 확장자 분류별로 정상인 실제 형식
+EXPECTED_TYPES = {
+    'pdf': {'pdf'},
+    'image': {'jpeg', 'png'},
+    'doc': {'zip', 'ole'},
+}
+
+
+def default_index_dir():
+    """폴더 색인을 두는 곳 (변환 캐시 폴더 옆)"""
+    return default_cache_dir().parent / 'folder_index'
+
+
+@dataclass
+class ScanEntry:
+    """스캔한 파일 하나"""
+    name: str           # 폴더 기준 상대 경로 ('/' 구분)
+    size: int
+    mtime_ns: int
+    kind: str           # 확장자 분류: 'pdf', 'image', 'doc'
+    detected: str       # 앞부분 바이트로 판별한 형식 ('pdf', 'jpeg', ..., 'unknown')
+    pages: int = None   # 페이지 수 (문서는 변환 전에는 알 수 없어 None)
+
+    @property
+    def type_mismatch(self):
+        """확장자와 실제 내용이 다른지 (예: 이름만 .pdf인 파일)"""
+        return self.detected not in EXPECTED_TYPES[self.kind]
+
+
+def detect_type(path):
+    """파일 앞부분 바이트로 실제 형식을 판별합니다."""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(8)
+    except OSError:
+        return 'unknown'
+    for magic, name in MAGIC_TYPES:
+        if head.startswith(magic):
+            return name
+    return 'unknown'
+
+
+def count_pages(path, kind, detected):
+    """페이지 수 (알 수 없으면 None)"""
+    if kind == 'image':
+        return 1
+    if kind != 'pdf' or detected != 'pdf':
+        return None
+    # pypdf는 처음 PDF를 셀 때 불러옴 (GUI 시작 시간 단축)
+    from pypdf import PdfReader
+
+    try:
+        # 경로 대신 파일 객체를 넘겨야 파일 전체를 메모리에 읽지 않음
+        with open(path, 'rb') as f:
+            return len(PdfReader(f).pages)
+    except Exception:
+        return None
+
+
+class FolderIndex:
+    """폴더별 스캔 결과 색인 (사용자 캐시 폴더에 JSON으로 저장)"""
+
+    def __init__(self, folder, recursive=False, directory=None):
+        self.folder = Path(folder)
+        self.recursive = recursive
+        self.directory = Path(directory) if directory else default_index_dir()
+        self.entries = {}  # 상대 경로 -> ScanEntry
+
+    @property
+    def path(self):
+        key = f"{os.path.abspath(self.folder)}|{int(self.recursive)}"
+        return self.directory / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]}.json"
+
+    def load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                self.entries = {name: ScanEntry(name, *values) for name, values in data['entries'].items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            self.entries = {}
+        return self
+
+    def save(self):
+        data = {
+            'version': INDEX_VERSION,
+            'folder': os.path.abspath(self.folder),
+            'entries': {
+                entry.name: [entry.size, entry.mtime_ns, entry.kind, entry.detected, entry.pages]
+                for entry in self.entries.values()
+            },
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+
+def _walk(folder, recursive, stop):
+    """(상대 경로, DirEntry)를 yield 합니다. 숨김/임시 폴더는 건너뜀"""
+    pending = [(folder, '')]
+    while pending:
+        directory, prefix = pending.pop()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if stop is not None and stop.is_set():
+                        return
+                    name = prefix + entry.name
+                    try:
+                        # DirEntry.is_file/is_dir는 대부분 추가 stat 없이 디렉터리 목록 정보를 씀
+                        if entry.is_file():
+                            yield name, entry
+                        elif recursive and entry.is_dir(follow_symlinks=False) \
+                                and not entry.name.startswith(('.', '__')):
+                            pending.append((entry.path, name + '/'))
+                    except OSError:
+                        continue
+        except OSError:
+            if directory == folder:
+                raise
+
+
+def scan_folder(folder, recursive=False, index=None, stop=None):
+    """폴더의 병합 대상 파일을 자연 정렬 순서의 ScanEntry 목록으로 돌려줍니다.
+
+    index(FolderIndex)를 주면 크기/수정 시각이 같은 파일은 색인 값을 그대로 쓰고,
+    바뀐 파일만 형식 판별과 페이지 수 세기를 다시 합니다. 끝나면 색인을 저장합니다.
+    stop(threading.Event)이 설정되면 중간에 멈추고 None을 돌려줍니다.
+    """
+    folder = Path(folder)
+    previous = index.entries if index is not None else {}
+    entries = {}
+    for name, dir_entry in _walk(folder, recursive, stop):
+        # 이전 병합 결과(<폴더명>_merged.pdf, 파트 파일)와 변환 임시 파일은 원본이 아님
+        if not is_supported_file(name) or dir_entry.name.startswith(TEMP_PREFIX) \
+                or is_merge_output(os.path.dirname(dir_entry.path), dir_entry.name):
+            continue
+        try:
+            stat = dir_entry.stat()
+        except OSError:
+            continue
+        old = previous.get(name)
+        if old is not None and old.size == stat.st_size and old.mtime_ns == stat.st_mtime_ns:
+            entries[name] = old
+            continue
+        kind = source_category(Path(name))
+        detected = detect_type(dir_entry.path)
+        entries[name] = ScanEntry(name, stat.st_size, stat.st_mtime_ns, kind, detected,
+                                  count_pages(dir_entry.path, kind, detected))
+
+    if stop is not None and stop.is_set():
+        return None
+    if index is not None:
+        index.entries = entries
+        try:
+            index.save()
+        except OSError:
+            pass  # 색인은 속도를 위한 것이므로 저장 실패는 무시
+    return [entries[name] for name in sorted(entries, key=natural_sort_key)]
@@ -0,0 +1,323 @@
+"""이미지 → PDF 변환 (여러 프로세스에서 병렬 처리)
+
+가능한 경우 이미지를 다시 인코딩하지 않고 PDF 페이지에 그대로 넣습니다.
+- 기준선(baseline) JPEG: 압축된 데이터를 DCTDecode 스트림으로 그대로 사용
+  (크기는 헤더에서 읽고, EXIF 회전 정보는 페이지 배치 행렬로 적용)
+- 비인터레이스 8비트 이하 회색조/RGB/팔레트 PNG: IDAT 데이터를 FlateDecode
+  (PNG 예측자) 스트림으로 그대로 사용
+그 밖의 이미지는 Pillow로 RGB 변환 후 PDF로 저장합니다. 결과는 파일이 아니라
+메모리의 PDF 바이트로 돌려줍니다.
+
+ImagePolicy를 주면 페이지 크기에 맞춰 배치하고, 목표 DPI나 최대 픽셀 수를 넘는
+이미지는 축소 후 JPEG으로 다시 압축합니다. 큰 JPEG은 draft()로 축소 디코딩해서
+원본 해상도 전체를 메모리에 올리지 않습니다.
+"""
+import math
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from io import BytesIO
+
+from PIL import Image, ImageOps
+
+from merge_trace import worker_span
+
+# 이미지 → PDF 변환 결과가 바뀌면 올려서 변환 캐시를 무효화
+IMAGE_PAGE_VERSION = 2
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+EXIF_ORIENTATION = 0x0112
+
+# 페이지 크기 (pt, 세로 방향 기준)
+PAGE_SIZES = {
+    'A4': (595, 842),
+    'A3': (842, 1191),
+    'B5': (516, 729),
+    'Letter': (612, 792),
+}
+
+
+@dataclass
+class ImagePolicy:
+    """이미지 축소/재압축 정책"""
+    # 페이지에 맞췄을 때의 목표 해상도 (0이면 DPI 제한 없음)
+    target_dpi: int = 200
+    # 이미지를 맞춰 넣을 페이지 크기 (pt). 가로로 긴 이미지는 가로 방향 페이지 사용
+    page_size: tuple = PAGE_SIZES['A4']
+    # 최대 픽셀 수 (0이면 제한 없음)
+    max_pixels: int = 0
+    # 축소한 이미지를 다시 압축할 때의 JPEG 품질
+    jpeg_quality: int = 85
+
+    def cache_options(self):
+        """변환 캐시 키에 넣을 옵션"""
+        return asdict(self)
+
+    def plan(self, width, height, orientation=1):
+        """원본 픽셀 크기로 (표시 크기 pt, 목표 픽셀 크기, 축소 필요 여부)를 구합니다.
+
+        목표 픽셀 크기는 회전 전(저장된 방향) 기준입니다.
+        """
+        if orientation in (5, 6, 7, 8):
+            shown_w, shown_h = height, width
+        else:
+            shown_w, shown_h = width, height
+        page_w, page_h = self.page_size
+        if (shown_w > shown_h) != (page_w > page_h):
+            page_w, page_h = page_h, page_w
+        fit = min(page_w / shown_w, page_h / shown_h)
+        display = (shown_w * fit, shown_h * fit)
+
+        scale = 1.0
+        if self.target_dpi:
+            scale = min(scale, fit * self.target_dpi / 72)
+        if self.max_pixels:
+            scale = min(scale, math.sqrt(self.max_pixels / (width * height)))
+        target = (max(1, round(width * scale)), max(1, round(height * scale)))
+        return display, target, target[0] < width
+
+
+def default_image_workers():
+    """기본 이미지 변환 프로세스 수 (CPU 코어 수)"""
+    return os.cpu_count() or 1
+
+
+def _orientation_matrix(orientation, width, height):
+    """EXIF 회전 값에 따라 (페이지 너비, 높이, 이미지 배치 행렬)을 구합니다."""
+    w, h = width, height
+    matrices = {
+        1: (w, h, (w, 0, 0, h, 0, 0)),
+        2: (w, h, (-w, 0, 0, h, w, 0)),     # 좌우 반전
+        3: (w, h, (-w, 0, 0, -h, w, h)),    # 180도 회전
+        4: (w, h, (w, 0, 0, -h, 0, h)),     # 상하 반전
+        5: (h, w, (0, -w, -h, 0, h, w)),    # 좌상-우하 대각선 반전
+        6: (h, w, (0, -w, h, 0, 0, w)),     # 시계 방향 90도 회전
+        7: (h, w, (0, w, h, 0, 0, 0)),      # 우상-좌하 대각선 반전
+        8: (h, w, (0, w, -h, 0, h, 0)),     # 반시계 방향 90도 회전
+    }
+    return matrices.get(orientation, matrices[1])
+
+
+def _format_number(value):
+    return f"{value:.4f}".rstrip('0').rstrip('.') if isinstance(value, float) else str(value)
+
+
+def build_image_pdf(image_dict, image_data, width, height, orientation=1, display=None):
+    """이미지 XObject 하나를 페이지 전체에 그리는 한 페이지짜리 PDF 바이트를 만듭니다.
+
+    image_dict: /Width, /Height 등을 포함한 이미지 사전 본문 (/Length 제외)
+    display: 회전 적용 후의 페이지 크기 (pt). None이면 1픽셀 = 1pt
+    """
+    if display is not None:
+        if orientation in (5, 6, 7, 8):
+            width, height = display[1], display[0]
+        else:
+            width, height = display
+    page_width, page_height, matrix = _orientation_matrix(orientation, width, height)
+    content = f"q {' '.join(_format_number(v) for v in matrix)} cm /Im0 Do Q".encode('ascii')
+    media_box = f"0 0 {_format_number(page_width)} {_format_number(page_height)}"
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        (f"<< /Type /Page /Parent 2 0 R /MediaBox [{media_box}] "
+         f"/Resources << /XObject << /Im0 4 0 R >> >> /Contents 5 0 R >>").encode('ascii'),
+        b"<< /Type /XObject /Subtype /Image " + image_dict
+        + f" /Length {len(image_data)} >>\nstream\n".encode('ascii') + image_data + b"\nendstream",
+        f"<< /Length {len(content)} >>\nstream\n".encode('ascii') + content + b"\nendstream",
+    ]
+
+    out = BytesIO()
+    out.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n".encode('ascii') + body + b"\nendobj\n")
+    xref_offset = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('ascii'))
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode('ascii'))
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode('ascii'))
+    return out.getvalue()
+
+
+def _jpeg_passthrough(img_path, image, display=None):
+    """기준선 JPEG이면 재인코딩 없이 PDF 바이트를 만들고, 아니면 None"""
+    if image.format != 'JPEG' or image.mode not in ('L', 'RGB'):
+        return None
+    # 프로그레시브/무손실 등은 Pillow 경로로 처리
+    if image.info.get('progressive') or image.info.get('progression'):
+        return None
+    width, height = image.size
+    orientation = image.getexif().get(EXIF_ORIENTATION, 1)
+    color_space = '/DeviceGray' if image.mode == 'L' else '/DeviceRGB'
+    with open(img_path, 'rb') as f:
+        data = f.read()
+    image_dict = (f"/Width {width} /Height {height} /ColorSpace {color_space} "
+                  f"/BitsPerComponent 8 /Filter /DCTDecode").encode('ascii')
+    return build_image_pdf(image_dict, data, width, height, orientation, display)
+
+
+def _read_png_chunks(data):
+    """PNG 청크를 (종류, 내용) 목록으로 읽습니다."""
+    if not data.startswith(PNG_SIGNATURE):
+        return None
+    chunks = []
+    pos = len(PNG_SIGNATURE)
+    while pos + 8 <= len(data):
+        length, chunk_type = struct.unpack('>I4s', data[pos:pos + 8])
+        chunks.append((chunk_type, data[pos + 8:pos + 8 + length]))
+        pos += 12 + length
+        if chunk_type == b'IEND':
+            break
+    return chunks
+
+
+def _png_passthrough(img_path, image, display=None):
+    """압축 데이터를 그대로 쓸 수 있는 PNG면 PDF 바이트를 만들고, 아니면 None"""
+    if image.format != 'PNG':
+        return None
+    with open(img_path, 'rb') as f:
+        chunks = _read_png_chunks(f.read())
+    if not chunks or chunks[0][0] != b'IHDR':
+        return None
+
+    width, height, bit_depth, color_type, _, _, interlace = struct.unpack('>IIBBBBB', chunks[0][1])
+    # 알파 채널(4, 6), 16비트, 인터레이스는 Pillow 경로로 처리
+    if interlace or bit_depth > 8 or color_type not in (0, 2, 3):
+        return None
+    if color_type == 2 and bit_depth != 8:
+        return None
+
+    if color_type == 0:
+        color_space, colors = '/DeviceGray', 1
+    elif color_type == 2:
+        color_space, colors = '/DeviceRGB', 3
+    else:
+        palette = next((body for kind, body in chunks if kind == b'PLTE'), None)
+        if not palette:
+            return None
+        # 일부 PDF 리더는 2^비트 깊이만큼의 색상표 항목을 기대하므로 모자라면 채움
+        palette = palette.ljust(3 * (1 << bit_depth), b'\x00')
+        color_space = f"[/Indexed /DeviceRGB {len(palette) // 3 - 1} <{palette.hex()}>]"
+        colors = 1
+
+    data = b''.join(body for kind, body in chunks if kind == b'IDAT')
+    image_dict = (f"/Width {width} /Height {height} /ColorSpace {color_space} "
+                  f"/BitsPerComponent {bit_depth} /Filter /FlateDecode "
+                  f"/DecodeParms << /Predictor 15 /Colors {colors} "
+                  f"/BitsPerComponent {bit_depth} /Columns {width} >>").encode('ascii')
+    orientation = image.getexif().get(EXIF_ORIENTATION, 1)
+    return build_image_pdf(image_dict, data, width, height, orientation, display)
+
+
+def _pillow_pdf(image, display=None):
+    """Pillow로 RGB 변환 후 PDF 바이트를 만듭니다 (EXIF 회전 적용)."""
+    rgb = ImageOps.exif_transpose(image).convert("RGB")
+    out = BytesIO()
+    # resolution으로 페이지 크기 지정 (기본 72dpi = 1픽셀 1pt)
+    resolution = rgb.width * 72 / display[0] if display else 72.0
+    rgb.save(out, format="PDF", resolution=resolution)
+    return out.getvalue()
+
+
+def _resampled_pdf(image, target, display, orientation, quality):
+    """목표 픽셀 크기로 축소하고 JPEG으로 다시 압축한 PDF 바이트를 만듭니다."""
+    mode = 'L' if image.mode in ('1', 'L') else 'RGB'
+    if image.format == 'JPEG':
+        # 1/2, 1/4, 1/8 배율로 디코딩해서 원본 해상도 전체를 메모리에 올리지 않음
+        image.draft(mode, target)
+    small = image.convert(mode).resize(target, Image.LANCZOS)
+
+    out = BytesIO()
+    small.save(out, format="JPEG", quality=quality)
+    color_space = '/DeviceGray' if mode == 'L' else '/DeviceRGB'
+    image_dict = (f"/Width {target[0]} /Height {target[1]} /ColorSpace {color_space} "
+                  f"/BitsPerComponent 8 /Filter /DCTDecode").encode('ascii')
+    # 픽셀은 저장된 방향 그대로이므로 EXIF 회전은 배치 행렬로 적용
+    return build_image_pdf(image_dict, out.getvalue(), target[0], target[1], orientation, display)
+
+
+def image_to_pdf_bytes(img_path, policy=None, trace=None):
+    """이미지 파일 하나를 한 페이지짜리 PDF 바이트로 변환합니다.
+
+    trace: merge_trace 콜백 (헤더 읽기 'decode'와 페이지 만들기 'convert' 구간을 기록)
+    """
+    name = os.path.basename(img_path)
+    start = time.perf_counter_ns()
+    with Image.open(img_path) as image:
+        display = None
+        shrink = False
+        if policy is not None:
+            orientation = image.getexif().get(EXIF_ORIENTATION, 1)
+            display, target, shrink = policy.plan(image.width, image.height, orientation)
+        worker_span(trace, 'decode', 'image', start, file=name)
+
+        start = time.perf_counter_ns()
+        if shrink:
+            data = _resampled_pdf(image, target, display, orientation, policy.jpeg_quality)
+        else:
+            # Image.open은 헤더만 읽으므로 그대로 넣을 수 있으면 픽셀을 디코딩하지 않음
+            data = _jpeg_passthrough(img_path, image, display) or _png_passthrough(img_path, image, display)
+            if data is None:
+                data = _pillow_pdf(image, display)
+        worker_span(trace, 'convert', 'image', start, file=name)
+    return data
+
+
+def _traced_image_to_pdf(img_path, policy):
+    """변환 프로세스용: (PDF 바이트, 기록한 구간 목록)"""
+    spans = []
+    data = image_to_pdf_bytes(img_path, policy, lambda *span: spans.append(span))
+    return data, spans
+
+
+def convert_image_to_pdf(img_path, output_pdf_path, policy=None):
+    """이미지 파일 하나를 한 페이지짜리 PDF 파일로 저장합니다."""
+    with open(output_pdf_path, 'wb') as f:
+        f.write(image_to_pdf_bytes(img_path, policy))
+
+
+def iter_image_conversions(image_paths, workers=0, policy=None, trace=None):
+    """이미지 목록을 PDF 바이트로 변환하고 끝나는 순서대로 (순번, PDF 바이트, 예외)를 yield 합니다.
+
+    성공하면 예외는 None, 실패하면 PDF 바이트가 None입니다.
+    workers가 0이면 CPU 코어 수, 1이면 현재 프로세스에서 차례로 변환합니다.
+    trace: merge_trace 콜백 (변환 프로세스에서 잰 구간도 이 콜백으로 넘김)
+    """
+    image_paths = list(image_paths)
+    workers = min(workers or default_image_workers(), len(image_paths))
+
+    if workers <= 1:
+        for index, img_path in enumerate(image_paths):
+            try:
+                data = image_to_pdf_bytes(img_path, policy, trace)
+            except Exception as e:
+                yield index, None, e
+            else:
+                yield index, data, None
+        return
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        job = image_to_pdf_bytes if trace is None else _traced_image_to_pdf
+        futures = {
+            executor.submit(job, img_path, policy): index
+            for index, img_path in enumerate(image_paths)
+        }
+        for future in as_completed(futures):
+            try:
+                data = future.result()
+            except Exception as e:
+                yield futures[future], None, e
+                continue
+            if trace is not None:
+                data, spans = data
+                for span in spans:
+                    trace(*span)
+            yield futures[future], data, None
+    finally:
+        # 중간에 멈추면 아직 시작하지 않은 변환은 취소
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,88 @@
+"""작업 스레드의 로그/진행률을 모아서 Tk 스레드로 전달합니다.
+
+작업 스레드는 log(), progress()로 큐에 넣기만 하고, Tk 스레드가 일정한 주기
+(FRAME_INTERVAL_MS)로 drain()을 불러 그동안 쌓인 로그를 한 번에 가져갑니다.
+진행률은 마지막 값만 남기므로 파일이 수천 개여도 Tk 이벤트 큐가 넘치지 않습니다.
+전체 로그는 날짜별 로그 파일에 남고, 화면의 로그 영역은 MAX_LOG_LINES줄만 유지합니다.
+"""
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from conversion_cache import default_cache_dir
+
+# Tk 스레드가 로그/진행률을 가져가는 주기 (ms, 약 20fps)
+FRAME_INTERVAL_MS = 50
+# 화면 로그 영역에 남겨 둘 최대 줄 수 (넘으면 오래된 줄부터 지움)
+MAX_LOG_LINES = 5000
+# 남겨 둘 날짜별 로그 파일 수
+KEEP_LOG_FILES = 14
+
+
+def default_log_dir():
+    """로그 파일을 두는 곳 (변환 캐시 폴더 옆)"""
+    return default_cache_dir().parent / 'logs'
+
+
+class LogRelay:
+    """스레드 안전한 로그/진행률 큐"""
+
+    def __init__(self, log_dir=None, max_lines=MAX_LOG_LINES):
+        self.log_dir = Path(log_dir) if log_dir else default_log_dir()
+        self.max_lines = max_lines
+        self._lines = deque()
+        self._progress = None
+        self._lock = threading.Lock()
+        self._log_file_failed = False
+        self._prune_log_files()
+
+    @property
+    def log_path(self):
+        return self.log_dir / f"merge_{time.strftime('%Y%m%d')}.log"
+
+    def log(self, message):
+        """로그 한 줄을 넣습니다 (어느 스레드에서나 호출 가능). 시각은 호출한 때 기준"""
+        line = f"[{time.strftime('%H:%M:%S')}] {message}"
+        with self._lock:
+            self._lines.append(line)
+
+    def progress(self, value, text):
+        """진행률을 넣습니다. 가져가기 전에 다시 들어오면 마지막 값만 남음"""
+        with self._lock:
+            self._progress = (value, text)
+
+    def drain(self):
+        """쌓인 (로그 줄 목록, 마지막 진행률 또는 None)을 꺼냅니다. 로그는 파일에도 씀"""
+        with self._lock:
+            lines = list(self._lines)
+            self._lines.clear()
+            progress, self._progress = self._progress, None
+        if lines:
+            self._write_log_file(lines)
+            # 화면에는 어차피 max_lines줄만 남으므로 그보다 많으면 뒤쪽만 넘김
+            if len(lines) > self.max_lines:
+                lines = lines[-self.max_lines:]
+        return lines, progress
+
+    def _write_log_file(self, lines):
+        if self._log_file_failed:
+            return
+        try:
+            self.log_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write("\n".join(lines) + "\n")
+        except OSError:
+            # 로그 파일은 보조 기록이므로 쓸 수 없으면 화면 로그만 사용
+            self._log_file_failed = True
+
+    def _prune_log_files(self):
+        try:
+            log_files = sorted(self.log_dir.glob('merge_*.log'))
+        except OSError:
+            return
+        for old in log_files[:-KEEP_LOG_FILES]:
+            try:
+                old.unlink()
+            except OSError:
+                pass
@@ -0,0 +1,89 @@
+"""asyncio에서 병합하기 (이벤트 루프를 막지 않음)
+
+    token = CancellationToken()
+    async for event in iter_merge_events(paths, output, cancel=token):
+        if isinstance(event, FileFailed):
+            ...
+        elif isinstance(event, MergeFinished):
+            report = event.report
+
+merge_folder를 실행기(기본값: 루프의 기본 ThreadPoolExecutor) 스레드에서 돌리고, 병합
+스레드가 내는 이벤트(merge_events)를 asyncio.Queue로 옮겨 async iterator로 내줍니다.
+pypdf 작업과 변환 대기는 모두 실행기 스레드에서 하고 변환은 원래대로 별도 프로세스에서
+하므로, 한 루프에서 병합 여러 개를 동시에 돌릴 수 있습니다 (동시 병합 수는 실행기 스레드 수).
+
+token.cancel()을 부르거나 반복을 중간에 그만두면(break, 태스크 취소) 병합을 멈추고
+임시 파일을 정리할 때까지 기다립니다. 취소된 병합은 MergeCancelled를 냅니다.
+"""
+import asyncio
+import threading
+from dataclasses import replace
+
+from merge_engine import MergeOptions, merge_folder
+from merge_events import LogMessage, MergeFinished, MergeProgress
+
+# 병합이 끝났음을 알리는 큐 표시
+_DONE = object()
+
+
+class CancellationToken:
+    """병합 취소 신호 (어느 스레드/코루틴에서든 cancel() 가능, MergeOptions.cancel로 전달)"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def is_set(self):
+        return self._event.is_set()
+
+
+async def iter_merge_events(paths, output, options=None, cancel=None, executor=None):
+    """병합하면서 진행 이벤트를 차례로 내주고, 마지막에 MergeFinished(report)를 내줍니다.
+
+    병합이 실패하면 그때까지의 이벤트를 모두 내준 뒤 예외를 그대로 냅니다.
+    options.on_event/cancel은 이 함수의 것으로 바뀝니다.
+    """
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+    cancel = cancel or CancellationToken()
+
+    def emit(event):
+        loop.call_soon_threadsafe(events.put_nowait, event)
+
+    options = replace(options or MergeOptions(), cancel=cancel, on_event=emit)
+    future = loop.run_in_executor(
+        executor, merge_folder, paths, output, options,
+        lambda message: emit(LogMessage(message)),
+        lambda percent, status: emit(MergeProgress(percent, status))
+    )
+    # 병합 스레드가 낸 이벤트가 모두 큐에 들어간 뒤에 완료 표시가 들어감
+    future.add_done_callback(lambda _: events.put_nowait(_DONE))
+    try:
+        while True:
+            event = await events.get()
+            if event is _DONE:
+                break
+            yield event
+        yield MergeFinished(future.result())
+    finally:
+        if not future.done():
+            # 반복을 중간에 그만둠: 병합 스레드를 멈추고 정리가 끝날 때까지 기다림
+            cancel.cancel()
+            await asyncio.wait([future])
+            if not future.cancelled():
+                future.exception()  # 취소로 끝난 병합의 MergeCancelled는 알릴 곳이 없음
+
+
+async def merge_async(paths, output, options=None, cancel=None, executor=None, on_event=None):
+    """병합이 끝날 때까지 기다려 MergeReport를 반환합니다 (on_event: 이벤트마다 루프에서 호출)."""
+    async for event in iter_merge_events(paths, output, options, cancel, executor):
+        if isinstance(event, MergeFinished):
+            return event.report
+        if on_event is not None:
+            on_event(event)
@@ -0,0 +1,453 @@
+"""병합 성능 측정 (벤치마크)
+
+실제 증빙 폴더와 비슷한 가짜 폴더(크기가 제각각인 PDF, 큰 JPEG/PNG 스캔 이미지,
+가짜 변환기로 처리하는 doc/hwp 자리 표시 파일)를 만들고 병합 경로를 실행해서
+소요 시간, 단계별 처리량, 최대 메모리, 출력 크기를 JSON으로 저장합니다.
+커밋마다 결과를 저장해 두고 --compare로 비교합니다.
+
+사용 예:
+    python merge_benchmark.py                              # 전체 시나리오, benchmark_<커밋>.json
+    python merge_benchmark.py many_files mixed --repeat 3
+    python merge_benchmark.py --compare benchmark_3dfa2e1.json
+    python merge_benchmark.py --scale 0.2 --doc-latency 0  # 빠르게 확인
+    python merge_benchmark.py --check-memory               # 대용량 모드 메모리 검사 (실패하면 종료 코드 1)
+
+병합은 매번 새 프로세스에서 실행하므로 최대 메모리(RSS)는 그 병합만의 값입니다.
+"""
+import argparse
+import hashlib
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+RESULT_VERSION = 1
+# 생성한 폴더를 다시 쓸 수 있는지 확인하는 표시 파일
+SPEC_MARKER = ".benchmark_spec.json"
+# 병합 진행 문구 -> 단계 이름 (merge_engine.merge_folder의 progress 문구)
+STAGES = {
+    "변환 준비 중": "prepare",
+    "변환 및 병합 중": "merge",
+    "파일 저장 중": "save",
+    "출력 최적화 중": "optimize",
+}
+# 준비(해시 계산, 변환 시작)가 끝나고 병합 단계가 시작될 때의 로그 문구
+MERGE_START_LOG = "PDF 병합을 시작합니다"
+# --check-memory: 입력 배율과, 가장 작은 입력 대비 최대 메모리 증가 허용치 (MB)
+MEMORY_CHECK_SCALES = (1, 3)
+MEMORY_CHECK_MAX_GROWTH_MB = 40
+
+
+@dataclass
+class FolderSpec:
+    """생성할 가짜 증빙 폴더 구성"""
+    pdf_files: int = 0
+    pdf_max_pages: int = 4        # PDF마다 1~pdf_max_pages쪽
+    pdf_page_kb: int = 200        # 쪽마다 들어가는 (압축 안 되는) 이미지 크기 상한 (KB)
+    jpeg_files: int = 0
+    png_files: int = 0
+    image_side: int = 2480        # 스캔 이미지 긴 변 픽셀 (A4 300dpi ≈ 2480x3508)
+    doc_files: int = 0            # .docx 자리 표시 파일 (가짜 변환기로 변환)
+    hwp_files: int = 0            # .hwp 자리 표시 파일
+    seed: int = 0
+
+    def scaled(self, scale):
+        """파일 수에 scale을 곱한 구성 (0이 아닌 항목은 최소 1개)"""
+        def count(value):
+            return max(1, round(value * scale)) if value else 0
+        return FolderSpec(count(self.pdf_files), self.pdf_max_pages, self.pdf_page_kb,
+                          count(self.jpeg_files), count(self.png_files), self.image_side,
+                          count(self.doc_files), count(self.hwp_files), self.seed)
+
+
+@dataclass
+class Scenario:
+    """측정 시나리오: 폴더 구성 + 병합 옵션"""
+    name: str
+    spec: FolderSpec
+    description: str = ""
+    stream_above_mb: int = None   # None이면 merge_engine 기본값
+    optimize_output: bool = True
+
+
+SCENARIOS = [
+    Scenario("many_files", FolderSpec(pdf_files=400, pdf_max_pages=2, pdf_page_kb=20,
+                                      jpeg_files=60, image_side=1200, doc_files=30, hwp_files=30, seed=1),
+             "작은 파일이 많은 폴더 (파일별 고정 비용)"),
+    Scenario("large_files", FolderSpec(pdf_files=12, pdf_max_pages=40, pdf_page_kb=400,
+                                       jpeg_files=8, png_files=4, seed=2),
+             "큰 PDF와 큰 스캔 이미지 (대용량 모드)", stream_above_mb=64),
+    Scenario("mixed", FolderSpec(pdf_files=60, pdf_max_pages=6, pdf_page_kb=150, jpeg_files=30, png_files=10,
+                                 doc_files=20, hwp_files=20, seed=3),
+             "형식이 섞인 일반적인 증빙 폴더"),
+    # 대용량 모드는 입력이 커져도 최대 메모리가 거의 일정해야 함 (같은 입력을 두 모드로 비교,
+    # --check-memory는 입력을 1배/3배로 늘려 증가량을 검사)
+    Scenario("memory_streaming", FolderSpec(pdf_files=40, pdf_max_pages=4, pdf_page_kb=1024, seed=4),
+             "큰 입력, 페이지를 바로 파일에 쓰는 대용량 모드", stream_above_mb=0, optimize_output=False),
+    Scenario("memory_in_memory", FolderSpec(pdf_files=40, pdf_max_pages=4, pdf_page_kb=1024, seed=4),
+             "같은 입력, PdfWriter로 메모리에서 병합", stream_above_mb=100000, optimize_output=False),
+]
+SCENARIOS_BY_NAME = {scenario.name: scenario for scenario in SCENARIOS}
+
+
+# --- 가짜 폴더 생성 ---
+
+def _write_pdf(path, rng, pages, page_kb):
+    from io import BytesIO
+    from pypdf import PdfWriter
+    from image_convert import build_image_pdf
+
+    writer = PdfWriter()
+    for _ in range(pages):
+        # 스캔 문서처럼 압축이 잘 안 되는 회색조 이미지 한 장짜리 페이지 (크기는 제각각)
+        side = max(16, int((rng.uniform(0.2, 1.0) * page_kb * 1024) ** 0.5))
+        data = rng.randbytes(side * side)
+        image_dict = f"/Width {side} /Height {side} /ColorSpace /DeviceGray /BitsPerComponent 8".encode()
+        writer.append(BytesIO(build_image_pdf(image_dict, data, side, side, display=(595, 842))))
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+def _write_scan(path, rng, side, image_format):
+    from PIL import Image
+
+    # 종이 스캔처럼 밝은 바탕에 잡음이 섞인 이미지
+    width, height = int(side * 0.707), side
+    image = Image.effect_noise((width, height), rng.randint(20, 40)).point(lambda v: min(255, v + 90))
+    image = Image.merge("RGB", (image, image, image))
+    if image_format == "PNG":
+        image.save(path, "PNG", compress_level=1)
+    else:
+        image.save(path, "JPEG", quality=90)
+
+
+def _write_placeholder(path, rng, magic):
+    """가짜 변환기가 처리할 문서 자리 표시 파일 (앞부분 바이트만 실제 형식과 같음)"""
+    with open(path, "wb") as f:
+        f.write(magic + rng.randbytes(rng.randint(8, 64) * 1024))
+
+
+def generate_folder(folder, spec):
+    """spec 구성의 가짜 증빙 폴더를 만듭니다. 같은 구성으로 이미 만든 폴더면 그대로 씀"""
+    folder = Path(folder)
+    marker = folder / SPEC_MARKER
+    try:
+        if json.loads(marker.read_text(encoding="utf-8")) == asdict(spec):
+            return folder
+    except (OSError, ValueError):
+        pass
+    shutil.rmtree(folder, ignore_errors=True)
+    folder.mkdir(parents=True)
+
+    rng = random.Random(spec.seed)
+    files = []
+    files += [(f"증빙_{i:03d}.pdf", "pdf") for i in range(1, spec.pdf_files + 1)]
+    files += [(f"영수증_{i:03d}.jpg", "jpeg") for i in range(1, spec.jpeg_files + 1)]
+    files += [(f"스캔_{i:03d}.png", "png") for i in range(1, spec.png_files + 1)]
+    files += [(f"보고서_{i:03d}.docx", "docx") for i in range(1, spec.doc_files + 1)]
+    files += [(f"공문_{i:03d}.hwp", "hwp") for i in range(1, spec.hwp_files + 1)]
+    for name, kind in files:
+        path = folder / name
+        if kind == "pdf":
+            _write_pdf(path, rng, rng.randint(1, spec.pdf_max_pages), spec.pdf_page_kb)
+        elif kind == "jpeg":
+            _write_scan(path, rng, spec.image_side, "JPEG")
+        elif kind == "png":
+            _write_scan(path, rng, spec.image_side, "PNG")
+        elif kind == "docx":
+            _write_placeholder(path, rng, b"PK\x03\x04")
+        else:
+            _write_placeholder(path, rng, b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1")
+    marker.write_text(json.dumps(asdict(spec)), encoding="utf-8")
+    return folder
+
+
+# --- 측정 (자식 프로세스) ---
+
+def run_once(scenario, folder, doc_latency, image_workers, trace_path=None):
+    """시나리오를 한 번 병합하고 측정값 사전을 돌려줍니다 (새 프로세스에서 호출)
+
+    trace_path를 주면 그 병합의 단계별 기록(merge_trace)을 JSON/CSV로 저장합니다.
+    """
+    from converters import FakeBackend
+    from merge_engine import MergeOptions, default_output_path, list_source_files, merge_folder
+    from merge_trace import NULL_TRACER, MergeTracer, peak_rss
+
+    folder = Path(folder)
+    names = list_source_files(folder)
+    sources = [folder / name for name in names]
+    output_path = default_output_path(folder)
+    options = MergeOptions(
+        converter_backend=FakeBackend(latency=doc_latency),
+        image_workers=image_workers,
+        optimize_output=scenario.optimize_output,
+        incremental=False,
+        resume=False,
+        tracer=MergeTracer() if trace_path else None,
+    )
+    if scenario.stream_above_mb is not None:
+        options.stream_above_mb = scenario.stream_above_mb
+
+    # progress 문구가 바뀌는 시각으로 단계를 나눔
+    marks = []
+
+    def mark(stage):
+        if stage is not None and (not marks or marks[-1][0] != stage):
+            marks.append((stage, time.perf_counter()))
+
+    def progress(value, text):
+        mark(STAGES.get(text))
+
+    def log(message):
+        # 첫 파일이 추가되기 전의 변환 대기 시간도 병합 단계에 넣음
+        if message.startswith(MERGE_START_LOG):
+            mark("merge")
+
+    input_bytes = sum(src.stat().st_size for src in sources)
+    started = time.perf_counter()
+    with options.tracer or NULL_TRACER:
+        report = merge_folder(sources, output_path, options, log=log, progress=progress)
+    finished = time.perf_counter()
+    if options.tracer is not None:
+        options.tracer.save(trace_path)
+    output_bytes = output_path.stat().st_size
+
+    stages = {}
+    for position, (stage, stage_start) in enumerate(marks):
+        stage_end = marks[position + 1][1] if position + 1 < len(marks) else finished
+        stages[stage] = {"seconds": round(stage_end - stage_start, 4)}
+    # 단계별 처리량: 준비/병합은 입력 기준, 저장/최적화는 출력 기준
+    for stage, (amount, files) in {"prepare": (input_bytes, len(sources)),
+                                   "merge": (input_bytes, len(sources)),
+                                   "save": (output_bytes, None),
+                                   "optimize": (output_bytes, None)}.items():
+        if stage in stages and stages[stage]["seconds"] > 0:
+            seconds = stages[stage]["seconds"]
+            stages[stage]["mb_per_second"] = round(amount / 1024 / 1024 / seconds, 2)
+            if files:
+                stages[stage]["files_per_second"] = round(files / seconds, 2)
+
+    os.remove(output_path)
+    from merge_manifest import manifest_path_for
+    manifest_path = manifest_path_for(output_path)
+    if manifest_path.exists():
+        os.remove(manifest_path)
+
+    return {
+        "wall_seconds": round(finished - started, 4),
+        "stages": stages,
+        "peak_rss_bytes": peak_rss(),
+        "input_files": len(sources),
+        "input_bytes": input_bytes,
+        "output_bytes": output_bytes,
+        "merged_files": len(report.successfully_merged),
+        "failed_files": len(report.failed_files),
+    }
+
+
+# --- 실행/저장/비교 (부모 프로세스) ---
+
+def _child(*args):
+    """이 스크립트를 새 프로세스로 실행하고 마지막 줄의 JSON을 돌려줍니다."""
+    completed = subprocess.run([sys.executable, os.path.abspath(__file__), *args],
+                               capture_output=True, text=True, encoding="utf-8")
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip()
+                           else f"종료 코드 {completed.returncode}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def _median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2
+
+
+def run_benchmarks(names, work_dir, scale=1.0, repeat=1, doc_latency=0.05, image_workers=0, trace_dir=None,
+                   log=print):
+    """시나리오를 실행하고 결과 사전(JSON으로 저장할 내용)을 돌려줍니다.
+
+    trace_dir를 주면 실행마다 '<시나리오>_<회차>.trace.json/.csv'를 저장합니다 (측정값에 기록 부담이 섞임).
+    """
+    results = {
+        "version": RESULT_VERSION,
+        "commit": _git_commit(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "settings": {"scale": scale, "repeat": repeat, "doc_latency": doc_latency, "image_workers": image_workers},
+        "scenarios": {},
+    }
+    for name in names:
+        scenario = SCENARIOS_BY_NAME[name]
+        spec = scenario.spec.scaled(scale)
+        spec_id = hashlib.sha256(json.dumps(asdict(spec)).encode()).hexdigest()[:12]
+        folder = Path(work_dir) / f"{name}_{spec_id}"
+        log(f"[{name}] 폴더 준비 중: {folder}")
+        # 생성에 쓴 메모리가 측정에 섞이지 않도록 생성도 별도 프로세스에서 함
+        _child("--generate", name, str(folder), "--scale", str(scale))
+
+        runs = []
+        for attempt in range(repeat):
+            trace_args = []
+            if trace_dir:
+                os.makedirs(trace_dir, exist_ok=True)
+                trace_args = ["--trace", os.path.join(trace_dir, f"{name}_{attempt + 1}.trace.json")]
+            run = _child("--run-one", name, str(folder), "--doc-latency", str(doc_latency),
+                         "--image-workers", str(image_workers), *trace_args)
+            runs.append(run)
+            peak = run["peak_rss_bytes"]
+            peak_text = f"{peak / 1024 / 1024:.0f}MB" if peak else "알 수 없음"
+            log(f"[{name}] {attempt + 1}/{repeat}: {run['wall_seconds']:.2f}초, 최대 메모리 {peak_text}, "
+                f"출력 {run['output_bytes'] / 1024 / 1024:.1f}MB")
+        results["scenarios"][name] = {
+            "description": scenario.description,
+            "spec": asdict(spec),
+            "stream_above_mb": scenario.stream_above_mb,
+            "wall_seconds_median": round(_median([run["wall_seconds"] for run in runs]), 4),
+            "wall_seconds_min": min(run["wall_seconds"] for run in runs),
+            "peak_rss_bytes_max": max((run["peak_rss_bytes"] or 0) for run in runs) or None,
+            "output_bytes": runs[-1]["output_bytes"],
+            "runs": runs,
+        }
+    return results
+
+
+def check_streaming_memory(work_dir, scales=MEMORY_CHECK_SCALES, max_growth_mb=MEMORY_CHECK_MAX_GROWTH_MB,
+                           log=print):
+    """대용량 모드의 최대 메모리가 입력이 커져도 거의 일정한지 확인합니다.
+
+    memory_streaming 구성을 scales 배율로 만들어 각각 새 프로세스에서 병합하고, 가장 작은
+    입력보다 최대 메모리가 max_growth_mb 넘게 늘면 실패입니다. 비교용으로 같은 입력을
+    memory_in_memory(PdfWriter)로도 병합해 증가량을 함께 보여 줍니다.
+    반환값: 통과하면 True
+    """
+    measured = {}
+    for name in ("memory_streaming", "memory_in_memory"):
+        spec = SCENARIOS_BY_NAME[name].spec
+        for scale in scales:
+            spec_id = hashlib.sha256(json.dumps(asdict(spec.scaled(scale))).encode()).hexdigest()[:12]
+            folder = Path(work_dir) / f"memory_check_{spec_id}"
+            _child("--generate", name, str(folder), "--scale", str(scale))
+            run = _child("--run-one", name, str(folder), "--doc-latency", "0")
+            if not run["peak_rss_bytes"]:
+                log("최대 메모리를 잴 수 없는 환경입니다 (merge_trace.peak_rss)")
+                return False
+            measured[name, scale] = run
+            log(f"[{name}] 입력 {run['input_bytes'] / 1024 / 1024:.0f}MB: "
+                f"최대 메모리 {run['peak_rss_bytes'] / 1024 / 1024:.0f}MB")
+
+    def growth_mb(name):
+        peaks = [measured[name, scale]["peak_rss_bytes"] for scale in scales]
+        return (max(peaks) - peaks[0]) / 1024 / 1024
+
+    streaming, in_memory = growth_mb("memory_streaming"), growth_mb("memory_in_memory")
+    log(f"입력 {scales[0]}배 → {scales[-1]}배일 때 최대 메모리 증가: 대용량 모드 {streaming:.0f}MB "
+        f"(허용 {max_growth_mb}MB), PdfWriter {in_memory:.0f}MB")
+    return streaming <= max_growth_mb
+
+
+def compare(baseline, current):
+    """두 결과에서 같은 시나리오의 시간/메모리/출력 크기 변화를 줄 목록으로 돌려줍니다."""
+    lines = [f"기준: {baseline.get('commit')} ({baseline.get('time')})  →  "
+             f"현재: {current.get('commit')} ({current.get('time')})"]
+    for name, now in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            lines.append(f"  {name}: 기준 결과 없음")
+            continue
+        if before.get("spec") != now.get("spec"):
+            lines.append(f"  {name}: 폴더 구성이 달라 비교할 수 없음 (--scale 확인)")
+            continue
+        parts = []
+        for key, label in (("wall_seconds_median", "시간"), ("peak_rss_bytes_max", "메모리"),
+                           ("output_bytes", "출력")):
+            old, new = before.get(key), now.get(key)
+            if old and new:
+                parts.append(f"{label} {(new - old) / old * 100:+.1f}%")
+        lines.append(f"  {name}: " + ", ".join(parts))
+    return lines
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="가짜 증빙 폴더로 병합 성능을 측정하고 JSON으로 저장합니다.")
+    parser.add_argument("scenarios", nargs="*", metavar="SCENARIO",
+                        help=f"실행할 시나리오 (기본값: 전체 = {', '.join(SCENARIOS_BY_NAME)})")
+    parser.add_argument("-o", "--output", help="결과 JSON 경로 (기본값: benchmark_<커밋>.json)")
+    parser.add_argument("--work-dir", default=os.path.join(tempfile.gettempdir(), "pdf_merge_benchmark"),
+                        help="가짜 폴더를 만들 곳 (같은 구성이면 다시 만들지 않음)")
+    parser.add_argument("--scale", type=float, default=1.0, help="파일 수 배율 (기본값: 1.0)")
+    parser.add_argument("--repeat", type=int, default=1, metavar="N", help="시나리오별 반복 횟수 (기본값: 1)")
+    parser.add_argument("--doc-latency", type=float, default=0.05, metavar="SEC",
+                        help="가짜 변환기의 문서당 변환 시간 (기본값: 0.05초)")
+    parser.add_argument("--image-workers", type=int, default=0, metavar="N",
+                        help="이미지 변환 프로세스 수 (기본값: 0 = CPU 코어 수)")
+    parser.add_argument("--compare", metavar="JSON", help="이전 결과 JSON과 비교해서 출력")
+    parser.add_argument("--trace", metavar="DIR",
+                        help="실행마다 단계별 시간/메모리 기록(Chrome trace JSON + CSV)을 이 폴더에 저장")
+    parser.add_argument("--check-memory", action="store_true",
+                        help="대용량 모드의 최대 메모리가 입력 크기에 따라 늘지 않는지 확인 (늘면 종료 코드 1)")
+    parser.add_argument("--max-growth-mb", type=float, default=MEMORY_CHECK_MAX_GROWTH_MB, metavar="MB",
+                        help=f"--check-memory: 최대 메모리 증가 허용치 (기본값: {MEMORY_CHECK_MAX_GROWTH_MB}MB)")
+    parser.add_argument("--generate", nargs=2, metavar=("SCENARIO", "FOLDER"), help=argparse.SUPPRESS)
+    parser.add_argument("--run-one", nargs=2, metavar=("SCENARIO", "FOLDER"), help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.generate:
+        name, folder = args.generate
+        generate_folder(folder, SCENARIOS_BY_NAME[name].spec.scaled(args.scale))
+        print(json.dumps({"folder": folder}))
+        return 0
+    if args.run_one:
+        name, folder = args.run_one
+        print(json.dumps(run_once(SCENARIOS_BY_NAME[name], folder, args.doc_latency, args.image_workers,
+                                  args.trace)))
+        return 0
+
+    if args.check_memory:
+        passed = check_streaming_memory(args.work_dir, max_growth_mb=args.max_growth_mb)
+        print("✅ 대용량 모드 메모리 검사 통과" if passed else "❌ 대용량 모드 메모리가 입력 크기에 따라 늘어남")
+        return 0 if passed else 1
+
+    names = args.scenarios or list(SCENARIOS_BY_NAME)
+    unknown = [name for name in names if name not in SCENARIOS_BY_NAME]
+    if unknown:
+        print(f"오류: 알 수 없는 시나리오: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    results = run_benchmarks(names, args.work_dir, args.scale, args.repeat, args.doc_latency, args.image_workers,
+                             args.trace)
+    output = Path(args.output or f"benchmark_{results['commit'] or 'local'}.json")
+    output.write_text(json.dumps(results, ensure_ascii=False, indent=1), encoding="utf-8")
+    print(f"결과 저장: {output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        for line in compare(baseline, results):
+            print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()
+    sys.exit(main())
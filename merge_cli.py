@@ -0,0 +1,214 @@
+"""명령줄에서 PDF 변환 & 취합을 실행합니다 (tkinter 불필요)
+
+사용 예:
+    python merge_cli.py "D:/증빙/2025-10 출장비"
+    python merge_cli.py 폴더 -o 결과.pdf --files 1.pdf 2.jpg 3.hwp
+    python merge_cli.py "D:/증빙/2025" --batch          # 하위 폴더마다 병합
+    python merge_cli.py 폴더 --trace 기록.json            # 단계별 시간/메모리 기록 (JSON + CSV)
+"""
+import argparse
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+
+from batch_merge import DEFAULT_FOLDER_WORKERS, run_batch
+from conversion_cache import DEFAULT_MAX_BYTES, ConversionCache
+from converter_workers import parse_convert_timeouts, parse_worker_limits
+from converters import BACKENDS, DaemonBackend, make_backend
+from daemon_client import DEFAULT_DAEMON_ADDRESS, parse_address
+from duplicate_check import DEFAULT_DUPLICATE_POLICY, DUPLICATE_POLICIES
+from folder_scanner import FolderIndex, scan_folder
+from image_convert import PAGE_SIZES, ImagePolicy
+from merge_engine import (
+    DEFAULT_STREAM_ABOVE_MB, MergeOptions, default_output_path, list_source_files, merge_folder
+)
+from merge_trace import NULL_TRACER, MergeTracer
+
+
+def _log(message):
+    print(f"[{time.strftime('%H:%M:%S')}] {message}", flush=True)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="폴더 안의 PDF/이미지/문서 파일을 하나의 PDF로 병합합니다.")
+    parser.add_argument("folder", help="병합할 파일이 있는 폴더")
+    parser.add_argument("-o", "--output", help="저장할 PDF 경로 (기본값: <폴더>/<폴더명>_merged.pdf)")
+    parser.add_argument("--files", nargs="+", metavar="FILE",
+                        help="병합할 파일 이름과 순서 (기본값: 폴더 안의 지원 파일 전체, 자연 정렬)")
+    parser.add_argument("-r", "--recursive", action="store_true",
+                        help="하위 폴더의 파일도 포함 (상대 경로의 자연 정렬 순서)")
+    parser.add_argument("--batch", action="store_true",
+                        help="폴더 아래의 하위 폴더를 찾아 폴더마다 <폴더명>_merged.pdf로 병합")
+    parser.add_argument("--batch-workers", type=int, default=DEFAULT_FOLDER_WORKERS, metavar="N",
+                        help=f"일괄 병합 시 동시에 병합할 폴더 수 (기본값: {DEFAULT_FOLDER_WORKERS})")
+    parser.add_argument("--temp-dir", help="임시 PDF를 만들 폴더 (기본값: 원본 파일과 같은 폴더)")
+    parser.add_argument("--converter", choices=sorted(BACKENDS), default="win32com",
+                        help="문서 변환 백엔드 (fake = Office 없이 빈 PDF를 만드는 테스트용, "
+                             "daemon = 떠 있는 변환 데몬(LibreOffice)에 문서를 한꺼번에 보냄)")
+    parser.add_argument("--daemon-address", type=parse_address, default=DEFAULT_DAEMON_ADDRESS, metavar="HOST:PORT",
+                        help="--converter daemon: 변환 데몬 주소, 없으면 convert_daemon.py를 띄움 "
+                             f"(기본값: {DEFAULT_DAEMON_ADDRESS[0]}:{DEFAULT_DAEMON_ADDRESS[1]})")
+    parser.add_argument("--daemon-fake", action="store_true",
+                        help="--converter daemon: 데몬을 빈 PDF를 쓰는 대역으로 띄움 (테스트용)")
+    parser.add_argument("--daemon-python", metavar="PATH",
+                        help="--converter daemon: 데몬을 띄울 Python (uno를 불러올 수 있어야 함, "
+                             "기본값: LibreOffice의 program/python, 없으면 이 Python)")
+    parser.add_argument("--converter-max-uses", type=int, default=50, metavar="N",
+                        help="변환기 인스턴스 하나로 처리할 최대 문서 수 (기본값: 50)")
+    parser.add_argument("--doc-workers", type=parse_worker_limits, metavar="KIND=N,...",
+                        help="문서 종류별 동시 변환 프로세스 수 (예: word=3,excel=2,powerpoint=2,hwp=1)")
+    parser.add_argument("--convert-timeout", type=parse_convert_timeouts, metavar="KIND=SEC,...",
+                        help="문서 하나의 변환 시간 제한, 넘기면 변환기를 강제 종료하고 실패 처리 "
+                             "(예: hwp=60,word=180 또는 모든 종류에 90, 기본값: 120초, powerpoint 180초)")
+    parser.add_argument("--sequential-docs", action="store_true",
+                        help="변환 프로세스를 띄우지 않고 문서를 하나씩 변환")
+    parser.add_argument("--image-workers", type=int, default=0, metavar="N",
+                        help="이미지 변환 프로세스 수 (기본값: 0 = CPU 코어 수, 1 = 순차 처리)")
+    parser.add_argument("--image-dpi", type=int, metavar="DPI",
+                        help="이미지를 페이지 크기에 맞췄을 때 이 해상도를 넘으면 축소 (예: 200)")
+    parser.add_argument("--max-pixels", type=int, metavar="N",
+                        help="이미지 최대 픽셀 수, 넘으면 축소 (예: 8000000)")
+    parser.add_argument("--jpeg-quality", type=int, default=85, metavar="Q",
+                        help="축소한 이미지의 JPEG 품질 (기본값: 85)")
+    parser.add_argument("--page-size", choices=sorted(PAGE_SIZES), default="A4",
+                        help="이미지를 맞춰 넣을 페이지 크기 (기본값: A4)")
+    parser.add_argument("--stream-above-mb", type=int, default=DEFAULT_STREAM_ABOVE_MB, metavar="MB",
+                        help="입력 총 크기가 이 값을 넘으면 페이지를 바로 파일에 쓰는 대용량 모드로 병합 "
+                             f"(메모리 상한은 아님, 기본값: {DEFAULT_STREAM_ABOVE_MB}MB, 0 = 항상)")
+    parser.add_argument("--split-mb", type=float, default=0, metavar="MB",
+                        help="출력을 파트 하나가 이 크기를 넘지 않게 <폴더명>_merged_part01.pdf, ...로 나눠 저장 "
+                             "(원본 파일 하나는 나누지 않음)")
+    parser.add_argument("--split-pages", type=int, default=0, metavar="N",
+                        help="출력을 파트 하나가 이 쪽수를 넘지 않게 나눠 저장 (--split-mb와 함께 쓸 수 있음)")
+    parser.add_argument("--duplicates", choices=DUPLICATE_POLICIES, default=DEFAULT_DUPLICATE_POLICY,
+                        help="내용이 같은 원본(파일 해시, 변환 후 페이지 비교): off = 찾지 않음, "
+                             "flag = 요약에 표시하고 병합에 포함, skip = 변환하지 않고 병합에서 뺌 "
+                             f"(기본값: {DEFAULT_DUPLICATE_POLICY})")
+    parser.add_argument("--full-rebuild", action="store_true",
+                        help="이전 병합 결과를 재사용하지 않고 모든 파일을 다시 변환/병합")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="중단된 이전 병합 기록을 버리고 처음부터 다시 병합")
+    parser.add_argument("--no-optimize", action="store_true",
+                        help="저장 후 중복 글꼴/이미지 합치기와 압축을 하지 않음")
+    parser.add_argument("--no-cache", action="store_true", help="변환 결과 캐시를 사용하지 않음")
+    parser.add_argument("--cache-dir", help="변환 결과 캐시 폴더 (기본값: 사용자 캐시 폴더)")
+    parser.add_argument("--cache-max-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024), metavar="MB",
+                        help="변환 결과 캐시 최대 크기 (기본값: 1024MB)")
+    parser.add_argument("--trace", metavar="JSON",
+                        help="파일별/단계별 시간과 메모리를 Chrome trace JSON과 같은 이름의 CSV로 저장 "
+                             "(chrome://tracing 또는 ui.perfetto.dev에서 열기)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="진행 로그를 출력하지 않고 요약만 출력")
+    return parser
+
+
+def backend_options(args):
+    """변환 백엔드별 추가 인자"""
+    if args.converter == DaemonBackend.name:
+        return {'address': args.daemon_address, 'fake': args.daemon_fake, 'python': args.daemon_python}
+    return {}
+
+
+def build_options(args):
+    """명령줄 인자로 MergeOptions를 만듭니다."""
+    options = MergeOptions(
+        temp_dir=Path(args.temp_dir) if args.temp_dir else None,
+        converter_backend=make_backend(args.converter, **backend_options(args)),
+        converter_max_uses=args.converter_max_uses,
+        image_workers=args.image_workers,
+        doc_worker_limits=args.doc_workers,
+        doc_worker_processes=not args.sequential_docs,
+        convert_timeouts=args.convert_timeout,
+        split_max_mb=args.split_mb,
+        split_max_pages=args.split_pages,
+        duplicate_policy=args.duplicates,
+        cache=None if args.no_cache else ConversionCache(args.cache_dir, args.cache_max_mb * 1024 * 1024),
+        stream_above_mb=args.stream_above_mb,
+        optimize_output=not args.no_optimize,
+        incremental=not args.full_rebuild,
+        resume=not args.no_resume,
+        tracer=MergeTracer() if args.trace else None,
+    )
+    if args.image_dpi or args.max_pixels:
+        options.image_policy = ImagePolicy(
+            target_dpi=args.image_dpi or 0,
+            page_size=PAGE_SIZES[args.page_size],
+            max_pixels=args.max_pixels or 0,
+            jpeg_quality=args.jpeg_quality,
+        )
+    return options
+
+
+def run_batch_mode(args, folder, options, log):
+    """--batch: 하위 폴더마다 병합하고 전체 요약을 출력합니다."""
+    if args.output or args.files:
+        print("오류: --batch에서는 -o/--files를 쓸 수 없습니다.", file=sys.stderr)
+        return 2
+    try:
+        report = run_batch(folder, options, args.batch_workers, log=log)
+    except Exception as e:
+        print(f"❌ 오류: 일괄 병합 중 문제가 발생했습니다. {e}", file=sys.stderr)
+        return 2
+    if not report.jobs:
+        print("병합할 파일이 있는 하위 폴더가 없습니다.", file=sys.stderr)
+        return 2
+
+    for line in report.summary_lines():
+        print(line)
+    return 1 if report.failed_jobs or report.partial_jobs else 0
+
+
+def run_folder_mode(args, folder, options, log):
+    """폴더 하나를 병합하고 요약을 출력합니다."""
+    tracer = options.tracer or NULL_TRACER
+    if args.files:
+        file_names = args.files
+    elif args.recursive:
+        with tracer.span('scan_folder', 'scan', folder=folder.name):
+            file_names = [entry.name for entry in scan_folder(folder, True, FolderIndex(folder, True).load())]
+    else:
+        with tracer.span('scan_folder', 'scan', folder=folder.name):
+            file_names = list_source_files(folder)
+    if not file_names:
+        print("병합할 파일이 목록에 없습니다.", file=sys.stderr)
+        return 2
+
+    output_path = Path(args.output) if args.output else default_output_path(folder)
+    try:
+        report = merge_folder([folder / name for name in file_names], output_path, options, log=log)
+    except Exception as e:
+        print(f"❌ 오류: 병합 중 문제가 발생했습니다. {e}", file=sys.stderr)
+        return 2
+
+    for line in report.summary_lines():
+        print(line)
+
+    # 일부 파일이 제외된 경우 스크립트에서 구분할 수 있도록 1을 반환 (--batch는 폴더 실패 포함)
+    return 1 if report.failed_files else 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    folder = Path(args.folder)
+    if not folder.is_dir():
+        print(f"오류: 폴더를 찾을 수 없습니다: {folder}", file=sys.stderr)
+        return 2
+
+    log = (lambda message: None) if args.quiet else _log
+    options = build_options(args)
+    try:
+        with options.tracer or NULL_TRACER:
+            if args.batch:
+                return run_batch_mode(args, folder, options, log)
+            return run_folder_mode(args, folder, options, log)
+    finally:
+        if options.tracer is not None:
+            # 실패한 실행도 어디서 멈췄는지 볼 수 있도록 항상 저장
+            json_path, csv_path = options.tracer.save(args.trace)
+            print(f"성능 기록 저장: {json_path}, {csv_path}")
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
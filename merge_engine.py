@@ -0,0 +1,734 @@
+"""PDF 변환 & 취합 엔진 (tkinter 없이 사용 가능)
+
+pypdf, PIL, multiprocessing 등 무거운 모듈은 merge_folder를 처음 부를 때 불러옵니다
+(GUI가 창을 띄울 때는 목록/경로 함수만 필요하므로 시작 시간을 줄임).
+"""
+import copy
+import os
+import queue
+import re
+import threading
+import time
+from contextlib import closing
+from dataclasses import dataclass, field, replace
+from io import BytesIO
+from pathlib import Path
+
+from converters import Win32ComBackend
+from duplicate_check import DEFAULT_DUPLICATE_POLICY
+from merge_events import FileAppended, FileConverted, FileDropped, FileFailed, FileStarted, OutputWritten
+from merge_journal import MergeJournal
+from merge_manifest import MergeManifest, segment_key
+from merge_trace import NULL_TRACER
+from split_output import part_pattern_for
+
+# --- 상수 정의 ---
+IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png']
+DOC_EXTENSIONS = ['.docx', '.doc', '.hwp', '.hwpx', '.xlsx', '.xls', '.pptx', '.ppt']
+TEMP_PREFIX = "__temp_"
+MERGED_SUFFIX = "_merged.pdf"
+# 입력 총 크기가 이 값을 넘으면 대용량 모드로 병합 (MB)
+DEFAULT_STREAM_ABOVE_MB = 512
+# 변환 결과를 기다리는 동안 취소 신호를 확인하는 주기 (초)
+CANCEL_POLL_INTERVAL = 0.2
+
+
+_DIGITS = re.compile('([0-9]+)')
+
+
+def natural_sort_key(s):
+    """자연 정렬 키 (1, 2, 10 순서 보장)"""
+    return [int(text) if text.isdigit() else text.lower() for text in _DIGITS.split(s)]
+
+
+def is_supported_file(path):
+    """PDF, 이미지, 문서 파일인지 확인합니다."""
+    ext = Path(path).suffix.lower()
+    return ext == '.pdf' or ext in IMAGE_EXTENSIONS or ext in DOC_EXTENSIONS
+
+
+def is_merge_output(folder, name):
+    """이전 병합 결과(<폴더명>_merged.pdf 또는 나눠 저장한 _merged_partNN.pdf)인지 확인합니다."""
+    output_path = default_output_path(folder)
+    return name == output_path.name or part_pattern_for(output_path).match(name) is not None
+
+
+def list_source_files(folder):
+    """폴더 안의 병합 대상 파일 이름을 자연 정렬 순서로 반환합니다."""
+    folder = Path(folder)
+    if not folder.is_dir():
+        return []
+    # 이전 병합 결과(<폴더명>_merged.pdf, 파트 파일)는 원본이 아니므로 제외
+    # scandir의 is_file()은 따로 stat 하지 않고 디렉터리 목록 정보를 씀
+    with os.scandir(folder) as it:
+        all_files = [entry.name for entry in it
+                     if is_supported_file(entry.name) and not is_merge_output(folder, entry.name)
+                     and entry.is_file()]
+    return sorted(all_files, key=natural_sort_key)
+
+
+def default_output_path(folder):
+    """폴더 이름 기반의 기본 출력 경로 (<폴더명>_merged.pdf)"""
+    folder = Path(folder)
+    return folder / f"{folder.name}{MERGED_SUFFIX}"
+
+
+def _noop(*args, **kwargs):
+    pass
+
+
+def format_bytes(size):
+    """바이트 수를 읽기 쉬운 단위로 표시합니다."""
+    for unit in ('B', 'KB', 'MB'):
+        if abs(size) < 1024:
+            return f"{size:.0f}{unit}" if unit == 'B' else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GB"
+
+
+@dataclass
+class MergeOptions:
+    """병합 옵션"""
+    # 임시 PDF를 둘 폴더 (None이면 원본 파일과 같은 폴더)
+    temp_dir: Path = None
+    # 문서 변환 백엔드 (None이면 MS Office/한글 COM)
+    converter_backend: object = None
+    # 변환기 인스턴스 하나로 처리할 최대 문서 수 (넘으면 재시작)
+    converter_max_uses: int = 50
+    # 문서 종류별 동시 변환 프로세스 수 (None이면 DEFAULT_WORKER_LIMITS)
+    doc_worker_limits: dict = None
+    # False면 변환 프로세스를 띄우지 않고 병합 스레드에서 차례로 변환
+    doc_worker_processes: bool = True
+    # 문서 종류별 변환 시간 제한(초), 넘기면 변환기를 강제 종료하고 실패 처리
+    # (None이면 DEFAULT_CONVERT_TIMEOUTS, 변환 프로세스를 쓸 때만 적용)
+    convert_timeouts: dict = None
+    # 이미지 변환 프로세스 수 (0 = CPU 코어 수, 1 = 병렬 처리 안 함)
+    image_workers: int = 0
+    # 변환 결과 캐시 (conversion_cache.ConversionCache, None이면 사용 안 함)
+    cache: object = None
+    # 이미지 축소/재압축 정책 (image_convert.ImagePolicy, None이면 원본 해상도 유지)
+    image_policy: object = None
+    # 입력 총 크기가 이 값(MB)을 넘으면 페이지를 바로 파일에 쓰는 대용량 모드로 병합 (0 = 항상)
+    # 메모리 상한이 아니라 기준 크기이며, 이보다 작은 입력은 PdfWriter가 메모리에 모두 들고 있음
+    stream_above_mb: int = DEFAULT_STREAM_ABOVE_MB
+    # 저장 후 중복 객체 합치기/스트림 압축/객체 스트림으로 출력 용량 줄이기
+    optimize_output: bool = True
+    # 이전 병합 결과(매니페스트)에서 내용이 같은 파일의 페이지를 재사용 (False면 전체 다시 병합)
+    incremental: bool = True
+    # 중단된 이전 실행의 작업 기록이 있으면 추가하지 못한 변환 결과를 다시 씀 (False면 기록을 버림)
+    resume: bool = True
+    # 출력을 파트 하나가 이 크기(MB)/쪽수를 넘지 않게 <폴더명>_merged_part01.pdf, ...로 나눠 저장
+    # (0이면 제한 없음, 둘 다 0이면 나누지 않음). 원본 하나는 나누지 않으며 증분 재병합은 쓰지 않음
+    split_max_mb: float = 0
+    split_max_pages: int = 0
+    # 내용이 같은 원본 처리: 'off', 'flag'(표시만), 'skip'(병합에서 뺌) (duplicate_check 참고)
+    duplicate_policy: str = DEFAULT_DUPLICATE_POLICY
+    # 파일별/단계별 시간과 메모리 기록 (merge_trace.MergeTracer, None이면 기록 안 함)
+    tracer: object = None
+    # 취소 신호 (threading.Event처럼 is_set()이 있는 객체), 켜지면 MergeCancelled
+    cancel: object = None
+    # 진행 이벤트 콜백 (merge_events의 이벤트를 받음, 병합 스레드에서 호출)
+    on_event: object = None
+
+
+def divide_workers(options, workers):
+    """병합 workers개를 동시에 실행할 때 병합 하나가 쓸 옵션
+
+    이미지 변환 프로세스 수(0 = CPU 코어 수)와 문서 종류별 변환 프로세스 수를 병합 수로
+    나눠 (최소 1) 전체 프로세스 수가 한 병합일 때와 비슷하게 유지합니다.
+    """
+    from converter_workers import DEFAULT_WORKER_LIMITS
+
+    if workers <= 1:
+        return options
+    image_workers = options.image_workers or max(1, (os.cpu_count() or 1) // workers)
+    limits = options.doc_worker_limits or DEFAULT_WORKER_LIMITS
+    return replace(options, image_workers=image_workers,
+                   doc_worker_limits={kind: max(1, count // workers) for kind, count in limits.items()})
+
+
+def own_backend(options):
+    """변환 백엔드를 복사한 옵션 (병합 스레드마다 따로 쓰도록, 백엔드는 스레드 간 공유 불가)"""
+    if options.converter_backend is None:
+        return options
+    return replace(options, converter_backend=copy.deepcopy(options.converter_backend))
+
+
+class MergeCancelled(Exception):
+    """options.cancel로 병합이 취소됨 (작업 기록은 남아 다음 실행에서 이어서 병합)"""
+
+
+@dataclass
+class MergeReport:
+    """병합 결과 요약"""
+    total_files: int = 0
+    successfully_merged: list = field(default_factory=list)
+    failed_files: list = field(default_factory=list)
+    # 내용이 앞 파일과 같아 뺀 파일 [(파일 이름, 사유)] (duplicate_policy='skip')
+    dropped_files: list = field(default_factory=list)
+    # 내용이 앞 파일과 같지만 병합에 포함한 파일 [(파일 이름, 앞 파일 이름)] (duplicate_policy='flag')
+    duplicate_files: list = field(default_factory=list)
+    output_path: Path = None
+    cache_hits: int = 0
+    cache_misses: int = 0
+    # 이전 병합 결과에서 페이지를 그대로 가져온 파일 수
+    reused_files: int = 0
+    # 중단된 이전 실행에서 변환해 둔 PDF를 다시 쓴 파일 수
+    resumed_files: int = 0
+    # 이미지별 용량 절감 [(파일 이름, 원본 바이트, PDF 바이트)]
+    image_savings: list = field(default_factory=list)
+    # 출력 최적화 전후 파일 크기 (최적화하지 않았으면 0)
+    output_size_before: int = 0
+    output_size_after: int = 0
+    # 나눠 저장했으면 [(파트 경로, 쪽수, 크기)]
+    output_parts: list = field(default_factory=list)
+
+    def summary_lines(self):
+        """로그에 출력할 요약 줄 목록"""
+        lines = [
+            "\n" + "="*60,
+            "📊 병합 완료 요약",
+            "="*60,
+            f"총 파일 수: {self.total_files}개",
+            f"성공적으로 병합된 파일: {len(self.successfully_merged)}개",
+            f"실패한 파일: {len(self.failed_files)}개",
+        ]
+        if self.dropped_files:
+            lines.append(f"중복이라 뺀 파일: {len(self.dropped_files)}개")
+
+        if self.successfully_merged:
+            lines.append("\n✅ 병합에 포함된 파일:")
+            for idx, file_name in enumerate(self.successfully_merged, 1):
+                lines.append(f"  {idx}. {file_name}")
+
+        if self.failed_files:
+            lines.append("\n⚠️ 병합에서 제외된 파일:")
+            for idx, (file_name, reason) in enumerate(self.failed_files, 1):
+                lines.append(f"  {idx}. {file_name} - {reason}")
+
+        if self.dropped_files:
+            lines.append("\n🔁 중복이라 뺀 파일:")
+            for idx, (file_name, reason) in enumerate(self.dropped_files, 1):
+                lines.append(f"  {idx}. {file_name} - {reason}")
+
+        if self.duplicate_files:
+            lines.append("\n🔁 내용이 같은 파일 (병합에 포함됨):")
+            for idx, (file_name, original) in enumerate(self.duplicate_files, 1):
+                lines.append(f"  {idx}. {file_name} = {original}")
+
+        if self.image_savings:
+            total_saved = sum(before - after for _, before, after in self.image_savings)
+            lines.append(f"\n📉 이미지 용량 절감: 총 {format_bytes(total_saved)}")
+            for file_name, before, after in self.image_savings:
+                lines.append(f"  • {file_name}: {format_bytes(before)} → {format_bytes(after)} "
+                             f"(-{format_bytes(before - after)})")
+
+        if self.reused_files:
+            lines.append(f"\n♻️ 이전 병합 결과 재사용: {self.reused_files}개 파일 (변환/읽기 생략)")
+        if self.resumed_files:
+            lines.append(f"↪ 중단된 실행에서 이어서 사용: {self.resumed_files}개 파일 (다시 변환하지 않음)")
+
+        if self.cache_hits or self.cache_misses:
+            lines.append(f"\n🗂️ 변환 캐시: 적중 {self.cache_hits}개 / 미스 {self.cache_misses}개")
+
+        if self.output_size_before:
+            saved = self.output_size_before - self.output_size_after
+            lines.append(f"\n📦 출력 최적화: {format_bytes(self.output_size_before)} → "
+                         f"{format_bytes(self.output_size_after)} "
+                         f"(-{saved / self.output_size_before:.1%})")
+
+        if self.output_parts:
+            lines.append(f"\n💾 저장된 파일 ({len(self.output_parts)}개로 나눔):")
+            for path, page_count, size in self.output_parts:
+                lines.append(f"  • {path} ({page_count}쪽, {format_bytes(size)})")
+        else:
+            lines.append(f"\n💾 저장된 파일: {self.output_path}")
+        lines.append("="*60 + "\n")
+        return lines
+
+
+def source_category(path):
+    """원본 파일 분류: 'image', 'doc', 'pdf'"""
+    ext = path.suffix.lower()
+    if ext in IMAGE_EXTENSIONS:
+        return 'image'
+    if ext in DOC_EXTENSIONS:
+        return 'doc'
+    return 'pdf'
+
+
+def _produce(results, job_indexes, completions, stop):
+    """변환 결과 생성기를 돌면서 (목록 순번, 결과, 오류)를 완료 큐에 넣습니다 (생산자 스레드)
+
+    결과는 변환된 PDF 파일 경로(문서) 또는 메모리의 PDF 바이트(이미지)입니다.
+    """
+    try:
+        with closing(results):
+            for position, result, error in results:
+                completions.put((job_indexes[position], result, None if error is None else str(error)))
+                if stop.is_set():
+                    break
+    except BaseException as e:
+        completions.put((None, None, e))
+
+
+def _record_image_saving(report, src, pdf):
+    """원본 이미지보다 PDF 페이지가 작아졌으면 절감량을 기록합니다."""
+    try:
+        before = src.stat().st_size
+        after = len(pdf) if isinstance(pdf, bytes) else os.path.getsize(pdf)
+    except OSError:
+        return
+    if after < before:
+        report.image_savings.append((src.name, before, after))
+
+
+def _page_count(merger):
+    # StreamingPdfMerger/SplitPdfMerger는 page_count, PdfWriter는 pages
+    count = getattr(merger, 'page_count', None)
+    return len(merger.pages) if count is None else count
+
+
+def _total_input_size(sources):
+    """원본 파일 크기의 합 (읽을 수 없는 파일은 0으로 계산)"""
+    total = 0
+    for src in sources:
+        try:
+            total += src.stat().st_size
+        except OSError:
+            pass
+    return total
+
+
+def merge_folder(paths, output, options=None, log=_noop, progress=_noop):
+    """파일 목록을 순서대로 PDF 하나로 병합하고 결과 요약을 반환합니다.
+
+    이미지/문서 변환은 백그라운드에서 끝나는 대로 결과를 내고, 목록 순서상 다음
+    파일이 준비되는 즉시 PdfWriter에 추가한 뒤 임시 PDF를 지웁니다. 이미지 페이지는
+    메모리에서 만들어 바로 추가합니다. 입력 총 크기가 stream_above_mb를 넘으면
+    PdfWriter 대신 StreamingPdfMerger로 페이지를 바로 출력 파일에 씁니다.
+
+    출력 옆에 매니페스트(원본별 내용 해시와 페이지 범위)를 남기고, 다음 병합에서는
+    내용과 변환 옵션이 같은 파일의 페이지를 이전 출력에서 그대로 가져옵니다.
+
+    병합하는 동안 진행 기록과 캐시에 넣지 못한 문서 변환 결과를 작업 폴더(merge_journal)에
+    남기므로 프로그램이 죽거나 변환기가 멈춰 중단돼도 다음 실행에서 아직 추가하지 못한 변환
+    결과를 다시 씁니다 (병합은 첫 파일부터 다시 하며, 이미 추가했던 문서는 캐시에서 가져옴).
+    출력 파일은 '.part'에 쓴 뒤 완성되면 바꿔 넣어, 출력 경로에는 완성된 PDF만 있습니다.
+
+    split_max_mb/split_max_pages를 주면 SplitPdfMerger로 원본 단위로 끊어 파트 파일
+    여러 개에 바로 씁니다 (report.output_parts).
+
+    duplicate_policy에 따라 내용이 같은 원본을 변환 전(파일 해시)과 추가 직전(페이지
+    지문)에 찾아 표시하거나 뺍니다 (report.duplicate_files/dropped_files).
+
+    options.cancel이 켜지면 파일 사이에서 멈추고 MergeCancelled를 냅니다 (진행 중인
+    변환은 끝날 때까지 기다림). options.on_event로 파일별 진행 이벤트(merge_events)를 받습니다.
+
+    paths: 병합할 원본 파일 경로 목록 (목록 순서 = 병합 순서)
+    output: 저장할 PDF 경로
+    log/progress: GUI의 log, update_progress와 같은 형식의 콜백
+    """
+    from pypdf import PdfReader, PdfWriter
+    from converter_workers import iter_document_conversions
+    from duplicate_check import DUPLICATE_POLICIES, PageIndex, hash_sources, pdf_fingerprints
+    from image_convert import IMAGE_PAGE_VERSION, iter_image_conversions
+    from pdf_optimize import optimize_pdf
+    from split_output import SplitPdfMerger
+    from streaming_merge import StreamingPdfMerger
+
+    options = options or MergeOptions()
+    sources = [Path(p) for p in paths]
+    if not sources:
+        raise ValueError("병합할 파일이 목록에 없습니다.")
+    if options.duplicate_policy not in DUPLICATE_POLICIES:
+        raise ValueError(f"알 수 없는 중복 처리 정책: {options.duplicate_policy} ({', '.join(DUPLICATE_POLICIES)})")
+    find_duplicates = options.duplicate_policy != 'off'
+    skip_duplicates = options.duplicate_policy == 'skip'
+
+    output_path = Path(output)
+    report = MergeReport(total_files=len(sources), output_path=output_path)
+    cache = options.cache
+    backend = options.converter_backend
+    backend_name = backend.name if backend is not None else Win32ComBackend.name
+    tracer = options.tracer or NULL_TRACER
+    emit = options.on_event or _noop
+    merge_started = time.perf_counter_ns()
+
+    def check_cancelled():
+        if options.cancel is not None and options.cancel.is_set():
+            raise MergeCancelled("병합이 취소되었습니다")
+
+    def temp_pdf_for(src):
+        temp_dir = Path(options.temp_dir) if options.temp_dir else src.parent
+        return temp_dir / f"{TEMP_PREFIX}{src.stem}.pdf"
+
+    def cached_pdf_for(src, converter, converter_options=None, digest=None):
+        """캐시에 있으면 (캐시된 PDF 경로, 키), 없으면 (None, 키)"""
+        if cache is None:
+            return None, None
+        try:
+            key = cache.key_for(src, converter, converter_options, digest)
+        except OSError:
+            return None, None  # 원본을 읽을 수 없으면 변환 단계에서 실패로 기록됨
+        cached_pdf = cache.get(key)
+        if cached_pdf is not None:
+            report.cache_hits += 1
+        else:
+            report.cache_misses += 1
+        return cached_pdf, key
+
+    def store_in_cache(key, pdf):
+        """캐시에 넣었으면 True"""
+        if cache is None or key is None:
+            return False
+        try:
+            if isinstance(pdf, bytes):
+                cache.put_bytes(key, pdf)
+            else:
+                cache.put(key, pdf)
+        except OSError as e:
+            log(f"    [캐시] 저장 실패: {e}")
+            return False
+        return True
+
+    # 목록 순번 -> (병합할 PDF 경로나 PDF 바이트 또는 None, 오류 또는 None)
+    ready = {}
+    # 목록 순번 -> 캐시 키 / 아직 지우지 않은 임시 PDF
+    cache_keys = {}
+    temp_pdf_paths = {}
+    image_jobs = []
+    doc_jobs = []
+    # 목록 순번 -> 내용이 같은 앞 파일 이름 (병합에서 뺄 파일)
+    dropped = {}
+    pages_seen = PageIndex()
+
+    completions = queue.Queue()
+    stop = threading.Event()
+    producers = []
+    merger = None
+
+    # 이전 병합 결과: 재사용할 구간이 있으면 출력 파일을 '.prev'로 옮겨 두고 읽음
+    manifest = MergeManifest()
+    segments = {}  # 목록 순번 -> (구간 키, 내용 해시, 크기/수정 시각)
+    reused_keys = set()
+    previous_path = output_path.with_name(output_path.name + ".prev")
+    previous_file = None
+    previous_reader = None
+    part_path = output_path.with_name(output_path.name + ".part")
+    journal = None
+    completed = False
+
+    if previous_path.exists() and not output_path.exists():
+        # 이전 실행이 재사용 중에 강제 종료됨: 옮겨 둔 출력을 되돌려 매니페스트와 맞춤
+        os.replace(previous_path, output_path)
+    split = bool(options.split_max_mb or options.split_max_pages)
+    # 파트로 나눠 저장하면 페이지 범위가 파일 하나에 있지 않으므로 증분 재병합 안 함
+    previous = MergeManifest.load(output_path) if options.incremental and not split else None
+
+    try:
+        journal = MergeJournal.open(output_path, resume=options.resume)
+        if journal.resumed:
+            log(f"이전 병합이 중단된 기록을 찾았습니다: 추가하지 못한 변환 파일 {journal.converted_files}개를 다시 사용합니다"
+                + (f" (마지막으로 추가한 파일: {journal.last_appended})" if journal.last_appended else ""))
+        progress(0, "변환 준비 중")
+        # 원본 내용 해시를 한꺼번에 계산 (매니페스트 재사용 판단과 중복 찾기에 씀)
+        with tracer.span('hash', 'prepare', files=len(sources)):
+            hashed = hash_sources(sources, (previous or manifest).digest_for)
+        first_by_digest = {}  # 내용 해시 -> 처음 나온 목록 순번
+        for index, src in enumerate(sources):
+            check_cancelled()
+            with tracer.span('scan', 'prepare', file=src.name):
+                category = source_category(src)
+                emit(FileStarted(index, src, category))
+                if src.resolve() == output_path.resolve():
+                    # 이전 병합 결과가 목록에 들어 있으면 자기 자신을 다시 합치게 됨
+                    ready[index] = (None, "병합 결과 파일 자신이라 제외")
+                    continue
+                if category == 'pdf':
+                    converter, converter_options = 'pdf', None
+                elif category == 'image':
+                    converter = f"image:{IMAGE_PAGE_VERSION}"
+                    converter_options = options.image_policy.cache_options() if options.image_policy else None
+                else:
+                    converter = f"{backend_name}:{src.suffix.lower()}"
+                    converter_options = None
+
+                digest = None
+                if hashed[index] is not None:  # 원본을 읽을 수 없으면 아래에서 실패로 기록됨
+                    digest, stat = hashed[index]
+                    original = first_by_digest.setdefault(digest, index)
+                    if find_duplicates and original != index:
+                        if skip_duplicates:
+                            # 변환하기 전에 뺌
+                            dropped[index] = sources[original].name
+                            ready[index] = (None, None)
+                            continue
+                        report.duplicate_files.append((src.name, sources[original].name))
+                        log(f"  🔁 내용이 같은 파일: {src.name} = {sources[original].name}")
+                    key = segment_key(digest, converter, converter_options)
+                    segments[index] = (key, digest, stat)
+                    found = previous.find(key) if previous is not None and key not in reused_keys else None
+                    if found is not None:
+                        start, page_count = found
+                        reused_keys.add(key)
+                        ready[index] = (range(start, start + page_count), None)
+                        log(f"  ♻️ 이전 결과 재사용: {src.name} ({page_count}쪽)")
+                        continue
+
+                if category == 'pdf':
+                    # 원본 PDF 사용
+                    ready[index] = (src, None) if src.exists() else (None, "파일을 찾을 수 없음")
+                    continue
+
+                kept_pdf = journal.converted.get(segments[index][0]) if index in segments else None
+                if kept_pdf is not None:
+                    ready[index] = (kept_pdf, None)
+                    report.resumed_files += 1
+                    log(f"  ↪ 중단된 실행에서 이어서 사용: {src.name}")
+                    emit(FileConverted(index, src, 'resumed'))
+                    continue
+
+                cached_pdf, cache_keys[index] = cached_pdf_for(src, converter, converter_options, digest)
+                if cached_pdf is not None:
+                    ready[index] = (cached_pdf, None)
+                    log(f"  ✓ 캐시 사용: {src.name}")
+                    emit(FileConverted(index, src, 'cache'))
+                elif category == 'image':
+                    # 이미지는 메모리에서 PDF 페이지를 만들므로 임시 파일 없음
+                    image_jobs.append(index)
+                else:
+                    doc_jobs.append(index)
+                    temp_pdf_paths[index] = temp_pdf_for(src)
+
+        if image_jobs:
+            log(f"이미지 파일 {len(image_jobs)}개를 PDF로 변환 시작...")
+            results = iter_image_conversions(
+                [sources[i] for i in image_jobs],
+                options.image_workers,
+                options.image_policy,
+                trace=tracer.worker_callback()
+            )
+            producers.append(threading.Thread(
+                target=_produce, args=(results, image_jobs, completions, stop), daemon=True
+            ))
+        if doc_jobs:
+            log(f"문서 파일 {len(doc_jobs)}개를 PDF로 변환 시작...")
+            results = iter_document_conversions(
+                [(sources[i], temp_pdf_paths[i]) for i in doc_jobs],
+                backend=backend,
+                limits=options.doc_worker_limits,
+                max_uses=options.converter_max_uses,
+                log=log,
+                processes=options.doc_worker_processes,
+                trace=tracer.worker_callback(),
+                timeouts=options.convert_timeouts
+            )
+            producers.append(threading.Thread(
+                target=_produce, args=(results, doc_jobs, completions, stop), daemon=True
+            ))
+        for producer in producers:
+            producer.start()
+
+        if reused_keys:
+            os.replace(output_path, previous_path)
+            previous_file = open(previous_path, "rb")
+            previous_reader = PdfReader(previous_file)
+
+        input_size = _total_input_size(sources)
+        if split:
+            limits = []
+            if options.split_max_mb:
+                limits.append(f"{options.split_max_mb:g}MB")
+            if options.split_max_pages:
+                limits.append(f"{options.split_max_pages}쪽")
+            log(f"출력을 나눠 저장합니다: 파트당 최대 {' / '.join(limits)} (원본 파일은 나누지 않음)")
+            merger = SplitPdfMerger(output_path, int(options.split_max_mb * 1024 * 1024),
+                                    options.split_max_pages, log)
+        elif input_size > options.stream_above_mb * 1024 * 1024:
+            log(f"대용량 모드로 병합합니다 (입력 {format_bytes(input_size)}, "
+                f"기준 {options.stream_above_mb}MB): 페이지를 바로 파일에 씁니다.")
+            merger = StreamingPdfMerger(output_path)
+        else:
+            merger = PdfWriter()
+
+        log("PDF 병합을 시작합니다...")
+        total_files = report.total_files
+        for next_index, src in enumerate(sources):
+            # 목록 순서상 다음 파일의 변환이 끝날 때까지 완료된 변환 결과를 받아 둠
+            with tracer.span('wait', 'merge', file=src.name):
+                while next_index not in ready:
+                    check_cancelled()
+                    try:
+                        index, result, error = completions.get(timeout=CANCEL_POLL_INTERVAL)
+                    except queue.Empty:
+                        continue
+                    if index is None:
+                        raise error  # 생산자 스레드의 예기치 못한 오류
+                    done_src = sources[index]
+                    if error is None and not isinstance(result, bytes) and not Path(result).exists():
+                        error = "PDF 파일이 생성되지 않음"
+                    if error is None:
+                        cached = store_in_cache(cache_keys.get(index), result)
+                        if index in segments and not cached and not isinstance(result, bytes):
+                            # 중단돼도 다시 변환하지 않도록 캐시에 없는 문서 변환 결과만 작업 폴더에 보관
+                            # (이미지는 메모리에서 다시 만드는 비용이 작음)
+                            key, digest, _ = segments[index]
+                            result = journal.keep_converted(index, done_src.name, key, digest, result)
+                            temp_pdf_paths.pop(index, None)
+                        ready[index] = (result, None)
+                        log(f"  ✓ 변환 성공: {done_src.name}")
+                        emit(FileConverted(index, done_src))
+                    else:
+                        ready[index] = (None, error)
+                        log(f"  ⚠️ 변환 실패: {done_src.name} - {error}")
+
+            check_cancelled()
+            pdf, error = ready.pop(next_index)
+            fingerprints = None
+            if error is None and find_duplicates and next_index not in dropped:
+                # 변환 결과의 페이지가 모두 앞에서 추가한 페이지와 같은지 확인
+                with tracer.span('fingerprint', 'merge', file=src.name):
+                    try:
+                        if isinstance(pdf, range):
+                            fingerprints = pdf_fingerprints(previous_reader, pdf)
+                        else:
+                            fingerprints = pdf_fingerprints(BytesIO(pdf) if isinstance(pdf, bytes) else str(pdf))
+                    except Exception:
+                        fingerprints = None  # 읽을 수 없는 PDF는 추가할 때 오류로 처리됨
+                original = pages_seen.duplicate_of(fingerprints)
+                if original is not None:
+                    if skip_duplicates:
+                        dropped[next_index] = original
+                    elif all(name != src.name for name, _ in report.duplicate_files):
+                        # 파일 해시로 이미 찾은 파일은 다시 기록하지 않음
+                        report.duplicate_files.append((src.name, original))
+                        log(f"  🔁 페이지가 모두 같은 파일: {src.name} = {original}")
+                elif fingerprints:
+                    repeated = pages_seen.repeated_pages(fingerprints)
+                    if repeated:
+                        log(f"  🔁 {src.name}: {repeated}/{len(fingerprints)}쪽이 앞 파일의 페이지와 같음")
+            if next_index in dropped:
+                reason = f"내용이 같은 파일이 이미 있음: {dropped[next_index]}"
+                report.dropped_files.append((src.name, reason))
+                log(f"  🔁 중복이라 뺌: {src.name} ({dropped[next_index]}와 같음)")
+                emit(FileDropped(next_index, src, dropped[next_index]))
+            elif error is not None:
+                report.failed_files.append((src.name, error))
+                log(f"  ⚠️ 건너뛰기: {src.name} ({error})")
+                emit(FileFailed(next_index, src, error))
+            else:
+                with tracer.span('append', 'merge', file=src.name):
+                    start = _page_count(merger)
+                    if isinstance(pdf, range):
+                        merger.append(previous_reader, pages=(pdf.start, pdf.stop))
+                        report.reused_files += 1
+                    else:
+                        log(f"  -> 추가: {src.name}")
+                        merger.append(BytesIO(pdf) if isinstance(pdf, bytes) else str(pdf))
+                        if options.image_policy is not None and source_category(src) == 'image':
+                            _record_image_saving(report, src, pdf)
+                report.successfully_merged.append(src.name)
+                page_count = _page_count(merger) - start
+                if next_index in segments:
+                    key, digest, stat = segments[next_index]
+                    manifest.add(src.name, key, digest, stat, start, page_count)
+                    journal.record_appended(next_index, src.name, key, digest, start, page_count)
+                emit(FileAppended(next_index, src, page_count, isinstance(pdf, range)))
+                if fingerprints:
+                    pages_seen.add(src.name, fingerprints)
+            # 추가가 끝난 임시 PDF는 바로 삭제
+            temp_path = temp_pdf_paths.pop(next_index, None)
+            if temp_path is not None and temp_path.exists():
+                os.remove(temp_path)
+            if journal.holds(pdf) and all(pending[0] != pdf for pending in ready.values()):
+                # 보관한 PDF도 (내용이 같은 뒤 파일이 같이 쓰지 않으면) 추가하는 대로 지움
+                journal.release(pdf)
+            progress(((next_index + 1) / total_files) * 95, "변환 및 병합 중")
+
+        check_cancelled()
+        progress(95, "파일 저장 중")
+        total_pages = _page_count(merger)
+        with tracer.span('write', 'merge', output=output_path.name):
+            if isinstance(merger, SplitPdfMerger):
+                report.output_parts = merger.close()
+            elif isinstance(merger, StreamingPdfMerger):
+                merger.close()
+            else:
+                # 다 쓴 뒤에 바꿔 넣어 출력 경로에 쓰다 만 파일이 남지 않게 함
+                with open(part_path, "wb") as output_file:
+                    merger.write(output_file)
+                merger.close()
+                os.replace(part_path, output_path)
+        merger = None
+        if previous_reader is not None:
+            previous_reader.close()
+            previous_file.close()
+            previous_reader = None
+
+        if options.optimize_output:
+            progress(97, "출력 최적화 중")
+            log("출력 PDF 최적화 중 (중복 글꼴/이미지 합치기, 압축)...")
+            for part_index, (path, page_count, size) in enumerate(report.output_parts or [(output_path, 0, 0)]):
+                try:
+                    with tracer.span('optimize', 'merge', output=path.name):
+                        result = optimize_pdf(path, path, log)
+                except Exception as e:
+                    # 최적화는 선택 단계이므로 실패해도 최적화 전 파일을 그대로 둠
+                    log(f"  ⚠️ 출력 최적화 실패, 최적화 전 파일을 사용합니다: {path.name} ({e})")
+                    continue
+                report.output_size_before += result.size_before
+                report.output_size_after += result.size_after
+                if report.output_parts:
+                    report.output_parts[part_index] = (path, page_count, path.stat().st_size)
+
+        if split:
+            output_size = sum(size for _, _, size in report.output_parts)
+        else:
+            try:
+                manifest.save(output_path)
+            except OSError as e:
+                log(f"  ⚠️ 매니페스트 저장 실패 (다음 병합은 전체를 다시 합칩니다): {e}")
+            output_size = output_path.stat().st_size
+
+        for path, page_count, size in report.output_parts or [(output_path, total_pages, output_size)]:
+            emit(OutputWritten(path, page_count, size))
+        journal.finish(output_size)
+        completed = True
+        progress(100, "완료!")
+        return report
+
+    finally:
+        cleanup_started = time.perf_counter_ns()
+        if isinstance(merger, (StreamingPdfMerger, SplitPdfMerger)):
+            merger.abort()  # 저장 전에 중단됨: 쓰다 만 출력 파일 삭제
+        elif part_path.exists():
+            os.remove(part_path)
+        if journal is not None:
+            # 실패하면 기록과 변환해 둔 PDF를 남겨 다음 실행에서 이어서 병합
+            journal.close()
+        if previous_reader is not None:
+            previous_reader.close()
+            previous_file.close()
+        if previous_path.exists():
+            if completed:
+                os.remove(previous_path)
+            else:
+                # 실패하면 이전 출력을 되돌려 두어 매니페스트와 함께 다음에 다시 쓸 수 있게 함
+                os.replace(previous_path, output_path)
+        stop.set()
+        for producer in producers:
+            producer.join()
+        if cache is not None:
+            # 상한을 넘은 만큼 오래된 항목 정리 (이번 실행에서 쓴 항목은 가장 최근이라 남음)
+            cache.evict()
+        # 로그 콜백이 실패해도 임시 파일은 지워지도록 삭제 후 기록
+        for temp_path in temp_pdf_paths.values():
+            if temp_path.exists():
+                os.remove(temp_path)
+        finished = time.perf_counter_ns()
+        tracer.add_span('cleanup', 'merge', cleanup_started, finished, output=output_path.name)
+        tracer.add_span('merge_folder', 'merge', merge_started, finished, output=output_path.name,
+                        files=len(sources), completed=completed)
+        if temp_pdf_paths:
+            log("남은 임시 파일을 삭제했습니다.")
@@ -0,0 +1,83 @@
+"""병합 진행 이벤트 (MergeOptions.on_event, merge_async로 전달)
+
+merge_folder는 병합하는 스레드에서 options.on_event(이벤트)를 호출합니다.
+파일마다 FileStarted → (FileConverted) → FileAppended, FileFailed 또는 FileDropped 순서이고,
+저장이 끝나면 출력 파일마다 OutputWritten이 옵니다.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+
+
+class MergeEvent:
+    """모든 병합 이벤트의 기반 클래스"""
+
+
+@dataclass(frozen=True)
+class FileStarted(MergeEvent):
+    """파일 처리 시작 (목록 순번, 원본 경로, 분류: 'image'/'doc'/'pdf')"""
+    index: int
+    path: Path
+    category: str
+
+
+@dataclass(frozen=True)
+class FileConverted(MergeEvent):
+    """이미지/문서를 PDF로 변환함
+
+    source: 'converter'(이번에 변환), 'cache'(변환 캐시), 'resumed'(중단된 실행에서 변환해 둔 PDF)
+    """
+    index: int
+    path: Path
+    source: str = 'converter'
+
+
+@dataclass(frozen=True)
+class FileAppended(MergeEvent):
+    """출력에 페이지를 추가함 (reused: 이전 병합 결과에서 페이지를 그대로 가져옴)"""
+    index: int
+    path: Path
+    pages: int
+    reused: bool = False
+
+
+@dataclass(frozen=True)
+class FileFailed(MergeEvent):
+    """병합에서 제외됨 (변환 실패, 파일 없음 등)"""
+    index: int
+    path: Path
+    error: str
+
+
+@dataclass(frozen=True)
+class FileDropped(MergeEvent):
+    """내용이 앞 파일과 같아 병합에서 뺌 (duplicate_policy='skip', duplicate_of: 앞 파일 이름)"""
+    index: int
+    path: Path
+    duplicate_of: str
+
+
+@dataclass(frozen=True)
+class OutputWritten(MergeEvent):
+    """출력 파일 저장 완료 (나눠 저장하면 파트마다 하나)"""
+    path: Path
+    pages: int
+    size: int
+
+
+@dataclass(frozen=True)
+class MergeProgress(MergeEvent):
+    """진행률 (GUI의 update_progress와 같은 값)"""
+    percent: float
+    status: str
+
+
+@dataclass(frozen=True)
+class LogMessage(MergeEvent):
+    """로그 한 줄"""
+    message: str
+
+
+@dataclass(frozen=True)
+class MergeFinished(MergeEvent):
+    """병합 완료 (merge_async의 마지막 이벤트, report: merge_engine.MergeReport)"""
+    report: object
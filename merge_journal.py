@@ -0,0 +1,157 @@
+"""중단된 병합을 이어서 하기 위한 작업 기록
+
+병합하는 동안 출력 PDF 옆의 숨김 작업 폴더('.<출력 이름>.work')에 journal.jsonl을
+한 줄씩 덧붙여 씁니다. 변환 캐시에 넣지 못한 문서 변환 결과(Word/한/글 등, 변환이
+오래 걸리는 것)만 작업 폴더에 보관하고, 어떤 파일(내용 해시)을 어느 PDF로 변환했는지,
+출력의 몇 쪽에 추가했는지 기록합니다. 이미지는 다시 만드는 비용이 작아 보관하지 않고,
+보관한 PDF는 출력에 추가하는 대로 지웁니다.
+
+프로그램이 죽거나 한/글이 멈춰서 병합이 중단되면 다음 실행에서 기록을 읽어 아직
+출력에 추가하지 못한 변환 결과를 다시 씁니다. 출력은 메모리나 '.part'에 쓰다 만 것이라
+남지 않으므로 병합은 첫 파일부터 다시 하며, 이미 추가했던 문서는 변환 캐시에서 가져오고
+캐시를 쓰지 않으면 다시 변환합니다. 병합이 끝나면 'finished'를 기록하고 작업 폴더를 지웁니다.
+"""
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+from merge_manifest import MergeManifest
+
+JOURNAL_VERSION = 1
+JOURNAL_NAME = "journal.jsonl"
+
+
+def work_dir_for(output_path):
+    """출력 PDF 옆의 숨김 작업 폴더 (예: .폴더_merged.work)"""
+    output_path = Path(output_path)
+    return output_path.with_name(f".{output_path.stem}.work")
+
+
+def _read_events(path):
+    """기록을 읽습니다. 마지막 줄이 쓰다 만 줄이면 버림"""
+    events = []
+    try:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    break
+    except OSError:
+        pass
+    return events
+
+
+def output_state(output_path):
+    """출력 PDF 상태: 'finished'(완료), 'interrupted'(중단된 실행이 남긴 것), 'missing', 'unknown'
+
+    완료된 병합은 매니페스트가 출력 파일의 크기/수정 시각과 맞고 미완료 기록이 없습니다.
+    중단된 병합은 작업 폴더에 'finished' 없는 기록이 남고, 쓰다 만 출력은 '.part' 파일로 남습니다.
+    """
+    output_path = Path(output_path)
+    events = _read_events(work_dir_for(output_path) / JOURNAL_NAME)
+    if events and events[-1].get('event') != 'finished':
+        return 'interrupted'
+    if not output_path.exists():
+        return 'missing'
+    if MergeManifest.load(output_path) is not None:
+        return 'finished'
+    return 'unknown'
+
+
+class MergeJournal:
+    """병합 한 번의 작업 기록"""
+
+    def __init__(self, output_path):
+        self.output_path = Path(output_path)
+        self.work_dir = work_dir_for(output_path)
+        self.path = self.work_dir / JOURNAL_NAME
+        # 보관 중인 변환 PDF: 구간 키 -> 작업 폴더의 PDF 경로 (이전 실행에서 남은 것 포함)
+        self.converted = {}
+        # 이전 실행에서 마지막으로 출력에 추가한 파일 이름과 그때까지의 파일 수 (로그용)
+        self.last_appended = None
+        self.appended_count = 0
+        # 이전 실행에서 변환했지만 출력에 추가하기 전에 중단된 파일 수
+        self.converted_files = 0
+        self._file = None
+
+    @classmethod
+    def open(cls, output_path, resume=True):
+        """중단된 기록이 있으면 이어서, 없으면 새로 기록을 시작합니다.
+
+        이어서 쓸 수 있는 것은 작업 폴더에 남은(출력에 추가하기 전의) 변환 PDF뿐입니다.
+        """
+        journal = cls(output_path)
+        events = _read_events(journal.path)
+        interrupted = bool(events) and events[-1].get('event') != 'finished'
+        if interrupted and resume:
+            for event in events:
+                if event.get('event') == 'converted':
+                    pdf_path = journal.work_dir / event['pdf']
+                    if pdf_path.exists():
+                        journal.converted[event['key']] = pdf_path
+                        journal.converted_files += 1
+                elif event.get('event') == 'appended':
+                    journal.last_appended = event['name']
+                    journal.appended_count = event['index'] + 1
+        elif journal.work_dir.exists():
+            shutil.rmtree(journal.work_dir, ignore_errors=True)
+
+        journal.work_dir.mkdir(parents=True, exist_ok=True)
+        journal._file = open(journal.path, 'a', encoding='utf-8')
+        journal._write({'event': 'start', 'version': JOURNAL_VERSION, 'output': str(journal.output_path),
+                        'resumed': bool(journal.converted), 'time': time.time()})
+        return journal
+
+    @property
+    def resumed(self):
+        return bool(self.converted) or self.last_appended is not None
+
+    def _write(self, event, sync=True):
+        self._file.write(json.dumps(event, ensure_ascii=False) + "\n")
+        self._file.flush()
+        if sync:
+            # 프로세스가 죽어도 이미 쓴 줄은 남도록 디스크에 반영
+            os.fsync(self._file.fileno())
+
+    def keep_converted(self, index, name, key, digest, pdf_path):
+        """변환된 문서 PDF를 작업 폴더로 옮겨 보관하고 기록합니다. 보관한 경로를 돌려줍니다."""
+        # 내용이 같은 파일은 키가 같으므로 순번을 붙여 서로 덮어쓰지 않게 함
+        kept = self.work_dir / f"{key[:32]}_{index}.pdf"
+        shutil.move(str(pdf_path), kept)
+        self.converted[key] = kept
+        self._write({'event': 'converted', 'index': index, 'name': name, 'key': key,
+                     'digest': digest, 'pdf': kept.name})
+        return kept
+
+    def holds(self, pdf):
+        """작업 폴더에 보관 중인 PDF인지"""
+        return isinstance(pdf, Path) and pdf.parent == self.work_dir
+
+    def release(self, pdf_path):
+        """출력에 추가한 보관 PDF를 지웁니다 (다음 실행은 남은 'converted' 기록 중 파일이 있는 것만 씀)."""
+        for key in [key for key, kept in self.converted.items() if kept == pdf_path]:
+            del self.converted[key]
+        try:
+            os.remove(pdf_path)
+        except OSError:
+            pass
+
+    def record_appended(self, index, name, key, digest, start, pages):
+        """출력에 추가한 파일과 페이지 범위를 기록합니다 (로그용이라 디스크 동기화는 하지 않음)."""
+        self._write({'event': 'appended', 'index': index, 'name': name, 'key': key,
+                     'digest': digest, 'start': start, 'pages': pages}, sync=False)
+
+    def finish(self, output_size):
+        """완료를 기록하고 작업 폴더(보관한 변환 PDF 포함)를 지웁니다."""
+        self._write({'event': 'finished', 'output': str(self.output_path), 'size': output_size,
+                     'time': time.time()})
+        self.close()
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
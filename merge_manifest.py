@@ -0,0 +1,99 @@
+"""병합 결과의 페이지 구성 기록 (증분 재병합용)
+
+병합할 때마다 '<출력 이름>.manifest.json'에 원본 파일마다 내용 해시와 출력 PDF에서
+차지하는 페이지 범위를 기록합니다. 다음 병합에서 내용과 변환 옵션이 같은 파일은
+원본을 다시 변환하거나 열지 않고 이전 출력의 해당 페이지를 그대로 가져옵니다.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from conversion_cache import file_digest
+
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX = ".manifest.json"
+
+
+def manifest_path_for(output_path):
+    """출력 PDF 옆에 두는 매니페스트 경로 (예: 폴더_merged.manifest.json)"""
+    output_path = Path(output_path)
+    return output_path.with_name(output_path.stem + MANIFEST_SUFFIX)
+
+
+def _stat_signature(path):
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class MergeManifest:
+    """출력 PDF의 원본 파일별 페이지 범위"""
+
+    def __init__(self, segments=None, output_signature=None):
+        # [{'name', 'key', 'digest', 'stat', 'start', 'pages'}] (출력 순서)
+        self.segments = segments or []
+        self.output_signature = output_signature
+        self._by_key = {}
+        self._by_stat = {}
+        for segment in self.segments:
+            self._by_key.setdefault(segment['key'], segment)
+            self._by_stat[(segment['name'], tuple(segment['stat']))] = segment['digest']
+
+    @classmethod
+    def load(cls, output_path):
+        """매니페스트를 읽습니다. 없거나 출력 PDF가 그 뒤에 바뀌었으면 None"""
+        path = manifest_path_for(output_path)
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != MANIFEST_VERSION:
+                return None
+            # 사용자가 출력 PDF를 직접 고쳤으면 페이지 범위를 믿을 수 없음
+            if data.get('output') != _stat_signature(output_path):
+                return None
+            return cls(data['segments'], data['output'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, output_path):
+        """출력 PDF의 현재 크기/수정 시각과 함께 매니페스트를 저장합니다."""
+        data = {
+            'version': MANIFEST_VERSION,
+            'output': _stat_signature(output_path),
+            'segments': self.segments,
+        }
+        path = manifest_path_for(output_path)
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        os.replace(temp_path, path)
+
+    def digest_for(self, src):
+        """원본 내용 해시. 이름/크기/수정 시각이 이전과 같으면 다시 읽지 않고 기록된 해시를 씀"""
+        stat = _stat_signature(src)
+        digest = self._by_stat.get((Path(src).name, tuple(stat)))
+        return (digest or file_digest(src)), stat
+
+    def find(self, key):
+        """같은 키의 이전 구간 (start, pages) 또는 None"""
+        segment = self._by_key.get(key)
+        if segment is None:
+            return None
+        return segment['start'], segment['pages']
+
+    def add(self, name, key, digest, stat, start, pages):
+        segment = {'name': name, 'key': key, 'digest': digest, 'stat': stat, 'start': start, 'pages': pages}
+        self.segments.append(segment)
+        self._by_key.setdefault(key, segment)
+        self._by_stat[(name, tuple(stat))] = digest
+
+
+def segment_key(digest, converter, options=None):
+    """원본 내용 해시 + 변환기 + 변환 옵션으로 구간 키를 만듭니다 (같으면 같은 페이지가 나옴)."""
+    material = json.dumps({
+        'version': MANIFEST_VERSION,
+        'content': digest,
+        'converter': converter,
+        'options': options or {},
+    }, sort_keys=True)
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
@@ -0,0 +1,696 @@
+"""로컬 HTTP 병합 서비스 (데스크톱 프로그램을 설치하지 않은 팀용)
+
+    python merge_service.py                                  # 127.0.0.1:47660, 동시 병합 2개
+    python merge_service.py --workers 4 --stream-above-mb 256 --converter daemon
+    python merge_service.py --folder-root "D:/증빙"           # 서버 폴더 병합 허용
+
+API (응답은 JSON, 결과만 PDF):
+    POST   /jobs               multipart/form-data로 파일 업로드 (올린 순서 = 병합 순서,
+                               name 필드를 주면 <name>_merged.pdf) 또는
+                               JSON {"folder": "D:/증빙/2025-10", "files": ["1.pdf", ...]} → 202 작업 상태
+    GET    /jobs               작업 목록
+    GET    /jobs/<id>          작업 상태 (대기 순서, 진행률, 제외된 파일, 최근 로그)
+    GET    /jobs/<id>/result   병합된 PDF (chunked 전송, 파일을 메모리에 올리지 않음)
+    DELETE /jobs/<id>          대기/병합 중이면 취소, 끝났으면 결과 삭제
+    GET    /metrics            대기 작업 수, 작업 시간 백분위수, 처리한 바이트
+
+업로드는 받는 대로 작업 폴더에 씁니다. 작업의 입력 총 크기가 --stream-above-mb
+(MergeOptions.stream_above_mb)를 넘으면 페이지를 바로 파일에 쓰는 대용량 모드로
+병합합니다. 메모리 사용량을 제한하지는 않습니다. 끝난 작업은 --keep-minutes가 지나면 결과와 함께 지웁니다.
+"""
+import argparse
+import json
+import queue
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field, replace
+from email.message import Message
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import quote
+
+from merge_engine import (
+    DEFAULT_STREAM_ABOVE_MB, MergeCancelled, MergeOptions, default_output_path, divide_workers, is_supported_file,
+    list_source_files, merge_folder, own_backend
+)
+
+DEFAULT_SERVICE_ADDRESS = ('127.0.0.1', 47660)
+DEFAULT_JOB_WORKERS = 2
+# 업로드 한 번의 최대 크기 (MB)
+DEFAULT_MAX_UPLOAD_MB = 1024
+# 끝난 작업을 지우기 전까지 보관하는 시간 (분)
+DEFAULT_KEEP_MINUTES = 60
+# 업로드를 읽고 결과를 보내는 단위 (바이트)
+CHUNK_SIZE = 256 * 1024
+# 작업 시간 백분위수를 계산할 최근 작업 수
+LATENCY_WINDOW = 1000
+# 작업 상태에 보여 줄 최근 로그 줄 수
+JOB_LOG_LINES = 50
+# multipart의 파일이 아닌 필드(name 등)의 최대 크기 (바이트)
+MAX_FIELD_BYTES = 64 * 1024
+
+_JOB_PATH = re.compile(r"^/jobs/([0-9a-f]+)(/result)?$")
+# 파일 이름에 쓸 수 없는 문자
+_UNSAFE_NAME = re.compile(r'[\\/:*?"<>|]')
+
+
+def _noop(*args, **kwargs):
+    pass
+
+
+def _log(message):
+    print(f"[{time.strftime('%H:%M:%S')}] {message}", flush=True)
+
+
+def percentiles(values, points=(50, 90, 99)):
+    """최근 값들의 백분위수 (nearest-rank, 값이 없으면 None)"""
+    ordered = sorted(values)
+    result = {}
+    for point in points:
+        if ordered:
+            rank = max(1, -(-point * len(ordered) // 100))  # ceil(point/100 * n)
+            result[f"p{point}"] = round(ordered[rank - 1], 3)
+        else:
+            result[f"p{point}"] = None
+    return result
+
+
+def _unique_name(directory, name):
+    """directory 안에서 겹치지 않는 파일 이름 (영수증.jpg -> 영수증 (2).jpg)"""
+    path = Path(name)
+    candidate, number = name, 1
+    while (directory / candidate).exists():
+        number += 1
+        candidate = f"{path.stem} ({number}){path.suffix}"
+    return candidate
+
+
+class UploadError(Exception):
+    """잘못된 업로드 (HTTP 상태 코드와 함께)"""
+
+    def __init__(self, message, status=HTTPStatus.BAD_REQUEST):
+        super().__init__(message)
+        self.status = status
+
+
+def save_multipart(rfile, length, boundary, directory, max_bytes):
+    """multipart/form-data 본문을 읽으면서 파일 부분을 directory에 바로 씁니다.
+
+    반환값: ([(올린 파일 이름, 저장한 경로)], {필드 이름: 값})
+    지원하지 않는 형식의 파일은 저장하지 않고 경로를 None으로 돌려줍니다.
+    """
+    if length > max_bytes:
+        raise UploadError(f"업로드가 너무 큽니다 (최대 {max_bytes // (1024 * 1024)}MB)",
+                          HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+    delimiter = b"\r\n--" + boundary.encode('latin-1')
+    files, fields = [], {}
+    # 첫 경계 앞에 줄바꿈이 없으므로 붙여서 모든 경계를 같은 모양으로 찾음
+    buffer = b"\r\n"
+    remaining = length
+    state = 'preamble'
+    target = None   # 지금 쓰는 파일 또는 필드 값(bytearray)
+    field_name = None
+
+    def finish_part():
+        nonlocal target
+        if isinstance(target, bytearray):
+            fields[field_name] = target.decode('utf-8', 'replace')
+        elif target is not None:
+            target.close()
+        target = None
+
+    try:
+        while state != 'end':
+            if remaining > 0:
+                chunk = rfile.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    raise UploadError("업로드가 중간에 끊겼습니다")
+                remaining -= len(chunk)
+                buffer += chunk
+            progressed = True
+            while progressed and state != 'end':
+                progressed = False
+                if state == 'preamble':
+                    index = buffer.find(delimiter)
+                    if index >= 0:
+                        buffer = buffer[index + len(delimiter):]
+                        state, progressed = 'delimiter', True
+                    else:
+                        buffer = buffer[-len(delimiter):]
+                elif state == 'delimiter':
+                    if buffer.startswith(b"--"):
+                        state = 'end'
+                    elif b"\r\n" in buffer:
+                        # 경계 뒤 줄 끝까지 (공백이 붙을 수 있음) 건너뜀
+                        buffer = buffer[buffer.find(b"\r\n") + 2:]
+                        state, progressed = 'headers', True
+                elif state == 'headers':
+                    index = buffer.find(b"\r\n\r\n")
+                    if index >= 0:
+                        message = Message()
+                        for line in buffer[:index].decode('utf-8', 'replace').split("\r\n"):
+                            key, _, value = line.partition(':')
+                            if key.strip():
+                                message[key.strip()] = value.strip()
+                        buffer = buffer[index + 4:]
+                        field_name = message.get_param('name', header='content-disposition')
+                        file_name = message.get_filename()
+                        if file_name is None:
+                            target = bytearray()
+                        else:
+                            # 브라우저에 따라 전체 경로가 오므로 이름만 사용
+                            file_name = file_name.replace('\\', '/').rsplit('/', 1)[-1]
+                            if file_name and is_supported_file(Path(file_name)):
+                                path = directory / _unique_name(directory, file_name)
+                                files.append((file_name, path))
+                                target = open(path, 'wb')
+                            else:
+                                files.append((file_name, None))
+                                target = None
+                        state, progressed = 'body', True
+                    elif len(buffer) > MAX_FIELD_BYTES:
+                        raise UploadError("multipart 헤더가 너무 깁니다")
+                elif state == 'body':
+                    index = buffer.find(delimiter)
+                    end = index if index >= 0 else max(0, len(buffer) - len(delimiter) + 1)
+                    if target is not None:
+                        if isinstance(target, bytearray):
+                            if len(target) + end > MAX_FIELD_BYTES:
+                                raise UploadError(f"필드가 너무 깁니다: {field_name}")
+                            target += buffer[:end]
+                        else:
+                            target.write(buffer[:end])
+                    buffer = buffer[end:]
+                    if index >= 0:
+                        finish_part()
+                        buffer = buffer[len(delimiter):]
+                        state, progressed = 'delimiter', True
+            if remaining <= 0 and state != 'end':
+                raise UploadError("multipart 본문이 올바르지 않습니다 (마지막 경계 없음)")
+    finally:
+        if target is not None and not isinstance(target, bytearray):
+            target.close()
+    return files, fields
+
+
+@dataclass
+class ServiceJob:
+    """병합 작업 하나"""
+    id: str
+    name: str
+    paths: list
+    output_path: Path
+    job_dir: Path             # 업로드/임시/출력 폴더 (작업을 지울 때 함께 지움)
+    source: str = 'upload'    # 'upload' 또는 'folder'
+    state: str = 'queued'     # queued/running/done/failed/cancelled
+    progress: float = 0.0
+    status: str = "대기 중"
+    error: str = None
+    report: object = None
+    input_bytes: int = 0
+    ignored_files: list = field(default_factory=list)
+    submitted: float = field(default_factory=time.time)
+    started: float = None
+    finished: float = None
+    cancel: threading.Event = field(default_factory=threading.Event)
+    log_lines: deque = field(default_factory=lambda: deque(maxlen=JOB_LOG_LINES))
+
+    def to_dict(self, position=None):
+        data = {
+            'id': self.id,
+            'name': self.name,
+            'source': self.source,
+            'state': self.state,
+            'progress': round(self.progress, 1),
+            'status': self.status,
+            'files': len(self.paths),
+            'input_bytes': self.input_bytes,
+            'submitted': self.submitted,
+            'started': self.started,
+            'finished': self.finished,
+        }
+        if position is not None:
+            data['queue_position'] = position
+        if self.ignored_files:
+            data['ignored_files'] = self.ignored_files
+        if self.error is not None:
+            data['error'] = self.error
+        if self.report is not None:
+            data['merged_files'] = self.report.successfully_merged
+            data['failed_files'] = [{'name': name, 'reason': reason} for name, reason in self.report.failed_files]
+            data['dropped_files'] = [{'name': name, 'reason': reason} for name, reason in self.report.dropped_files]
+            data['output_bytes'] = self.output_path.stat().st_size if self.output_path.exists() else 0
+            data['result'] = f"/jobs/{self.id}/result"
+        data['log'] = list(self.log_lines)
+        return data
+
+
+class MergeService:
+    """병합 작업 큐와 작업 스레드 (HTTP와 무관하게 사용 가능)
+
+    options: 모든 작업에 쓸 MergeOptions (stream_above_mb: 입력이 이보다 큰 작업은 대용량 모드)
+    folder_roots: 서버 폴더 병합을 허용할 상위 폴더 목록 (비어 있으면 서버 폴더 병합 안 함)
+    """
+
+    def __init__(self, work_dir, options=None, workers=DEFAULT_JOB_WORKERS, keep_seconds=DEFAULT_KEEP_MINUTES * 60,
+                 folder_roots=(), log=_noop):
+        self.work_dir = Path(work_dir)
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        options = options or MergeOptions()
+        # 작업마다 변환 프로세스를 한 병합만큼 띄우지 않도록 나눠 씀 (batch_merge와 같음)
+        options = divide_workers(options, workers)
+        # 작업 폴더에 출력하므로 이전 결과 재사용/중단 기록은 쓰지 않음
+        self.options = replace(options, incremental=False, resume=False, split_max_mb=0, split_max_pages=0)
+        self.workers = workers
+        self.keep_seconds = keep_seconds
+        self.folder_roots = [Path(root).resolve() for root in folder_roots]
+        self.log = log
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._queued = deque()    # 대기 중인 작업 id (순서 = 대기 순서)
+        self._queue = queue.Queue()
+        self._stopping = threading.Event()
+        self._run_latency = deque(maxlen=LATENCY_WINDOW)
+        self._total_latency = deque(maxlen=LATENCY_WINDOW)
+        self._counts = {'done': 0, 'failed': 0, 'cancelled': 0}
+        self._bytes = {'input': 0, 'output': 0, 'downloaded': 0}
+        self._threads = [threading.Thread(target=self._work, name=f"merge-job-{n + 1}", daemon=True)
+                         for n in range(workers)]
+        self._threads.append(threading.Thread(target=self._purge_loop, name="merge-job-purge", daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    # --- 작업 등록 ---
+
+    def new_job_dir(self):
+        job_id = uuid.uuid4().hex[:12]
+        job_dir = self.work_dir / job_id
+        (job_dir / "input").mkdir(parents=True)
+        return job_id, job_dir
+
+    def submit_upload(self, job_id, job_dir, files, name=None):
+        """save_multipart로 받은 파일로 작업을 등록합니다."""
+        paths = [path for _, path in files if path is not None]
+        ignored = [file_name for file_name, path in files if path is None]
+        if not paths:
+            shutil.rmtree(job_dir, ignore_errors=True)
+            raise UploadError("병합할 수 있는 파일이 없습니다 (PDF, 이미지, 문서 파일을 올리세요)")
+        name = (name or "").strip() or "업로드"
+        output_path = job_dir / f"{_UNSAFE_NAME.sub('_', name)}_merged.pdf"
+        job = ServiceJob(job_id, name, paths, output_path, job_dir, 'upload', ignored_files=ignored)
+        return self._enqueue(job)
+
+    def submit_folder(self, folder, file_names=None):
+        """서버 폴더의 파일로 작업을 등록합니다 (출력은 작업 폴더에 씀)."""
+        if not self.folder_roots:
+            raise UploadError("서버 폴더 병합이 꺼져 있습니다 (--folder-root로 허용할 폴더 지정)", HTTPStatus.FORBIDDEN)
+        folder = Path(folder).resolve()
+        if not any(folder == root or root in folder.parents for root in self.folder_roots):
+            raise UploadError(f"허용되지 않은 폴더입니다: {folder}", HTTPStatus.FORBIDDEN)
+        if not folder.is_dir():
+            raise UploadError(f"폴더를 찾을 수 없습니다: {folder}", HTTPStatus.NOT_FOUND)
+        if file_names is not None and (not isinstance(file_names, list)
+                                       or not all(isinstance(name, str) for name in file_names)):
+            raise UploadError('files는 파일 이름(문자열) 목록이어야 합니다 (예: ["1.pdf", "2.jpg"])')
+        file_names = file_names or list_source_files(folder)
+        paths = [folder / name for name in file_names]
+        if not paths:
+            raise UploadError("병합할 파일이 목록에 없습니다.")
+        if any(folder not in path.resolve().parents for path in paths):
+            raise UploadError("files에는 폴더 안의 파일 이름만 쓸 수 있습니다", HTTPStatus.FORBIDDEN)
+        job_id, job_dir = self.new_job_dir()
+        job = ServiceJob(job_id, folder.name, paths, job_dir / default_output_path(folder).name, job_dir, 'folder')
+        return self._enqueue(job)
+
+    def _enqueue(self, job):
+        for path in job.paths:
+            try:
+                job.input_bytes += path.stat().st_size
+            except OSError:
+                pass
+        with self._lock:
+            self._jobs[job.id] = job
+            self._queued.append(job.id)
+        self._queue.put(job.id)
+        self.log(f"[{job.id}] 작업 등록: {job.name} (파일 {len(job.paths)}개, 대기 {len(self._queued)}개)")
+        return job
+
+    # --- 조회/취소 ---
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def status(self, job):
+        with self._lock:
+            position = self._queued.index(job.id) + 1 if job.id in self._queued else None
+            return job.to_dict(position)
+
+    def list_jobs(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [self.status(job) for job in jobs]
+
+    def cancel(self, job):
+        """대기 중이면 빼고, 병합 중이면 취소 신호를 보냅니다. 끝난 작업이면 지움"""
+        with self._lock:
+            state = job.state
+            if state == 'queued':
+                self._queued.remove(job.id)
+                self._finish(job, 'cancelled', "취소됨")
+        if state == 'running':
+            job.cancel.set()
+        elif state != 'queued':
+            self.remove(job)
+
+    def remove(self, job):
+        with self._lock:
+            self._jobs.pop(job.id, None)
+        shutil.rmtree(job.job_dir, ignore_errors=True)
+
+    def record_download(self, size):
+        with self._lock:
+            self._bytes['downloaded'] += size
+
+    def metrics(self):
+        with self._lock:
+            states = [job.state for job in self._jobs.values()]
+            return {
+                'uptime_seconds': round(time.time() - self.started, 1),
+                'workers': self.workers,
+                'queue_depth': len(self._queued),
+                'running': states.count('running'),
+                'jobs_finished': dict(self._counts),
+                'latency_seconds': {
+                    'run': percentiles(self._run_latency),
+                    'total': percentiles(self._total_latency),
+                    'samples': len(self._run_latency),
+                },
+                'bytes_processed': dict(self._bytes),
+            }
+
+    # --- 작업 스레드 ---
+
+    def _finish(self, job, state, status):
+        """(self._lock을 잡은 채로 호출) 작업을 끝난 상태로 바꾸고 통계에 넣음"""
+        job.state, job.status = state, status
+        job.finished = time.time()
+        self._counts[state] += 1
+        if job.started is not None:
+            self._run_latency.append(job.finished - job.started)
+            self._total_latency.append(job.finished - job.submitted)
+            self._bytes['input'] += job.input_bytes
+        if state == 'done' and job.output_path.exists():
+            self._bytes['output'] += job.output_path.stat().st_size
+
+    def _work(self):
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                return
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None or job.state != 'queued':
+                    continue  # 대기 중에 취소됨
+                self._queued.remove(job_id)
+                job.state, job.status, job.started = 'running', "병합 중", time.time()
+
+            def job_log(message, job=job):
+                job.log_lines.append(message)
+                self.log(f"[{job.id}] {message}")
+
+            def job_progress(value, text, job=job):
+                job.progress, job.status = value, text
+
+            options = replace(own_backend(self.options), cancel=job.cancel, temp_dir=job.job_dir)
+            try:
+                job.report = merge_folder(job.paths, job.output_path, options, log=job_log, progress=job_progress)
+            except MergeCancelled:
+                state, status = 'cancelled', "취소됨"
+            except Exception as e:
+                job.error = str(e)
+                state, status = 'failed', "실패"
+                self.log(f"❌ [{job.id}] 병합 실패: {e}")
+            else:
+                state, status = 'done', "완료"
+                self.log(f"✓ [{job.id}] 병합 완료: {job.output_path.name} "
+                         f"({len(job.report.successfully_merged)}/{job.report.total_files}개 파일)")
+            with self._lock:
+                self._finish(job, state, status)
+            if job.source == 'upload':
+                # 결과만 남기고 올린 원본은 바로 지움
+                shutil.rmtree(job.job_dir / "input", ignore_errors=True)
+
+    def _purge_loop(self):
+        """보관 시간이 지난 끝난 작업을 지움"""
+        while not self._stopping.wait(min(60, max(1, self.keep_seconds / 2))):
+            now = time.time()
+            with self._lock:
+                expired = [job for job in self._jobs.values()
+                           if job.finished is not None and now - job.finished > self.keep_seconds]
+            for job in expired:
+                self.remove(job)
+
+    def close(self):
+        """대기 중인 작업을 취소하고, 병합 중인 작업을 멈춘 뒤 작업 스레드를 끝냄"""
+        self._stopping.set()
+        with self._lock:
+            for job in self._jobs.values():
+                if job.state == 'queued':
+                    self._finish(job, 'cancelled', "취소됨")
+                job.cancel.set()
+            self._queued.clear()
+        for _ in range(self.workers):
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # chunked 전송과 연결 재사용을 위해 HTTP/1.1
+    protocol_version = "HTTP/1.1"
+    server_version = "PdfMergeService/1.0"
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def log_message(self, format, *args):
+        self.server.log_request_line(f"{self.address_string()} {format % args}")
+
+    def _send_json(self, status, data):
+        body = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, message):
+        self._send_json(status, {'error': message})
+
+    def _job(self):
+        match = _JOB_PATH.match(self.path.split('?', 1)[0])
+        if match is None:
+            return None, False
+        return self.service.get(match.group(1)), bool(match.group(2))
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path == "/metrics":
+            return self._send_json(HTTPStatus.OK, self.service.metrics())
+        if path == "/jobs":
+            return self._send_json(HTTPStatus.OK, self.service.list_jobs())
+        job, result = self._job()
+        if job is None:
+            return self._send_error(HTTPStatus.NOT_FOUND, "작업을 찾을 수 없습니다")
+        if not result:
+            return self._send_json(HTTPStatus.OK, self.service.status(job))
+        if job.state != 'done':
+            return self._send_error(HTTPStatus.CONFLICT, f"아직 결과가 없습니다 (상태: {job.state})")
+        self._send_file(job.output_path)
+
+    def _send_file(self, path):
+        """PDF를 CHUNK_SIZE씩 읽어 chunked로 보냄"""
+        try:
+            source = open(path, 'rb')
+        except OSError:
+            return self._send_error(HTTPStatus.GONE, "결과 파일이 지워졌습니다")
+        sent = 0
+        with source:
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", "application/pdf")
+            self.send_header("Content-Disposition", f"attachment; filename*=UTF-8''{quote(path.name)}")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            while True:
+                chunk = source.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                sent += len(chunk)
+            self.wfile.write(b"0\r\n\r\n")
+        self.service.record_download(sent)
+
+    def do_POST(self):
+        if self.path.split('?', 1)[0] != "/jobs":
+            return self._send_error(HTTPStatus.NOT_FOUND, "없는 경로입니다")
+        if 'Content-Length' not in self.headers:
+            # 본문을 다 읽지 못하면 연결을 재사용할 수 없음
+            self.close_connection = True
+            return self._send_error(HTTPStatus.LENGTH_REQUIRED, "Content-Length가 필요합니다")
+        try:
+            length = int(self.headers['Content-Length'])
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            return self._send_error(HTTPStatus.BAD_REQUEST, "Content-Length가 올바르지 않습니다")
+        content_type = Message()
+        content_type['Content-Type'] = self.headers.get('Content-Type', '')
+        try:
+            if content_type.get_content_type() == 'multipart/form-data':
+                boundary = content_type.get_param('boundary')
+                if not boundary:
+                    raise UploadError("multipart boundary가 없습니다")
+                job_id, job_dir = self.service.new_job_dir()
+                try:
+                    files, fields = save_multipart(self.rfile, length, boundary, job_dir / "input",
+                                                   self.server.max_upload_bytes)
+                except BaseException:
+                    shutil.rmtree(job_dir, ignore_errors=True)
+                    raise
+                job = self.service.submit_upload(job_id, job_dir, files, fields.get('name'))
+            elif content_type.get_content_type() == 'application/json':
+                if length > MAX_FIELD_BYTES:
+                    raise UploadError("요청이 너무 큽니다", HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+                try:
+                    request = json.loads(self.rfile.read(length))
+                except ValueError:
+                    raise UploadError("JSON 형식이 올바르지 않습니다")
+                if not isinstance(request, dict) or not request.get('folder'):
+                    raise UploadError('{"folder": "..."}가 필요합니다')
+                job = self.service.submit_folder(request['folder'], request.get('files'))
+            else:
+                raise UploadError("multipart/form-data(파일 업로드) 또는 application/json(서버 폴더)만 받습니다",
+                                  HTTPStatus.UNSUPPORTED_MEDIA_TYPE)
+        except UploadError as e:
+            # 본문을 다 읽지 않았을 수 있으므로 응답 후 연결을 끊음
+            self.close_connection = True
+            return self._send_error(e.status, str(e))
+        self._send_json(HTTPStatus.ACCEPTED, self.service.status(job))
+
+    def do_DELETE(self):
+        job, result = self._job()
+        if job is None or result:
+            return self._send_error(HTTPStatus.NOT_FOUND, "작업을 찾을 수 없습니다")
+        self.service.cancel(job)
+        self._send_json(HTTPStatus.OK, self.service.status(job))
+
+
+class MergeServiceServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, service, max_upload_bytes=DEFAULT_MAX_UPLOAD_MB * 1024 * 1024, log=_noop):
+        super().__init__(address, _Handler)
+        self.service = service
+        self.max_upload_bytes = max_upload_bytes
+        self.log_request_line = log
+
+
+def build_parser():
+    from converters import BACKENDS
+    from daemon_client import DEFAULT_DAEMON_ADDRESS, parse_address
+
+    parser = argparse.ArgumentParser(description="로컬 HTTP 병합 서비스 (파일 업로드 또는 서버 폴더를 병합)")
+    parser.add_argument("--host", default=DEFAULT_SERVICE_ADDRESS[0],
+                        help=f"받을 주소 (기본값: {DEFAULT_SERVICE_ADDRESS[0]}, 다른 PC에서 쓰려면 0.0.0.0)")
+    parser.add_argument("--port", type=int, default=DEFAULT_SERVICE_ADDRESS[1],
+                        help=f"포트 (기본값: {DEFAULT_SERVICE_ADDRESS[1]})")
+    parser.add_argument("--workers", type=int, default=DEFAULT_JOB_WORKERS, metavar="N",
+                        help=f"동시에 병합할 작업 수 (기본값: {DEFAULT_JOB_WORKERS})")
+    parser.add_argument("--stream-above-mb", type=int, default=DEFAULT_STREAM_ABOVE_MB, metavar="MB",
+                        help="작업의 입력 총 크기가 이보다 크면 페이지를 바로 파일에 쓰는 대용량 모드로 병합 "
+                             f"(메모리 상한은 아님, 기본값: {DEFAULT_STREAM_ABOVE_MB}MB)")
+    parser.add_argument("--max-upload-mb", type=int, default=DEFAULT_MAX_UPLOAD_MB, metavar="MB",
+                        help=f"업로드 한 번의 최대 크기 (기본값: {DEFAULT_MAX_UPLOAD_MB}MB)")
+    parser.add_argument("--keep-minutes", type=float, default=DEFAULT_KEEP_MINUTES, metavar="MIN",
+                        help=f"끝난 작업의 결과를 보관하는 시간 (기본값: {DEFAULT_KEEP_MINUTES}분)")
+    parser.add_argument("--work-dir", help="업로드와 결과를 둘 폴더 (기본값: 임시 폴더)")
+    parser.add_argument("--folder-root", action="append", default=[], metavar="DIR",
+                        help="서버 폴더 병합을 허용할 상위 폴더 (여러 번 지정 가능, 없으면 업로드만 받음)")
+    parser.add_argument("--converter", choices=sorted(BACKENDS), default="win32com",
+                        help="문서 변환 백엔드 (merge_cli.py와 같음)")
+    parser.add_argument("--daemon-address", type=parse_address, default=DEFAULT_DAEMON_ADDRESS, metavar="HOST:PORT",
+                        help="--converter daemon: 변환 데몬 주소")
+    parser.add_argument("--daemon-fake", action="store_true",
+                        help="--converter daemon: 데몬을 빈 PDF를 쓰는 대역으로 띄움 (테스트용)")
+    parser.add_argument("--daemon-python", metavar="PATH",
+                        help="--converter daemon: 데몬을 띄울 Python (merge_cli.py와 같음)")
+    parser.add_argument("--convert-timeout", metavar="KIND=SEC,...",
+                        help="문서 하나의 변환 시간 제한 (merge_cli.py와 같음)")
+    parser.add_argument("--image-workers", type=int, default=0, metavar="N",
+                        help="작업 하나의 이미지 변환 프로세스 수 (기본값: CPU 코어 수 / 동시 작업 수)")
+    parser.add_argument("--no-optimize", action="store_true", help="저장 후 출력 최적화를 하지 않음")
+    parser.add_argument("--no-cache", action="store_true", help="변환 결과 캐시를 사용하지 않음")
+    parser.add_argument("--cache-dir", help="변환 결과 캐시 폴더 (기본값: 사용자 캐시 폴더)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="작업 로그를 출력하지 않음")
+    return parser
+
+
+def main(argv=None):
+    from conversion_cache import ConversionCache
+    from converter_workers import parse_convert_timeouts
+    from converters import make_backend
+    from merge_cli import backend_options
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        timeouts = parse_convert_timeouts(args.convert_timeout) if args.convert_timeout else None
+    except ValueError as e:
+        parser.error(str(e))
+
+    log = _noop if args.quiet else _log
+    options = MergeOptions(
+        converter_backend=make_backend(args.converter, **backend_options(args)),
+        convert_timeouts=timeouts,
+        image_workers=args.image_workers,
+        stream_above_mb=args.stream_above_mb,
+        optimize_output=not args.no_optimize,
+        cache=None if args.no_cache else ConversionCache(args.cache_dir),
+    )
+    work_dir = Path(args.work_dir) if args.work_dir else Path(tempfile.mkdtemp(prefix="pdf_merge_service_"))
+    service = MergeService(work_dir, options, max(1, args.workers), args.keep_minutes * 60, args.folder_root, log)
+    try:
+        server = MergeServiceServer((args.host, args.port), service, args.max_upload_mb * 1024 * 1024, log)
+    except OSError as e:
+        service.close()
+        print(f"오류: {args.host}:{args.port}에서 받을 수 없습니다: {e}", file=sys.stderr)
+        return 2
+    print(f"병합 서비스 대기 중: http://{args.host}:{args.port} (동시 작업 {service.workers}개, 작업 폴더 {work_dir})",
+          flush=True)
+    try:
+        server.serve_forever(poll_interval=0.5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    import multiprocessing
+
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,217 @@
+"""병합 단계별 시간/메모리 기록 (성능 추적)
+
+파일마다, 단계마다(scan, decode, convert, startup, wait, append, write, optimize,
+cleanup) 시작/끝 시각을 나노초 단위로 기록하고 메모리 사용량(RSS)을 주기적으로
+표본 조사해서 Chrome trace 형식 JSON(chrome://tracing, https://ui.perfetto.dev에서
+열기)과 CSV로 저장합니다.
+
+시각은 time.perf_counter_ns()로 잽니다. Windows(QueryPerformanceCounter)와
+Linux(CLOCK_MONOTONIC)에서는 시스템 전체에서 같은 시계이므로 변환 프로세스에서 잰
+구간도 같은 시간축에 놓입니다.
+"""
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# RSS 표본 조사 주기 (초)
+DEFAULT_SAMPLE_INTERVAL = 0.05
+
+
+def _windows_memory_counters():
+    """Windows: 이 프로세스의 PROCESS_MEMORY_COUNTERS (실패하면 None)"""
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    handle = ctypes.windll.kernel32.GetCurrentProcess()
+    if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+        return counters
+    return None
+
+
+def current_rss():
+    """이 프로세스의 현재 메모리 사용량 (바이트, 알 수 없으면 None)"""
+    if sys.platform == "win32":
+        counters = _windows_memory_counters()
+        return counters.WorkingSetSize if counters else None
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_rss():
+    """이 프로세스의 최대 메모리 사용량 (바이트, 알 수 없으면 None)"""
+    if sys.platform == "win32":
+        counters = _windows_memory_counters()
+        return counters.PeakWorkingSetSize if counters else None
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, Linux는 KB 단위
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class NullTracer:
+    """추적을 끈 상태: 모든 기록 호출이 아무 일도 하지 않음"""
+
+    def span(self, name, category="merge", **args):
+        return nullcontext()
+
+    def add_span(self, name, category, start_ns, end_ns, pid=None, tid=None, **args):
+        pass
+
+    def worker_callback(self):
+        return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+NULL_TRACER = NullTracer()
+
+
+class MergeTracer:
+    """구간(span)과 메모리 표본을 모아 두었다가 Chrome trace JSON/CSV로 저장합니다.
+
+    with 블록 안에서는 배경 스레드가 RSS를 표본 조사합니다. 여러 스레드에서 동시에
+    기록해도 됩니다 (일괄 병합).
+    """
+
+    def __init__(self, sample_interval=DEFAULT_SAMPLE_INTERVAL):
+        self.sample_interval = sample_interval
+        self.origin_ns = time.perf_counter_ns()
+        self.pid = os.getpid()
+        self.spans = []    # (이름, 분류, 시작 ns, 끝 ns, pid, tid, args)
+        self.samples = []  # (시각 ns, RSS 바이트)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = None
+        self._thread_names = {}
+
+    @contextmanager
+    def span(self, name, category="merge", **args):
+        """with 블록의 소요 시간을 구간 하나로 기록합니다."""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.add_span(name, category, start, time.perf_counter_ns(), **args)
+
+    def add_span(self, name, category, start_ns, end_ns, pid=None, tid=None, **args):
+        """다른 곳(변환 프로세스 등)에서 잰 구간을 기록합니다."""
+        if tid is None:
+            thread = threading.current_thread()
+            tid = thread.ident
+            self._thread_names.setdefault((pid or self.pid, tid), thread.name)
+        with self._lock:
+            self.spans.append((name, category, start_ns, end_ns, pid or self.pid, tid, args))
+
+    def worker_callback(self):
+        """변환 함수에 넘길 콜백: callback(이름, 분류, 시작 ns, 끝 ns, pid, tid, args)"""
+        def record(name, category, start_ns, end_ns, pid, tid, args):
+            self.add_span(name, category, start_ns, end_ns, pid, tid, **args)
+        return record
+
+    def _sample_loop(self):
+        while not self._stop.is_set():
+            rss = current_rss()
+            if rss is not None:
+                with self._lock:
+                    self.samples.append((time.perf_counter_ns(), rss))
+            self._stop.wait(self.sample_interval)
+
+    def __enter__(self):
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._sample_loop, name="rss-sampler", daemon=True)
+        self._sampler.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+
+    def _us(self, ns):
+        return round((ns - self.origin_ns) / 1000, 3)
+
+    def chrome_events(self):
+        """Chrome trace-event 형식의 이벤트 목록"""
+        with self._lock:
+            spans = list(self.spans)
+            samples = list(self.samples)
+        events = [{"ph": "M", "name": "process_name", "pid": self.pid, "tid": 0, "args": {"name": "병합"}}]
+        worker_pids = sorted({span[4] for span in spans} - {self.pid})
+        for pid in worker_pids:
+            events.append({"ph": "M", "name": "process_name", "pid": pid, "tid": 0,
+                           "args": {"name": f"변환 프로세스 {pid}"}})
+        for (pid, tid), thread_name in self._thread_names.items():
+            events.append({"ph": "M", "name": "thread_name", "pid": pid, "tid": tid, "args": {"name": thread_name}})
+        for name, category, start, end, pid, tid, args in spans:
+            events.append({"ph": "X", "name": name, "cat": category, "ts": self._us(start),
+                           "dur": round((end - start) / 1000, 3), "pid": pid, "tid": tid, "args": args})
+        for at, rss in samples:
+            events.append({"ph": "C", "name": "memory", "ts": self._us(at), "pid": self.pid, "tid": 0,
+                           "args": {"rss_mb": round(rss / 1024 / 1024, 1)}})
+        return events
+
+    def export_chrome(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.chrome_events(), "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+
+    def export_csv(self, path):
+        """한 줄에 구간 하나 또는 메모리 표본 하나 (시각은 추적 시작부터 ms)"""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span[2])
+            samples = list(self.samples)
+        # Excel에서 한글이 깨지지 않도록 BOM 포함
+        with open(path, "w", encoding="utf-8-sig", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["type", "name", "category", "file", "start_ms", "duration_ms", "pid", "tid", "rss_mb"])
+            for name, category, start, end, pid, tid, args in spans:
+                writer.writerow(["span", name, category, args.get("file", ""), round(self._us(start) / 1000, 3),
+                                 round((end - start) / 1e6, 3), pid, tid, ""])
+            for at, rss in samples:
+                writer.writerow(["memory", "rss", "memory", "", round(self._us(at) / 1000, 3), "", self.pid, "",
+                                 round(rss / 1024 / 1024, 1)])
+
+    def save(self, path):
+        """path(.json)에 Chrome trace를, 같은 이름의 .csv에 CSV를 저장하고 두 경로를 돌려줍니다."""
+        path = str(path)
+        base = path[:-5] if path.lower().endswith(".json") else path
+        json_path, csv_path = base + ".json", base + ".csv"
+        self.export_chrome(json_path)
+        self.export_csv(csv_path)
+        return json_path, csv_path
+
+
+def trace_path_for(output_path):
+    """출력 PDF 옆에 두는 추적 파일 경로 (예: 폴더_merged.trace.json)"""
+    output_path = str(output_path)
+    base = output_path[:-4] if output_path.lower().endswith(".pdf") else output_path
+    return base + ".trace.json"
+
+
+def worker_span(trace, name, category, start_ns, **args):
+    """변환 프로세스/스레드에서 잰 구간을 콜백으로 넘깁니다 (trace가 None이면 무시)."""
+    if trace is not None:
+        trace(name, category, start_ns, time.perf_counter_ns(), os.getpid(), threading.get_ident(), args)
@@ -1,14 +1,32 @@
+import time
+# 시작 시간 측정 기준 (startup_timing)
+_STARTED = time.perf_counter()
 import tkinter as tk
-from tkinter import filedialog, messagebox, scrolledtext, Listbox, ttk
+import tkinter.font as tkfont
+from tkinter import filedialog, messagebox, scrolledtext, ttk
 import os
-import re
 from pathlib import Path
-from pypdf import PdfWriter
-from PIL import Image
 import threading
-import time
-import win32com.client
-import pythoncom
+# pypdf, PIL, pywin32는 병합을 시작할 때 merge_engine/converters가 불러옴 (창을 빨리 띄우기 위함)
+from batch_merge import run_batch
+from conversion_cache import ConversionCache
+from folder_scanner import FolderIndex, scan_folder
+from file_list_model import FileListModel
+from file_list_view import FileListView, ListColumn
+from log_relay import FRAME_INTERVAL_MS, LogRelay
+from merge_journal import output_state
+from merge_trace import NULL_TRACER, MergeTracer, trace_path_for
+from merge_engine import (
+    IMAGE_EXTENSIONS, DOC_EXTENSIONS, TEMP_PREFIX, MERGED_SUFFIX,
+    MergeOptions, default_output_path, format_bytes, merge_folder, natural_sort_key
+)
+from startup_timing import STARTUP_REPORT_ENV, write_startup_report
+
+_IMPORTED = time.perf_counter()
+
+# 글꼴 기본값 (맑은 고딕) / 설치되어 있으면 우선 사용할 글꼴
+DEFAULT_FONT_FAMILY = '맑은 고딕'
+PREFERRED_FONT_FAMILIES = ['Noto Sans KR', 'Noto Sans Korean', 'NotoSansKR']
 
 class PdfMergerApp:
     def __init__(self, root):
@@ -48,35 +66,32 @@ class PdfMergerApp:
             'button_text': '#FFFFFF'
         }
 
-        # 폰트 폴백 설정 (Noto Sans KR 우선, 없으면 맑은 고딕)
-        import tkinter.font as tkfont
-        available_fonts = tkfont.families()
-
-        # Noto Sans KR 여러 이름으로 확인
-        font_family = '맑은 고딕'  # 기본값
-        for font_name in ['Noto Sans KR', 'Noto Sans Korean', 'NotoSansKR']:
-            if font_name in available_fonts:
-                font_family = font_name
-                break
-
+        # 폰트: 맑은 고딕으로 먼저 그리고, 창을 띄운 뒤 apply_preferred_font()에서
+        # Noto Sans KR이 있으면 바꿈 (글꼴 목록 조회가 느려서 창 표시를 늦추지 않도록)
+        # 이름 있는 글꼴 객체라 family만 바꾸면 모든 위젯에 바로 반영됨
         self.fonts = {
-            'title': (font_family, 16, 'bold'),
-            'heading': (font_family, 11, 'bold'),
-            'body': (font_family, 9),
-            'button': (font_family, 10, 'bold'),
-            'small': (font_family, 9)
+            'title': tkfont.Font(family=DEFAULT_FONT_FAMILY, size=16, weight='bold'),
+            'heading': tkfont.Font(family=DEFAULT_FONT_FAMILY, size=11, weight='bold'),
+            'body': tkfont.Font(family=DEFAULT_FONT_FAMILY, size=9),
+            'button': tkfont.Font(family=DEFAULT_FONT_FAMILY, size=10, weight='bold'),
+            'small': tkfont.Font(family=DEFAULT_FONT_FAMILY, size=9)
         }
 
         # 백그라운드 색상 설정
         self.root.configure(bg=self.colors['bg'])
 
         self.folder_path = tk.StringVar()
-        self.image_extensions = ['.jpg', '.jpeg', '.png']
-        self.doc_extensions = ['.docx', '.doc', '.hwp', '.hwpx', '.xlsx', '.xls', '.pptx', '.ppt']
+        # 폴더 스캔 결과 (이름 -> ScanEntry)와 진행 중인 스캔의 중단 신호
+        self.scan_entries = {}
+        self._scan_stop = None
+        # 작업 스레드의 로그/진행률은 여기에 모았다가 Tk 스레드가 주기적으로 한꺼번에 표시
+        self.log_relay = LogRelay()
+        self.image_extensions = IMAGE_EXTENSIONS
+        self.doc_extensions = DOC_EXTENSIONS
 
         # --- 상수 정의 ---
-        self.TEMP_PREFIX = "__temp_"
-        self.MERGED_SUFFIX = "_merged.pdf"
+        self.TEMP_PREFIX = TEMP_PREFIX
+        self.MERGED_SUFFIX = MERGED_SUFFIX
         self.ORIGINALS_DIR = "원본"
 
         # --- GUI 구성 요소 ---
@@ -236,6 +251,19 @@ class PdfMergerApp:
         select_btn.bind('<Enter>', lambda e: select_btn.config(bg=self.colors['primary_hover']))
         select_btn.bind('<Leave>', lambda e: select_btn.config(bg=self.colors['primary']))
 
+        self.include_subfolders = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            folder_inner,
+            text="하위 폴더 포함",
+            variable=self.include_subfolders,
+            command=self.update_file_list,
+            font=self.fonts['small'],
+            fg=self.colors['text'],
+            bg=self.colors['card_bg'],
+            activebackground=self.colors['card_bg'],
+            cursor='hand2'
+        ).pack(anchor=tk.W, pady=(8, 0))
+
         # 카드 프레임: 파일 목록
         list_card = tk.Frame(
             main_container,
@@ -259,7 +287,7 @@ class PdfMergerApp:
 
         tk.Label(
             list_inner,
-            text="파일을 선택 후 ▲▼ 버튼으로 순서 조정, ✕ 버튼으로 제외할 수 있습니다",
+            text="파일을 선택(Ctrl/Shift+클릭으로 여러 개) 후 ⤒▲▼⤓ 버튼으로 순서 조정, ✕ 버튼으로 제외, 열 제목을 누르면 정렬",
             font=self.fonts['small'],
             fg=self.colors['text_secondary'],
             bg=self.colors['card_bg']
@@ -269,81 +297,116 @@ class PdfMergerApp:
         listbox_frame = tk.Frame(list_inner, bg=self.colors['card_bg'])
         listbox_frame.pack(expand=True, fill=tk.BOTH)
 
-        # 파일 목록 리스트박스
-        self.file_listbox = Listbox(
+        # 파일 목록: 순서는 모델이 갖고, 화면에는 보이는 줄만 그림
+        self.file_model = FileListModel()
+        self.file_list = FileListView(
             listbox_frame,
-            selectmode=tk.SINGLE,
-            font=self.fonts['heading'],
-            bg='#F8F9FA',
-            fg=self.colors['text'],
-            relief=tk.FLAT,
-            highlightthickness=1,
-            highlightbackground=self.colors['border'],
-            highlightcolor=self.colors['primary'],
-            selectbackground=self.colors['primary'],
-            selectforeground='white',
-            activestyle='none',
-            borderwidth=0
+            self.file_model,
+            [
+                ListColumn("파일", lambda name: name, natural_sort_key),
+                ListColumn("종류", self._entry_kind_text, self._entry_kind_key, width=70),
+                ListColumn("쪽수", self._entry_pages_text, self._entry_pages_key, width=60, anchor=tk.E),
+                ListColumn("크기", self._entry_size_text, self._entry_size_key, width=80, anchor=tk.E),
+            ],
+            font=self.fonts['body'],
+            colors=self.colors
         )
-        self.file_listbox.pack(side=tk.LEFT, expand=True, fill=tk.BOTH, padx=(0, 10))
+        self.file_list.pack(side=tk.LEFT, expand=True, fill=tk.BOTH, padx=(0, 10))
+        self.file_list.bind('<<ListSelect>>', lambda e: self._update_list_info())
+        self.file_list.bind('<<ListDelete>>', lambda e: self.remove_file())
 
         # 순서 조정 버튼 프레임
         button_sub_frame = tk.Frame(listbox_frame, bg=self.colors['card_bg'])
         button_sub_frame.pack(side=tk.LEFT, fill=tk.Y)
 
-        up_btn = tk.Button(
-            button_sub_frame,
-            text="▲",
-            command=self.move_up,
-            font=self.fonts['button'],
-            bg=self.colors['card_bg'],
-            fg=self.colors['text'],
-            relief=tk.FLAT,
-            cursor='hand2',
-            width=4,
-            height=2,
-            highlightthickness=1,
-            highlightbackground=self.colors['border']
+        self._list_button(button_sub_frame, "⤒", self.move_to_top)
+        self._list_button(button_sub_frame, "▲", self.move_up)
+        self._list_button(button_sub_frame, "▼", self.move_down)
+        self._list_button(button_sub_frame, "⤓", self.move_to_bottom)
+        self._list_button(button_sub_frame, "✕", self.remove_file, fg='#E74C3C', hover_bg='#FFEBEE', pady=0)
+
+        # 파일 수/쪽수 정보 (폴더 색인 기준)
+        self.list_info_label = tk.Label(
+            list_inner,
+            text="",
+            font=self.fonts['small'],
+            fg=self.colors['text_secondary'],
+            bg=self.colors['card_bg']
         )
-        up_btn.pack(pady=(0, 5))
-        up_btn.bind('<Enter>', lambda e: up_btn.config(bg=self.colors['border']))
-        up_btn.bind('<Leave>', lambda e: up_btn.config(bg=self.colors['card_bg']))
-
-        down_btn = tk.Button(
-            button_sub_frame,
-            text="▼",
-            command=self.move_down,
-            font=self.fonts['button'],
-            bg=self.colors['card_bg'],
+        self.list_info_label.pack(anchor=tk.W, pady=(8, 0))
+
+        # 이미지 용량 줄이기 옵션
+        self.shrink_images = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            main_container,
+            text="업로드용 용량 줄이기 (큰 이미지를 A4 200dpi로 축소)",
+            variable=self.shrink_images,
+            font=self.fonts['body'],
             fg=self.colors['text'],
+            bg=self.colors['bg'],
+            activebackground=self.colors['bg'],
+            cursor='hand2'
+        ).pack(anchor=tk.W, pady=(0, 8))
+
+        # 업로드 포털 첨부 용량 제한에 맞춰 나눠 저장하는 옵션
+        split_frame = tk.Frame(main_container, bg=self.colors['bg'])
+        split_frame.pack(anchor=tk.W, pady=(0, 8))
+        self.split_output = tk.BooleanVar(value=False)
+        self.split_max_mb = tk.StringVar(value="10")
+        tk.Checkbutton(
+            split_frame,
+            text="첨부 용량에 맞춰 나눠 저장 (파트당 최대",
+            variable=self.split_output,
+            font=self.fonts['body'],
+            fg=self.colors['text'],
+            bg=self.colors['bg'],
+            activebackground=self.colors['bg'],
+            cursor='hand2'
+        ).pack(side=tk.LEFT)
+        tk.Entry(
+            split_frame,
+            textvariable=self.split_max_mb,
+            width=5,
+            font=self.fonts['body'],
             relief=tk.FLAT,
-            cursor='hand2',
-            width=4,
-            height=2,
-            highlightthickness=1,
-            highlightbackground=self.colors['border']
-        )
-        down_btn.pack(pady=(0, 5))
-        down_btn.bind('<Enter>', lambda e: down_btn.config(bg=self.colors['border']))
-        down_btn.bind('<Leave>', lambda e: down_btn.config(bg=self.colors['card_bg']))
-
-        remove_btn = tk.Button(
-            button_sub_frame,
-            text="✕",
-            command=self.remove_file,
-            font=self.fonts['button'],
-            bg=self.colors['card_bg'],
-            fg='#E74C3C',  # 빨간색
-            relief=tk.FLAT,
-            cursor='hand2',
-            width=4,
-            height=2,
+            justify=tk.RIGHT,
             highlightthickness=1,
-            highlightbackground=self.colors['border']
-        )
-        remove_btn.pack()
-        remove_btn.bind('<Enter>', lambda e: remove_btn.config(bg='#FFEBEE'))
-        remove_btn.bind('<Leave>', lambda e: remove_btn.config(bg=self.colors['card_bg']))
+            highlightbackground=self.colors['border'],
+            highlightcolor=self.colors['primary']
+        ).pack(side=tk.LEFT, padx=(4, 4))
+        tk.Label(
+            split_frame,
+            text="MB, _merged_part01.pdf ...)",
+            font=self.fonts['body'],
+            fg=self.colors['text'],
+            bg=self.colors['bg']
+        ).pack(side=tk.LEFT)
+
+        # 같은 영수증을 두 번 넣은 경우 한 번만 병합하는 옵션
+        self.skip_duplicates = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            main_container,
+            text="내용이 같은 파일은 한 번만 넣기",
+            variable=self.skip_duplicates,
+            font=self.fonts['body'],
+            fg=self.colors['text'],
+            bg=self.colors['bg'],
+            activebackground=self.colors['bg'],
+            cursor='hand2'
+        ).pack(anchor=tk.W, pady=(0, 8))
+
+        # 성능 기록 옵션 (느린 병합의 원인 확인용)
+        self.record_trace = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            main_container,
+            text="성능 기록 남기기 (파일별/단계별 시간과 메모리를 .trace.json/.csv로 저장)",
+            variable=self.record_trace,
+            font=self.fonts['body'],
+            fg=self.colors['text'],
+            bg=self.colors['bg'],
+            activebackground=self.colors['bg'],
+            cursor='hand2'
+        ).pack(anchor=tk.W, pady=(0, 8))
 
         # 실행 버튼
         self.merge_button = tk.Button(
@@ -361,6 +424,22 @@ class PdfMergerApp:
         self.merge_button.bind('<Enter>', lambda e: self.merge_button.config(bg=self.colors['success_hover']))
         self.merge_button.bind('<Leave>', lambda e: self.merge_button.config(bg=self.colors['success']))
 
+        # 일괄 병합 버튼 (선택한 폴더 아래의 하위 폴더마다 병합)
+        self.batch_button = tk.Button(
+            main_container,
+            text="하위 폴더 일괄 병합 (폴더마다 따로 저장)",
+            command=self.start_batch_thread,
+            font=self.fonts['small'],
+            bg=self.colors['card_bg'],
+            fg=self.colors['text'],
+            relief=tk.FLAT,
+            cursor='hand2',
+            highlightthickness=1,
+            highlightbackground=self.colors['border'],
+            pady=6
+        )
+        self.batch_button.pack(fill=tk.X, pady=(0, 15))
+
         # 진행률 바
         progress_frame = tk.Frame(main_container, bg=self.colors['bg'])
         progress_frame.pack(fill=tk.X, pady=(0, 15))
@@ -415,6 +494,28 @@ class PdfMergerApp:
             wrap=tk.WORD
         )
         self.log_area.pack(fill=tk.BOTH, expand=True)
+        self.root.after(FRAME_INTERVAL_MS, self._drain_ui_events)
+
+    def _list_button(self, parent, text, command, fg=None, hover_bg=None, pady=(0, 5)):
+        """파일 목록 옆의 순서 조정 버튼"""
+        button = tk.Button(
+            parent,
+            text=text,
+            command=command,
+            font=self.fonts['button'],
+            bg=self.colors['card_bg'],
+            fg=fg or self.colors['text'],
+            relief=tk.FLAT,
+            cursor='hand2',
+            width=4,
+            height=2,
+            highlightthickness=1,
+            highlightbackground=self.colors['border']
+        )
+        button.pack(pady=pady)
+        button.bind('<Enter>', lambda e: button.config(bg=hover_bg or self.colors['border']))
+        button.bind('<Leave>', lambda e: button.config(bg=self.colors['card_bg']))
+        return button
 
     def toggle_guide(self):
         """가이드 내용을 접거나 펼칩니다."""
@@ -430,22 +531,30 @@ class PdfMergerApp:
             self.guide_visible.set(True)
 
     def update_progress(self, value, text):
-        """진행률 바와 레이블을 업데이트합니다."""
-        self.root.after(0, self._progress_update, value, text)
-
-    def _progress_update(self, value, text):
-        self.progress_bar['value'] = value
-        self.progress_label.config(text=f"{text} ({int(value)}%)")
+        """진행률 바와 레이블을 업데이트합니다 (다음 화면 갱신 때 마지막 값만 표시)."""
+        self.log_relay.progress(value, text)
 
     def log(self, message):
-        """로그 영역에 메시지를 추가합니다."""
-        self.root.after(0, self._log_update, message)
-
-    def _log_update(self, message):
-        self.log_area.config(state='normal')
-        self.log_area.insert(tk.END, f"[{time.strftime('%H:%M:%S')}] {message}\n")
-        self.log_area.see(tk.END)
-        self.log_area.config(state='disabled')
+        """로그 영역에 메시지를 추가합니다 (다음 화면 갱신 때 한꺼번에 표시)."""
+        self.log_relay.log(message)
+
+    def _drain_ui_events(self):
+        """쌓인 로그와 마지막 진행률을 한 번에 표시하고 다음 갱신을 예약합니다 (Tk 스레드)."""
+        lines, progress = self.log_relay.drain()
+        if progress is not None:
+            value, text = progress
+            self.progress_bar['value'] = value
+            self.progress_label.config(text=f"{text} ({int(value)}%)")
+        if lines:
+            self.log_area.config(state='normal')
+            self.log_area.insert(tk.END, "\n".join(lines) + "\n")
+            # 오래된 줄은 화면에서 지움 (전체 로그는 로그 파일에 있음)
+            excess = int(self.log_area.index('end-1c').split('.')[0]) - 1 - self.log_relay.max_lines
+            if excess > 0:
+                self.log_area.delete('1.0', f'{excess + 1}.0')
+            self.log_area.see(tk.END)
+            self.log_area.config(state='disabled')
+        self.root.after(FRAME_INTERVAL_MS, self._drain_ui_events)
 
     def select_folder(self):
         """폴더 선택 대화상자를 엽니다."""
@@ -456,324 +565,194 @@ class PdfMergerApp:
             self.log(f"선택된 폴더: {directory}")
 
     def update_file_list(self):
-        """리스트박스에 파일 목록을 업데이트합니다."""
-        self.file_listbox.delete(0, tk.END)
-        folder = Path(self.folder_path.get())
-        if folder.is_dir():
-            def natural_sort_key(s):
-                return [int(text) if text.isdigit() else text.lower() for text in re.split('([0-9]+)', s)]
-
-            # 모든 파일 확인
-            all_files = []
-            for f in folder.iterdir():
-                if f.is_file():
-                    ext = f.suffix.lower()
-                    # PDF, 이미지, 문서 파일 모두 포함
-                    if ext == '.pdf' or ext in self.image_extensions or ext in self.doc_extensions:
-                        all_files.append(f.name)
-
-            # 정렬 후 리스트에 추가
-            files = sorted(all_files, key=natural_sort_key)
-            for file_name in files:
-                self.file_listbox.insert(tk.END, file_name)
-
-    def move_up(self): self.move_item(-1)
-    def move_down(self): self.move_item(1)
-
-    def move_item(self, direction):
-        selected_indices = self.file_listbox.curselection()
-        if not selected_indices: return
-        idx = selected_indices[0]
-        new_idx = idx + direction
-        if 0 <= new_idx < self.file_listbox.size():
-            item = self.file_listbox.get(idx)
-            self.file_listbox.delete(idx)
-            self.file_listbox.insert(new_idx, item)
-            self.file_listbox.selection_set(new_idx)
-            self.file_listbox.activate(new_idx)
+        """폴더를 백그라운드에서 스캔해 리스트박스를 업데이트합니다."""
+        folder = self.folder_path.get()
+        if not folder:
+            return
+        # 이전 스캔이 아직 돌고 있으면 멈추고 결과를 버림
+        if self._scan_stop is not None:
+            self._scan_stop.set()
+        stop = self._scan_stop = threading.Event()
+        self.list_info_label.config(text="폴더를 읽는 중...")
+        thread = threading.Thread(
+            target=self._scan_folder, args=(folder, self.include_subfolders.get(), stop)
+        )
+        thread.daemon = True
+        thread.start()
+
+    def _scan_folder(self, folder, recursive, stop):
+        try:
+            entries = scan_folder(folder, recursive, FolderIndex(folder, recursive).load(), stop)
+        except OSError as e:
+            self.log(f"⚠️ 폴더를 읽을 수 없습니다: {e}")
+            entries = []
+        if entries is not None:
+            self.root.after(0, self._show_scan_result, entries, stop)
+
+    def _show_scan_result(self, entries, stop):
+        if stop.is_set():
+            return
+        self._scan_stop = None
+        self.scan_entries = {entry.name: entry for entry in entries}
+        # 자연 정렬 순서 그대로 목록에 넣음 (PDF, 이미지, 문서 파일 모두 포함)
+        self.file_model.set_items(entry.name for entry in entries)
+        self.file_list.clear_sort_mark()
+        self.file_list.refresh()
+        for entry in entries:
+            if entry.type_mismatch:
+                self.log(f"⚠️ 확장자와 내용이 다른 파일: {entry.name} (실제 형식: {entry.detected})")
+        if self.folder_path.get() and output_state(default_output_path(self.folder_path.get())) == 'interrupted':
+            self.log("↪ 이전 병합이 중단된 기록이 있습니다. 병합하면 아직 추가하지 못한 변환 결과를 다시 씁니다.")
+        self._update_list_info()
+
+    def _update_list_info(self):
+        """파일 수와 (PDF/이미지) 쪽수, 선택한 파일 정보를 표시합니다."""
+        names = self.file_model.items
+        entries = [self.scan_entries[name] for name in names if name in self.scan_entries]
+        pages = sum(entry.pages for entry in entries if entry.pages)
+        unknown = sum(1 for entry in entries if entry.pages is None)
+        text = f"파일 {len(names)}개 · {pages}쪽"
+        if unknown:
+            text += f" (+ 쪽수를 모르는 문서 {unknown}개)"
+
+        selected = self.file_model.selected_indices()
+        if len(selected) > 1:
+            chosen = [self.scan_entries.get(names[index]) for index in selected]
+            size = sum(entry.size for entry in chosen if entry is not None)
+            text += f"   |   {len(selected)}개 선택 · {format_bytes(size)}"
+        elif selected:
+            entry = self.scan_entries.get(names[selected[0]])
+            if entry is not None:
+                page_text = f"{entry.pages}쪽" if entry.pages else "쪽수 변환 후 확인"
+                text += f"   |   선택: {entry.name} · {page_text} · {format_bytes(entry.size)}"
+        self.list_info_label.config(text=text)
+
+    # 목록 열 값 (폴더 색인의 ScanEntry 기준)
+    def _entry_kind_text(self, name):
+        entry = self.scan_entries.get(name)
+        return {'pdf': "PDF", 'image': "이미지", 'doc': "문서"}.get(entry.kind, "") if entry else ""
+
+    def _entry_kind_key(self, name):
+        return (self._entry_kind_text(name), natural_sort_key(name))
+
+    def _entry_pages_text(self, name):
+        entry = self.scan_entries.get(name)
+        return str(entry.pages) if entry and entry.pages else "-"
+
+    def _entry_pages_key(self, name):
+        entry = self.scan_entries.get(name)
+        return entry.pages if entry and entry.pages else 0
+
+    def _entry_size_text(self, name):
+        entry = self.scan_entries.get(name)
+        return format_bytes(entry.size) if entry else ""
+
+    def _entry_size_key(self, name):
+        entry = self.scan_entries.get(name)
+        return entry.size if entry else 0
+
+    def move_up(self): self._move_selected(self.file_model.move_selected, -1)
+    def move_down(self): self._move_selected(self.file_model.move_selected, 1)
+    def move_to_top(self): self._move_selected(self.file_model.move_selected_to_top)
+    def move_to_bottom(self): self._move_selected(self.file_model.move_selected_to_bottom)
+
+    def _move_selected(self, move, *args):
+        """선택한 파일들을 옮기고 옮긴 자리가 보이게 합니다."""
+        first = move(*args)
+        if first is None:
+            return
+        self.file_list.clear_sort_mark()
+        self.file_list.see(first)
+        self._update_list_info()
 
     def remove_file(self):
-        """선택된 파일을 목록에서 제거합니다."""
-        selected_indices = self.file_listbox.curselection()
-        if not selected_indices:
+        """선택된 파일들을 목록에서 제거합니다."""
+        selected = self.file_model.selected_indices()
+        if not selected:
             messagebox.showwarning("경고", "제거할 파일을 선택해주세요.")
             return
-        idx = selected_indices[0]
-        file_name = self.file_listbox.get(idx)
 
         # 확인 메시지
-        result = messagebox.askyesno("확인", f"'{file_name}'을(를) 병합 목록에서 제외하시겠습니까?\n\n(파일은 삭제되지 않습니다)")
-        if result:
-            self.file_listbox.delete(idx)
-            self.log(f"목록에서 제외: {file_name}")
+        if len(selected) == 1:
+            question = f"'{self.file_model[selected[0]]}'을(를) 병합 목록에서 제외하시겠습니까?"
+        else:
+            question = f"선택한 파일 {len(selected)}개를 병합 목록에서 제외하시겠습니까?"
+        if messagebox.askyesno("확인", question + "\n\n(파일은 삭제되지 않습니다)"):
+            removed = self.file_model.remove_selected()
+            if len(removed) == 1:
+                self.log(f"목록에서 제외: {removed[0]}")
+            else:
+                self.log(f"목록에서 제외: {len(removed)}개 파일 ({removed[0]} 외)")
             # 다음 항목 선택 (있다면)
-            if self.file_listbox.size() > 0:
-                new_idx = min(idx, self.file_listbox.size() - 1)
-                self.file_listbox.selection_set(new_idx)
-                self.file_listbox.activate(new_idx)
+            if len(self.file_model):
+                self.file_model.select(min(selected[0], len(self.file_model) - 1))
+            self.file_list.refresh()
+            self._update_list_info()
 
     def start_merge_thread(self):
         if not self.folder_path.get():
             messagebox.showerror("오류", "먼저 병합할 파일이 있는 폴더를 선택해주세요.")
             return
         self.merge_button.config(state='disabled', text="병합 중...")
-        thread = threading.Thread(target=self.merge_files)
+        self.batch_button.config(state='disabled')
+        # 병합 중에 목록을 바꿔도 영향이 없도록 지금 순서를 복사해서 넘김
+        thread = threading.Thread(target=self.merge_files, args=(list(self.file_model.items),))
         thread.daemon = True
         thread.start()
 
-    def convert_doc_to_pdf(self, doc_path, output_pdf_path):
-        """Word/Excel/PowerPoint/HWP 문서를 PDF로 변환"""
-        pythoncom.CoInitialize()
-        try:
-            ext = doc_path.suffix.lower()
-
-            # 절대 경로로 변환하고 문자열로 변환
-            input_path = os.path.abspath(str(doc_path))
-            output_path = os.path.abspath(str(output_pdf_path))
-
-            if ext in ['.docx', '.doc']:
-                # Word 문서 변환
-                try:
-                    word = win32com.client.Dispatch("Word.Application")
-                except Exception as e:
-                    raise Exception(f"MS Word를 찾을 수 없습니다. Word가 설치되어 있는지 확인하세요. ({str(e)})")
-
-                word.Visible = False
-                try:
-                    doc = word.Documents.Open(input_path)
-                    doc.SaveAs(output_path, FileFormat=17)  # 17 = PDF
-                    doc.Close()
-                finally:
-                    try:
-                        word.Quit()
-                    except:
-                        pass
-
-            elif ext in ['.xlsx', '.xls']:
-                # Excel 문서 변환
-                try:
-                    excel = win32com.client.Dispatch("Excel.Application")
-                except Exception as e:
-                    raise Exception(f"MS Excel을 찾을 수 없습니다. Excel이 설치되어 있는지 확인하세요. ({str(e)})")
-
-                excel.Visible = False
-                excel.DisplayAlerts = False
-                try:
-                    workbook = excel.Workbooks.Open(input_path)
-                    # PDF 형식으로 저장 (0 = xlTypePDF)
-                    workbook.ExportAsFixedFormat(0, output_path)
-                    workbook.Close(SaveChanges=False)
-                finally:
-                    try:
-                        excel.Quit()
-                    except:
-                        pass
-
-            elif ext in ['.pptx', '.ppt']:
-                # PowerPoint 문서 변환
-                try:
-                    powerpoint = win32com.client.Dispatch("PowerPoint.Application")
-                except Exception as e:
-                    raise Exception(f"MS PowerPoint를 찾을 수 없습니다. PowerPoint가 설치되어 있는지 확인하세요. ({str(e)})")
-
-                try:
-                    presentation = powerpoint.Presentations.Open(input_path, WithWindow=False)
-                    # PDF 형식으로 저장 (32 = ppSaveAsPDF)
-                    presentation.SaveAs(output_path, 32)
-                    presentation.Close()
-                finally:
-                    try:
-                        powerpoint.Quit()
-                    except:
-                        pass
-
-            elif ext in ['.hwp', '.hwpx']:
-                # 한글 문서 변환
-                self.log(f"    [디버그] 한/글 프로그램 초기화 중...")
-                try:
-                    hwp = win32com.client.Dispatch("HWPFrame.HwpObject")
-                except Exception as e:
-                    raise Exception(f"한/글 프로그램을 찾을 수 없습니다. 한/글이 설치되어 있는지 확인하세요. ({str(e)})")
-
-                try:
-                    # 보안 경고 무시 설정
-                    hwp.RegisterModule("FilePathCheckDLL", "FilePathCheckerModuleExample")
-                    hwp.SetMessageBoxMode(0x00010000)  # 메시지 박스 자동 확인
-
-                    # 파일 열기
-                    self.log(f"    [디버그] 파일 열기 시도: {input_path}")
-                    result = hwp.Open(input_path, "HWP", "forceopen:true")
-                    if not result:
-                        raise Exception("파일 열기 실패 (hwp.Open 반환값: False)")
-
-                    self.log(f"    [디버그] 파일 열기 성공")
-
-                    # PDF로 저장 - HAction 사용 방식
-                    self.log(f"    [디버그] PDF 저장 시도: {output_path}")
-
-                    # HAction을 이용한 PDF 저장
-                    act = hwp.CreateAction("FileSaveAs")
-                    pset = act.CreateSet()
-                    act.GetDefault(pset)
-                    pset.SetItem("Format", "PDF")
-                    pset.SetItem("FileName", output_path)
-                    result = act.Execute(pset)
-
-                    if not result:
-                        raise Exception("PDF 저장 실패 (HAction.Execute 반환값: False)")
-
-                    self.log(f"    [디버그] PDF 저장 완료")
-
-                    # 파일 닫기
-                    hwp.Clear(1)  # 1 = 저장하지 않고 닫기
-                except Exception as e:
-                    raise Exception(f"한글 변환 중 오류: {str(e)}")
-                finally:
-                    try:
-                        hwp.Quit()
-                    except:
-                        pass
-
-        except Exception as e:
-            raise Exception(f"{doc_path.name} 변환 실패: {str(e)}")
-        finally:
-            pythoncom.CoUninitialize()
-
-    def merge_files(self):
-        temp_pdf_paths = []
-        # 성공/실패 추적
-        successfully_merged = []
-        failed_files = []
-
+    def merge_files(self, file_names):
         try:
             self.update_progress(0, "시작 중")
 
             source_folder = Path(self.folder_path.get())
-            original_files_to_process = [source_folder / f for f in self.file_listbox.get(0, tk.END)]
+            original_files_to_process = [source_folder / f for f in file_names]
 
             if not original_files_to_process:
                 self.log("병합할 파일이 목록에 없습니다.")
                 messagebox.showinfo("완료", "병합할 파일이 목록에 없습니다.")
                 return
 
-            total_files = len(original_files_to_process)
-            current_file = 0
-
-            # 이미지 파일 변환
-            image_files = [f for f in original_files_to_process if f.suffix.lower() in self.image_extensions]
-            if image_files:
-                self.log("이미지 파일을 PDF로 변환 시작...")
-
-            for img_path in image_files:
-                self.log(f"  -> 변환 중: {img_path.name}")
-                self.update_progress((current_file / total_files) * 50, "이미지 변환 중")
-                try:
-                    image = Image.open(img_path).convert("RGB")
-                    temp_pdf_path = source_folder / f"{self.TEMP_PREFIX}{img_path.stem}.pdf"
-                    image.save(temp_pdf_path)
-                    temp_pdf_paths.append(temp_pdf_path)
-                    successfully_merged.append(img_path.name)
-                    self.log(f"  ✓ 변환 성공: {img_path.name}")
-                except Exception as e:
-                    failed_files.append((img_path.name, str(e)))
-                    self.log(f"  ⚠️ 변환 실패: {img_path.name} - {str(e)}")
-                current_file += 1
-
-            # 문서 파일 변환
-            doc_files = [f for f in original_files_to_process if f.suffix.lower() in self.doc_extensions]
-            if doc_files:
-                self.log("문서 파일을 PDF로 변환 시작...")
-
-            for doc_path in doc_files:
-                self.log(f"  -> 변환 중: {doc_path.name}")
-                self.update_progress(50 + (current_file / total_files) * 30, "문서 변환 중")
-                temp_pdf_path = source_folder / f"{self.TEMP_PREFIX}{doc_path.stem}.pdf"
-                try:
-                    self.convert_doc_to_pdf(doc_path, temp_pdf_path)
-                    if temp_pdf_path.exists():
-                        temp_pdf_paths.append(temp_pdf_path)
-                        successfully_merged.append(doc_path.name)
-                        self.log(f"  ✓ 변환 성공: {doc_path.name}")
-                    else:
-                        failed_files.append((doc_path.name, "PDF 파일이 생성되지 않음"))
-                        self.log(f"  ⚠️ 변환 실패: {doc_path.name} (PDF 파일이 생성되지 않음)")
-                except Exception as e:
-                    failed_files.append((doc_path.name, str(e)))
-                    self.log(f"  ⚠️ 변환 실패: {doc_path.name} - {str(e)}")
-                    # 변환 실패해도 계속 진행
-                current_file += 1
-
-            self.update_progress(80, "PDF 병합 준비 중")
-            self.log("PDF 병합을 시작합니다...")
-            merger = PdfWriter()
-            all_pdf_files = []
-            for f in original_files_to_process:
-                if f.suffix.lower() in self.image_extensions or f.suffix.lower() in self.doc_extensions:
-                    # 이미지나 문서 파일은 변환된 PDF 사용
-                    temp_pdf = source_folder / f"{self.TEMP_PREFIX}{f.stem}.pdf"
-                    if temp_pdf.exists():  # 변환 성공한 파일만 추가
-                        all_pdf_files.append(temp_pdf)
-                    else:
-                        self.log(f"  ⚠️ 건너뛰기: {f.name} (변환 실패)")
-                        # 이미 failed_files에 추가되어 있음
-                else:
-                    # 원본 PDF 사용
-                    if f.exists():
-                        all_pdf_files.append(f)
-                        successfully_merged.append(f.name)
-                    else:
-                        failed_files.append((f.name, "파일을 찾을 수 없음"))
-                        self.log(f"  ⚠️ 건너뛰기: {f.name} (파일을 찾을 수 없음)")
-
-            total_pdfs = len(all_pdf_files)
-            for idx, pdf_path in enumerate(all_pdf_files):
-                self.log(f"  -> 추가: {pdf_path.name.replace(self.TEMP_PREFIX, '')}")
-                self.update_progress(80 + (idx / total_pdfs) * 15, "PDF 병합 중")
-                merger.append(str(pdf_path))
-
-            self.update_progress(95, "파일 저장 중")
-            output_filename = f"{source_folder.name}{self.MERGED_SUFFIX}"
-            output_path = source_folder / output_filename
-            with open(output_path, "wb") as output_file:
-                merger.write(output_file)
-            merger.close()
-
-            self.update_progress(100, "완료!")
+            output_path = default_output_path(source_folder)
+            options = self._merge_options()
+            try:
+                with options.tracer or NULL_TRACER:
+                    report = merge_folder(
+                        original_files_to_process,
+                        output_path,
+                        options,
+                        log=self.log,
+                        progress=self.update_progress
+                    )
+            finally:
+                self._save_trace(options, trace_path_for(output_path))
 
             # 최종 요약 메시지
-            self.log("\n" + "="*60)
-            self.log("📊 병합 완료 요약")
-            self.log("="*60)
-            self.log(f"총 파일 수: {total_files}개")
-            self.log(f"성공적으로 병합된 파일: {len(successfully_merged)}개")
-            self.log(f"실패한 파일: {len(failed_files)}개")
-
-            if successfully_merged:
-                self.log("\n✅ 병합에 포함된 파일:")
-                for idx, file_name in enumerate(successfully_merged, 1):
-                    self.log(f"  {idx}. {file_name}")
-
-            if failed_files:
-                self.log("\n⚠️ 병합에서 제외된 파일:")
-                for idx, (file_name, reason) in enumerate(failed_files, 1):
-                    self.log(f"  {idx}. {file_name} - {reason}")
-
-            self.log(f"\n💾 저장된 파일: {output_path}")
-            self.log("="*60 + "\n")
+            for line in report.summary_lines():
+                self.log(line)
 
             # 메시지 박스 내용도 요약 포함
             summary_msg = f"병합이 완료되었습니다!\n\n"
-            summary_msg += f"총 {total_files}개 중 {len(successfully_merged)}개 파일 병합 성공\n"
+            summary_msg += f"총 {report.total_files}개 중 {len(report.successfully_merged)}개 파일 병합 성공\n"
 
-            if failed_files:
-                summary_msg += f"\n⚠️ {len(failed_files)}개 파일 실패:\n"
-                for file_name, reason in failed_files:
+            if report.failed_files:
+                summary_msg += f"\n⚠️ {len(report.failed_files)}개 파일 실패:\n"
+                for file_name, reason in report.failed_files:
                     # 이유가 너무 길면 축약
                     short_reason = reason if len(reason) < 50 else reason[:47] + "..."
                     summary_msg += f"  • {file_name}\n    ({short_reason})\n"
                 summary_msg += "\n자세한 내용은 아래 '진행 상황'을 확인하세요.\n"
 
-            summary_msg += f"\n저장된 파일:\n{output_path}"
+            if report.dropped_files:
+                summary_msg += f"\n🔁 중복이라 뺀 파일 {len(report.dropped_files)}개:\n"
+                summary_msg += "".join(f"  • {file_name}\n" for file_name, _ in report.dropped_files)
+            elif report.duplicate_files:
+                summary_msg += f"\n🔁 내용이 같은 파일 {len(report.duplicate_files)}개 (병합에 포함됨)\n"
+
+            if report.output_parts:
+                summary_msg += f"\n저장된 파일 ({len(report.output_parts)}개로 나눔):\n"
+                summary_msg += "\n".join(f"  • {path.name} ({format_bytes(size)})" for path, _, size in report.output_parts)
+            else:
+                summary_msg += f"\n저장된 파일:\n{report.output_path}"
 
             messagebox.showinfo("성공", summary_msg)
 
@@ -782,19 +761,125 @@ class PdfMergerApp:
             messagebox.showerror("오류", f"병합 중 오류가 발생했습니다:\n{e}")
 
         finally:
-            self.log("임시 파일을 삭제합니다.")
-            for temp_path in temp_pdf_paths:
-                if temp_path.exists():
-                    os.remove(temp_path)
-            
+            self.root.after(0, self._finalize_ui)
+
+    def _merge_options(self):
+        from image_convert import ImagePolicy
+
+        split_max_mb = 0
+        if self.split_output.get():
+            try:
+                split_max_mb = float(self.split_max_mb.get())
+            except ValueError:
+                split_max_mb = 0
+            if split_max_mb <= 0:
+                raise ValueError("나눠 저장할 파트 크기(MB)를 0보다 큰 숫자로 입력해주세요.")
+        return MergeOptions(
+            cache=ConversionCache(),
+            image_policy=ImagePolicy() if self.shrink_images.get() else None,
+            split_max_mb=split_max_mb,
+            duplicate_policy='skip' if self.skip_duplicates.get() else 'off',
+            tracer=MergeTracer() if self.record_trace.get() else None
+        )
+
+    def _save_trace(self, options, path):
+        """성능 기록을 켰으면 Chrome trace JSON과 CSV로 저장합니다."""
+        if options.tracer is None:
+            return
+        try:
+            json_path, csv_path = options.tracer.save(path)
+        except OSError as e:
+            self.log(f"⚠️ 성능 기록 저장 실패: {e}")
+        else:
+            self.log(f"성능 기록 저장: {json_path} (chrome://tracing에서 열기), {csv_path}")
+
+    def start_batch_thread(self):
+        if not self.folder_path.get():
+            messagebox.showerror("오류", "먼저 하위 폴더가 들어 있는 상위 폴더를 선택해주세요.")
+            return
+        self.merge_button.config(state='disabled')
+        self.batch_button.config(state='disabled', text="일괄 병합 중...")
+        thread = threading.Thread(target=self.batch_merge)
+        thread.daemon = True
+        thread.start()
+
+    def batch_merge(self):
+        try:
+            self.update_progress(0, "시작 중")
+            root_folder = Path(self.folder_path.get())
+            options = self._merge_options()
+            try:
+                with options.tracer or NULL_TRACER:
+                    report = run_batch(
+                        root_folder,
+                        options,
+                        log=self.log,
+                        progress=self.update_progress
+                    )
+            finally:
+                self._save_trace(options, root_folder / f"{root_folder.name}_batch.trace.json")
+            if not report.jobs:
+                self.log("병합할 파일이 있는 하위 폴더가 없습니다.")
+                messagebox.showinfo("완료", "병합할 파일이 있는 하위 폴더가 없습니다.")
+                return
+
+            for line in report.summary_lines():
+                self.log(line)
+
+            done = len(report.jobs) - len(report.failed_jobs)
+            summary_msg = f"일괄 병합이 완료되었습니다!\n\n총 {len(report.jobs)}개 폴더 중 {done}개 병합 성공\n"
+            if report.partial_jobs:
+                summary_msg += f"\n⚠️ 일부 파일이 제외된 폴더 {len(report.partial_jobs)}개\n"
+            if report.failed_jobs:
+                summary_msg += f"\n❌ {len(report.failed_jobs)}개 폴더 실패:\n"
+                for job in report.failed_jobs:
+                    short_reason = job.error if len(job.error) < 50 else job.error[:47] + "..."
+                    summary_msg += f"  • {job.name}\n    ({short_reason})\n"
+            summary_msg += "\n자세한 내용은 아래 '진행 상황'을 확인하세요."
+            messagebox.showinfo("성공", summary_msg)
+
+        except Exception as e:
+            self.log(f"\n❌ 오류: 일괄 병합 중 문제가 발생했습니다. {e}")
+            messagebox.showerror("오류", f"일괄 병합 중 오류가 발생했습니다:\n{e}")
+
+        finally:
             self.root.after(0, self._finalize_ui)
 
     def _finalize_ui(self):
         self.merge_button.config(state='normal', text="병합 시작")
+        self.batch_button.config(state='normal', text="하위 폴더 일괄 병합 (폴더마다 따로 저장)")
         self.update_progress(0, "대기 중")
         self.update_file_list()
 
-if __name__ == "__main__":
+    def apply_preferred_font(self):
+        """설치된 글꼴에 Noto Sans KR이 있으면 모든 글꼴을 바꿉니다 (창을 띄운 뒤 호출)."""
+        available_fonts = set(tkfont.families())
+        for font_name in PREFERRED_FONT_FAMILIES:
+            if font_name in available_fonts:
+                for font in self.fonts.values():
+                    font.configure(family=font_name)
+                break
+
+
+def main():
+    import multiprocessing
+
+    # PyInstaller 실행 파일에서 이미지 변환 프로세스를 띄울 때 필요
+    multiprocessing.freeze_support()
     root = tk.Tk()
     app = PdfMergerApp(root)
-    root.mainloop()
\ No newline at end of file
+    # 창을 먼저 그린 뒤 글꼴 목록을 조회
+    root.update()
+    painted = time.perf_counter()
+    app.apply_preferred_font()
+    report_path = os.environ.get(STARTUP_REPORT_ENV)
+    if report_path:
+        # startup_timing 측정 실행: 시간을 기록하고 바로 종료
+        write_startup_report(report_path, _STARTED, _IMPORTED, painted, time.perf_counter())
+        root.destroy()
+        return
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
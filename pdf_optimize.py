@@ -0,0 +1,333 @@
+"""병합된 PDF의 용량을 줄이는 후처리
+
+같은 서식(Word/한글 템플릿)에서 나온 PDF를 여러 개 합치면 같은 글꼴, 로고, ICC
+프로파일이 원본 파일 수만큼 들어갑니다. optimize_pdf는 출력 파일을 다시 읽어
+
+1. 내용이 같은 객체(스트림 포함)를 하나로 합치고
+2. 압축되지 않은 스트림을 FlateDecode로 압축한 뒤
+3. 스트림이 아닌 객체를 객체 스트림(ObjStm)에 묶고 xref 스트림으로 저장합니다.
+
+객체를 하나씩 읽어 지문(해시)만 메모리에 두므로 큰 파일도 처리할 수 있습니다.
+"""
+import hashlib
+import os
+import zlib
+from collections import deque
+from dataclasses import dataclass
+from io import BytesIO
+
+from pypdf import PdfReader
+from pypdf.generic import (
+    ArrayObject, DictionaryObject, IndirectObject, NameObject, NullObject, NumberObject, StreamObject
+)
+
+from pypdf_internals import clear_object_cache, copy_stream_data, encoded_data, new_encoded_stream
+
+PDF_HEADER = b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n"
+# 객체 스트림 하나에 묶을 최대 객체 수
+OBJECTS_PER_STREAM = 200
+# 리더의 객체 캐시를 비우는 주기 (객체 수, 스트림을 읽은 뒤에는 바로 비움)
+CACHE_CLEAR_INTERVAL = 1000
+# 같은 내용이어도 합치면 안 되는 객체 (페이지마다 따로 있어야 하는 것)
+UNIQUE_TYPES = {"/Catalog", "/Pages", "/Page", "/Annot", "/OCG", "/StructElem", "/StructTreeRoot"}
+
+
+def _noop(*args, **kwargs):
+    pass
+
+
+@dataclass
+class OptimizeResult:
+    """최적화 결과"""
+    size_before: int = 0
+    size_after: int = 0
+    objects_before: int = 0
+    objects_after: int = 0
+    # 같은 내용이라 합쳐진 객체 수
+    duplicates_removed: int = 0
+    # 새로 압축한 스트림 수
+    streams_compressed: int = 0
+
+
+def _is_unique(obj):
+    """페이지, 주석, 양식 필드처럼 위치마다 따로 있어야 하는 객체인지 확인합니다."""
+    if not isinstance(obj, DictionaryObject):
+        return False
+    if obj.get("/Type") in UNIQUE_TYPES:
+        return True
+    # /Type 없는 주석과 양식 필드
+    return "/Rect" in obj or "/FT" in obj
+
+
+def _fingerprint(obj, refs, out):
+    """간접 참조 번호를 뺀 객체 내용을 out에 기록하고 참조 번호는 refs에 순서대로 모읍니다."""
+    if isinstance(obj, IndirectObject):
+        refs.append(obj.idnum)
+        out.write(b"R;")
+    elif isinstance(obj, DictionaryObject):
+        out.write(b"<<")
+        # 키 순서가 달라도 같은 사전으로 취급
+        for key in sorted(obj):
+            if isinstance(obj, StreamObject) and key == "/Length":
+                continue
+            out.write(key.encode("utf-8", "surrogatepass") + b" ")
+            _fingerprint(obj[key], refs, out)
+        out.write(b">>")
+        if isinstance(obj, StreamObject):
+            out.write(b"stream" + hashlib.sha256(encoded_data(obj)).digest())
+    elif isinstance(obj, ArrayObject):
+        out.write(b"[")
+        for value in obj:
+            _fingerprint(value, refs, out)
+        out.write(b"]")
+    else:
+        obj.write_to_stream(out)
+        out.write(b";")
+
+
+def _child_refs(obj):
+    """객체가 직접 가리키는 간접 참조 번호 (스트림의 /Length 제외)"""
+    refs = []
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, IndirectObject):
+            refs.append(item.idnum)
+        elif isinstance(item, DictionaryObject):
+            for key, value in item.items():
+                if not (isinstance(item, StreamObject) and key == "/Length"):
+                    stack.append(value)
+        elif isinstance(item, ArrayObject):
+            stack.extend(item)
+    return refs
+
+
+class _Records:
+    """객체 번호 -> 지문/참조 목록. 내용이 같은 객체를 대표 번호 하나로 묶습니다."""
+
+    def __init__(self):
+        self.order = []        # 루트에서 찾은 순서
+        self.content = {}      # 번호 -> 참조 번호를 뺀 내용의 해시 (합치면 안 되는 객체는 None)
+        self.refs = {}         # 번호 -> 참조 번호 튜플
+        self.canonical = {}    # 번호 -> 대표 번호 (자기 자신이 대표면 없음)
+
+    def add(self, number, obj):
+        refs = []
+        if _is_unique(obj):
+            content = None
+            refs = _child_refs(obj)
+        else:
+            out = BytesIO()
+            _fingerprint(obj, refs, out)
+            content = hashlib.sha256(out.getvalue()).digest()
+        self.order.append(number)
+        self.content[number] = content
+        self.refs[number] = tuple(refs)
+        return refs
+
+    def find(self, number):
+        while number in self.canonical:
+            number = self.canonical[number]
+        return number
+
+    def deduplicate(self):
+        """참조 대상까지 같은 객체를 더 합쳐지지 않을 때까지 반복해서 합칩니다.
+
+        글꼴 파일 스트림이 합쳐지면 그것을 가리키는 FontDescriptor가 같아지고,
+        다시 그것을 가리키는 Font 사전이 같아지는 식으로 몇 번 반복됩니다.
+        """
+        merged = 0
+        changed = True
+        while changed:
+            changed = False
+            seen = {}
+            for number in self.order:
+                content = self.content[number]
+                if content is None or number in self.canonical:
+                    continue
+                key = (content, tuple(self.find(ref) for ref in self.refs[number]))
+                first = seen.setdefault(key, number)
+                if first != number:
+                    self.canonical[number] = first
+                    merged += 1
+                    changed = True
+        return merged
+
+
+def _compress_stream(stream):
+    """필터 없는 스트림을 FlateDecode로 압축한 사본을 돌려주고, 줄지 않으면 None"""
+    if "/Filter" in stream or "/DecodeParms" in stream:
+        return None
+    data = encoded_data(stream)
+    compressed = zlib.compress(data, 6)
+    if len(compressed) >= len(data):
+        return None
+    copy = new_encoded_stream(compressed)
+    for key, value in stream.items():
+        copy[key] = value
+    copy[NameObject("/Filter")] = NameObject("/FlateDecode")
+    return copy
+
+
+class _ObjectStreamWriter:
+    """새 번호로 객체를 쓰고, 스트림이 아닌 객체는 객체 스트림에 묶어 xref 스트림으로 마무리합니다."""
+
+    def __init__(self, file, first_free_number):
+        self.file = file
+        self.entries = {}  # 번호 -> (1, 파일 위치, 0) 또는 (2, 객체 스트림 번호, 순번)
+        self.next_number = first_free_number
+        self._batch = []   # (번호, 직렬화된 객체)
+
+    def _allocate(self):
+        number = self.next_number
+        self.next_number += 1
+        return number
+
+    def _write_indirect(self, number, obj):
+        self.entries[number] = (1, self.file.tell(), 0)
+        self.file.write(f"{number} 0 obj\n".encode())
+        obj.write_to_stream(self.file)
+        self.file.write(b"\nendobj\n")
+
+    def add(self, number, obj):
+        if isinstance(obj, StreamObject):
+            self._write_indirect(number, obj)
+            return
+        out = BytesIO()
+        obj.write_to_stream(out)
+        self._batch.append((number, out.getvalue()))
+        if len(self._batch) >= OBJECTS_PER_STREAM:
+            self._flush()
+
+    def _flush(self):
+        if not self._batch:
+            return
+        stream_number = self._allocate()
+        header = []
+        body = BytesIO()
+        for position, (number, data) in enumerate(self._batch):
+            header.append(f"{number} {body.tell()}")
+            body.write(data + b"\n")
+            self.entries[number] = (2, stream_number, position)
+        header = (" ".join(header) + "\n").encode()
+        stream = new_encoded_stream(zlib.compress(header + body.getvalue(), 6))
+        stream[NameObject("/Type")] = NameObject("/ObjStm")
+        stream[NameObject("/N")] = NumberObject(len(self._batch))
+        stream[NameObject("/First")] = NumberObject(len(header))
+        stream[NameObject("/Filter")] = NameObject("/FlateDecode")
+        self._write_indirect(stream_number, stream)
+        self._batch = []
+
+    def finish(self, root_number, info_number=None):
+        """남은 객체를 묶고 xref 스트림과 trailer를 씁니다."""
+        self._flush()
+        xref_number = self._allocate()
+        size = self.next_number
+        xref_offset = self.file.tell()
+        self.entries[xref_number] = (1, xref_offset, 0)
+
+        offset_width = max(1, (max(xref_offset, size).bit_length() + 7) // 8)
+        rows = BytesIO()
+        for number in range(size):
+            kind, field2, field3 = self.entries.get(number, (0, 0, 0))
+            rows.write(bytes([kind]) + field2.to_bytes(offset_width, "big") + field3.to_bytes(2, "big"))
+
+        trailer = (f"/Type /XRef /Size {size} /W [1 {offset_width} 2] /Root {root_number} 0 R "
+                   + (f"/Info {info_number} 0 R " if info_number else "")
+                   + "/Filter /FlateDecode")
+        data = zlib.compress(rows.getvalue(), 6)
+        self.file.write(f"{xref_number} 0 obj\n<< {trailer} /Length {len(data)} >>\nstream\n".encode())
+        self.file.write(data)
+        self.file.write(b"\nendstream\nendobj\n")
+        self.file.write(f"startxref\n{xref_offset}\n%%EOF\n".encode())
+
+
+def optimize_pdf(input_path, output_path, log=_noop):
+    """input_path PDF의 중복 객체를 합치고 압축해 output_path에 씁니다. OptimizeResult를 돌려줍니다."""
+    result = OptimizeResult(size_before=os.path.getsize(input_path))
+    records = _Records()
+
+    # 경로를 넘기면 pypdf가 파일 전체를 메모리에 읽으므로 파일 객체로 넘김
+    with open(input_path, "rb") as input_file, PdfReader(input_file) as reader:
+        trailer = reader.trailer
+        roots = [trailer.raw_get("/Root").idnum]
+        info = trailer.raw_get("/Info") if "/Info" in trailer else None
+        if isinstance(info, IndirectObject):
+            roots.append(info.idnum)
+        else:
+            info = None
+
+        # 1단계: 루트에서 닿는 객체를 모두 찾아 지문을 기록
+        found = set(roots)
+        queue = deque(roots)
+        while queue:
+            number = queue.popleft()
+            obj = reader.get_object(number)
+            if obj is None:
+                continue
+            for ref in records.add(number, obj):
+                if ref not in found:
+                    found.add(ref)
+                    queue.append(ref)
+            if isinstance(obj, StreamObject) or len(records.order) % CACHE_CLEAR_INTERVAL == 0:
+                clear_object_cache(reader)
+        clear_object_cache(reader)
+        result.objects_before = len(records.order)
+
+        # 2단계: 같은 객체 합치기
+        result.duplicates_removed = records.deduplicate()
+        if result.duplicates_removed:
+            log(f"    [최적화] 중복 객체 {result.duplicates_removed}개를 하나로 합쳤습니다.")
+
+        # 3단계: 대표 객체만 새 번호로 다시 쓰기
+        new_numbers = {}
+        for number in records.order:
+            if number not in records.canonical:
+                new_numbers[number] = len(new_numbers) + 1
+        result.objects_after = len(new_numbers)
+
+        def translate(obj):
+            if isinstance(obj, IndirectObject):
+                target = new_numbers.get(records.find(obj.idnum))
+                # 루트에서 닿지 않는 (깨진) 참조는 null로 처리
+                return IndirectObject(target, 0, None) if target else NullObject()
+            if isinstance(obj, StreamObject):
+                copy = copy_stream_data(obj)
+                for key, value in obj.items():
+                    if key != "/Length":
+                        copy[key] = translate(value)
+                compressed = _compress_stream(copy)
+                if compressed is not None:
+                    result.streams_compressed += 1
+                    return compressed
+                return copy
+            if isinstance(obj, DictionaryObject):
+                copy = DictionaryObject()
+                for key, value in obj.items():
+                    copy[key] = translate(value)
+                return copy
+            if isinstance(obj, ArrayObject):
+                return ArrayObject(translate(value) for value in obj)
+            return obj
+
+        temp_path = str(output_path) + ".part"
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(PDF_HEADER)
+                writer = _ObjectStreamWriter(f, len(new_numbers) + 1)
+                for count, (number, new_number) in enumerate(new_numbers.items(), 1):
+                    obj = reader.get_object(number)
+                    writer.add(new_number, translate(obj))
+                    if isinstance(obj, StreamObject) or count % CACHE_CLEAR_INTERVAL == 0:
+                        clear_object_cache(reader)
+                writer.finish(new_numbers[roots[0]], new_numbers.get(info.idnum) if info else None)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    os.replace(temp_path, output_path)
+    result.size_after = os.path.getsize(output_path)
+    if result.streams_compressed:
+        log(f"    [최적화] 압축되지 않은 스트림 {result.streams_compressed}개를 압축했습니다.")
+    return result
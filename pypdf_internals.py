@@ -0,0 +1,72 @@
+"""pypdf 내부 속성 접근 (한곳에 모음)
+
+pypdf에는 스트림의 압축된 바이트를 그대로 읽고 쓰거나, 리더가 읽어 둔 객체 캐시를 비우는
+공개 API가 없어서 내부 속성(StreamObject._data, PdfReader.resolved_objects)을 씁니다.
+pypdf를 올렸을 때 이 속성이 없어지면 조용히 다르게 동작하지 않고 바로 오류를 내도록
+모든 접근을 이 모듈에서만 합니다.
+"""
+from pypdf.generic import DecodedStreamObject, EncodedStreamObject
+
+
+class PypdfInternalsError(RuntimeError):
+    """설치된 pypdf에 이 프로그램이 쓰는 내부 속성이 없음"""
+
+
+def _missing(name):
+    import pypdf
+
+    return PypdfInternalsError(f"pypdf {pypdf.__version__}에 {name}이(가) 없습니다 "
+                               f"(pypdf_internals.py를 새 버전에 맞게 고쳐야 합니다)")
+
+
+def encoded_data(stream):
+    """스트림의 (필터가 적용된) 원본 바이트 (압축을 풀지 않음)"""
+    if not isinstance(stream, EncodedStreamObject):
+        return stream.get_data()
+    try:
+        return stream._data
+    except AttributeError:
+        raise _missing("StreamObject._data") from None
+
+
+def _check_stream_data():
+    """_data에 넣은 바이트를 pypdf가 그대로 쓰는지 한 번 확인합니다."""
+    from io import BytesIO
+
+    stream = EncodedStreamObject()
+    stream._data = b"check"
+    out = BytesIO()
+    stream.write_to_stream(out)
+    if b"stream\ncheck\nendstream" not in out.getvalue():
+        raise _missing("StreamObject._data")
+
+
+_stream_data_checked = False
+
+
+def new_encoded_stream(data):
+    """이미 필터가 적용된 바이트로 스트림을 만듭니다 (사전 항목은 호출 측이 채움)."""
+    global _stream_data_checked
+    if not _stream_data_checked:
+        _check_stream_data()
+        _stream_data_checked = True
+    stream = EncodedStreamObject()
+    stream._data = data
+    return stream
+
+
+def copy_stream_data(stream):
+    """같은 바이트를 가진 빈 사전의 스트림 (압축된 스트림은 압축을 풀지 않고 그대로 옮김)"""
+    if isinstance(stream, EncodedStreamObject):
+        return new_encoded_stream(encoded_data(stream))
+    copy = DecodedStreamObject()
+    copy.set_data(stream.get_data())
+    return copy
+
+
+def clear_object_cache(reader):
+    """리더가 읽어 둔 객체를 버립니다 (이미 쓴 객체를 메모리에 두지 않도록)."""
+    try:
+        reader.resolved_objects.clear()
+    except AttributeError:
+        raise _missing("PdfReader.resolved_objects") from None
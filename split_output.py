@@ -0,0 +1,125 @@
+"""출력을 크기/쪽수 상한에 맞춰 여러 PDF로 나눠 씁니다 (<폴더명>_merged_part01.pdf, ...)
+
+업로드 포털의 첨부 용량 제한(10~20MB)에 맞추려고 병합 결과를 다시 나누지 않고,
+병합하는 동안 파트마다 StreamingPdfMerger로 바로 씁니다. 지금 파트의 크기(쓴 바이트)에
+다음 원본의 크기를 더해 상한을 넘으면 새 파트를 시작하므로 원본 하나가 두 파트로
+나뉘지 않습니다. 원본 하나만으로 상한을 넘으면 그 원본 혼자 한 파트가 됩니다.
+"""
+import os
+import re
+from pathlib import Path
+
+
+def _noop(*args, **kwargs):
+    pass
+
+
+def part_path_for(output_path, number):
+    """파트 파일 경로 (예: 폴더_merged.pdf -> 폴더_merged_part01.pdf)"""
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.stem}_part{number:02d}{output_path.suffix}")
+
+
+def part_pattern_for(output_path):
+    """output_path의 파트 파일 이름에 맞는 정규식"""
+    output_path = Path(output_path)
+    return re.compile(re.escape(output_path.stem) + r"_part\d{2,}" + re.escape(output_path.suffix) + "$",
+                      re.IGNORECASE)
+
+
+def existing_parts(output_path):
+    """출력 폴더에 있는 output_path의 파트 파일 경로 목록"""
+    output_path = Path(output_path)
+    pattern = part_pattern_for(output_path)
+    try:
+        return sorted(path for path in output_path.parent.iterdir() if pattern.match(path.name))
+    except OSError:
+        return []
+
+
+class SplitPdfMerger:
+    """원본 단위로 끊어서 파트 파일 여러 개에 이어 쓰는 병합기
+
+    max_bytes/max_pages: 파트 하나의 최대 크기(바이트)/쪽수 (0이면 제한 없음)
+    close()는 [(파트 경로, 쪽수, 크기)]를 돌려줍니다.
+    """
+
+    def __init__(self, output_path, max_bytes=0, max_pages=0, log=_noop):
+        self.output_path = Path(output_path)
+        self.max_bytes = max_bytes
+        self.max_pages = max_pages
+        self.log = log
+        self.parts = []       # 완성된 파트 [(경로, 쪽수, 크기)]
+        self._current = None  # 쓰는 중인 파트
+        self._previous_pages = 0
+
+    @property
+    def page_count(self):
+        """모든 파트를 합친 쪽수"""
+        return self._previous_pages + (self._current.page_count if self._current else 0)
+
+    def _fits(self, size, pages):
+        current = self._current
+        if current is None or not current.page_count:
+            return True  # 빈 파트에는 상한을 넘어도 넣음 (원본을 나누지 않음)
+        if self.max_bytes and current.size + size > self.max_bytes:
+            return False
+        if self.max_pages and current.page_count + pages > self.max_pages:
+            return False
+        return True
+
+    def _finish_part(self):
+        current, self._current = self._current, None
+        current.close()
+        path = Path(current.output_path)
+        self.parts.append((path, current.page_count, path.stat().st_size))
+        self._previous_pages += current.page_count
+
+    def append(self, source, pages=None):
+        """PDF 하나를 덧붙입니다. 지금 파트에 들어가지 않으면 새 파트를 시작합니다.
+
+        source: 경로 또는 파일 객체, pages: (시작, 끝) 페이지 구간 (None이면 전체)
+        """
+        # 파트 파일 이름 함수만 쓰는 곳(폴더 목록)에서 pypdf를 불러오지 않도록 여기서 불러옴
+        from pypdf import PdfReader
+        from streaming_merge import StreamingPdfMerger
+
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as f:
+                return self.append(f, pages)
+        # 원본 크기로 덧붙일 바이트를 어림잡음 (공유 객체를 다시 쓰지 않으므로 보통 실제보다 큼)
+        source.seek(0, os.SEEK_END)
+        size = source.tell()
+        source.seek(0)
+        with PdfReader(source) as reader:
+            selected = range(*slice(*pages).indices(len(reader.pages))) if pages else range(len(reader.pages))
+            if not self._fits(size, len(selected)):
+                self._finish_part()
+            if self._current is None:
+                path = part_path_for(self.output_path, len(self.parts) + 1)
+                self.log(f"  📄 새 파트 시작: {path.name}")
+                self._current = StreamingPdfMerger(path)
+            try:
+                return self._current.append(reader, pages)
+            finally:
+                self._current.release(reader)
+
+    def close(self):
+        """쓰는 중인 파트를 완성하고, 이전 실행에서 남은 번호가 더 큰 파트를 지웁니다."""
+        if self._current is not None:
+            self._finish_part()
+        written = {path.name.lower() for path, _, _ in self.parts}
+        for path in existing_parts(self.output_path):
+            if path.name.lower() not in written:
+                os.remove(path)
+        return self.parts
+
+    def abort(self):
+        """쓰는 중인 파트를 지우고, 이번 실행에서 완성한 파트도 지웁니다 (일부만 남지 않게)."""
+        if self._current is not None:
+            self._current.abort()
+            self._current = None
+        for path, _, _ in self.parts:
+            if path.exists():
+                os.remove(path)
+        self.parts = []
@@ -0,0 +1,171 @@
+"""GUI 시작 시간 측정 (모듈 불러오기, 창이 처음 그려지기까지)
+
+    python startup_timing.py                        # pdf_merger_gui.py를 5번 띄워 측정
+    python startup_timing.py --exe "dist/증빙자료_취합_프로그램_v7.0.exe"   # 빌드한 실행 파일
+    python startup_timing.py --import-only          # 화면 없이 모듈 불러오기만 측정
+    python startup_timing.py --max-first-paint-ms 800 --compare 이전결과.json
+
+측정 실행은 환경 변수 PDF_MERGER_STARTUP_REPORT에 결과 파일 경로를 넣어 GUI를 띄우고,
+GUI(main)는 창을 그린 직후 시간을 기록하고 바로 종료합니다. 프로세스를 띄운 때부터 창이
+그려질 때까지(cold start, 실행 파일 압축 풀기 포함)와 프로세스 안에서 잰 모듈 불러오기,
+첫 화면, 글꼴 조회 시간을 중앙값으로 보고합니다.
+
+창을 그리기 전에 무거운 모듈(HEAVY_MODULES)이 불려 있거나 시간 상한을 넘으면 종료 코드 1을
+돌려주므로 시작 시간 회귀 검사로 쓸 수 있습니다.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# GUI가 이 환경 변수의 경로에 시작 시간을 기록하고 종료
+STARTUP_REPORT_ENV = "PDF_MERGER_STARTUP_REPORT"
+# 창을 띄울 때는 불러오지 않아야 하는 모듈 (병합을 시작할 때 불러옴)
+HEAVY_MODULES = ('pypdf', 'PIL', 'win32com', 'pythoncom')
+DEFAULT_RUNS = 5
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 1)
+
+
+def loaded_heavy_modules():
+    """이미 불러온 무거운 모듈 이름"""
+    return [name for name in HEAVY_MODULES if name in sys.modules]
+
+
+def write_startup_report(path, started, imported, painted, fonts_done):
+    """GUI 측정 실행에서 호출: 시각(perf_counter)들을 ms로 바꿔 JSON으로 기록합니다."""
+    report = {
+        'painted_at': time.time() - (time.perf_counter() - painted),
+        'import_ms': _ms(imported - started),
+        'first_paint_ms': _ms(painted - started),
+        'fonts_ms': _ms(fonts_done - painted),
+        'heavy_modules': loaded_heavy_modules(),
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f)
+
+
+def measure_import():
+    """이 프로세스에서 pdf_merger_gui를 불러오는 시간 (화면 필요 없음)"""
+    started = time.perf_counter()
+    import pdf_merger_gui  # noqa: F401
+    return {'import_ms': _ms(time.perf_counter() - started), 'heavy_modules': loaded_heavy_modules()}
+
+
+def run_once(command, import_only=False, timeout=120):
+    """새 프로세스로 한 번 측정합니다."""
+    if import_only:
+        spawned = time.time()
+        result = subprocess.run(command + ['--child-import'], capture_output=True, text=True,
+                                timeout=timeout, cwd=Path(__file__).parent)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip() or f"종료 코드 {result.returncode}")
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        report['process_ms'] = _ms(time.time() - spawned)
+        return report
+
+    fd, report_path = tempfile.mkstemp(suffix='.json', prefix='startup_')
+    os.close(fd)
+    try:
+        env = dict(os.environ, **{STARTUP_REPORT_ENV: report_path})
+        spawned = time.time()
+        result = subprocess.run(command, env=env, capture_output=True, text=True, timeout=timeout)
+        with open(report_path, encoding='utf-8') as f:
+            text = f.read()
+        if not text:
+            raise RuntimeError(result.stderr.strip() or f"시간 기록이 없습니다 (종료 코드 {result.returncode})")
+        report = json.loads(text)
+    finally:
+        os.remove(report_path)
+    # 프로세스를 띄운 때부터 창이 그려질 때까지 (인터프리터 시작/실행 파일 압축 풀기 포함)
+    report['cold_start_ms'] = _ms(report.pop('painted_at') - spawned)
+    return report
+
+
+def summarize(reports):
+    """항목별 중앙값과 한 번이라도 불린 무거운 모듈"""
+    summary = {}
+    for key in reports[0]:
+        if key != 'heavy_modules':
+            summary[key] = round(statistics.median(report[key] for report in reports), 1)
+    summary['heavy_modules'] = sorted({name for report in reports for name in report['heavy_modules']})
+    summary['runs'] = len(reports)
+    return summary
+
+
+def compare(current, previous_path, log=print):
+    """이전 결과 파일과 항목별로 비교해 출력합니다."""
+    with open(previous_path, encoding='utf-8') as f:
+        previous = json.load(f)
+    for key, value in current.items():
+        before = previous.get(key)
+        if isinstance(value, (int, float)) and isinstance(before, (int, float)) and key != 'runs':
+            change = f"{(value - before) / before:+.0%}" if before else "-"
+            log(f"  {key}: {before}ms → {value}ms ({change})")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="GUI 시작 시간(모듈 불러오기, 첫 화면)을 측정합니다.")
+    parser.add_argument("--exe", help="측정할 실행 파일 (기본값: 현재 Python으로 pdf_merger_gui.py)")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help=f"측정 횟수 (기본값: {DEFAULT_RUNS})")
+    parser.add_argument("--import-only", action="store_true", help="창을 띄우지 않고 모듈 불러오기만 측정")
+    parser.add_argument("--max-import-ms", type=float, help="모듈 불러오기 시간 상한 (넘으면 종료 코드 1)")
+    parser.add_argument("--max-first-paint-ms", type=float, help="첫 화면까지 시간 상한 (넘으면 종료 코드 1)")
+    parser.add_argument("--output", metavar="JSON", help="결과를 저장할 파일")
+    parser.add_argument("--compare", metavar="JSON", help="비교할 이전 결과 파일")
+    parser.add_argument("--child-import", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child_import:
+        print(json.dumps(measure_import()))
+        return 0
+
+    if args.exe:
+        if args.import_only:
+            parser.error("--exe와 --import-only는 함께 쓸 수 없습니다")
+        command = [args.exe]
+    elif args.import_only:
+        command = [sys.executable, str(Path(__file__).resolve())]
+    else:
+        command = [sys.executable, str(Path(__file__).with_name('pdf_merger_gui.py'))]
+
+    reports = []
+    for run in range(1, args.runs + 1):
+        try:
+            report = run_once(command, args.import_only)
+        except (RuntimeError, subprocess.TimeoutExpired, OSError) as e:
+            print(f"❌ 측정 실패: {e}", file=sys.stderr)
+            return 2
+        print(f"[{run}/{args.runs}] " + ", ".join(f"{key} {value}" for key, value in report.items()))
+        reports.append(report)
+
+    summary = summarize(reports)
+    print("\n중앙값: " + ", ".join(f"{key} {value}" for key, value in summary.items()))
+    if args.compare:
+        compare(summary, args.compare)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    failed = []
+    if summary['heavy_modules']:
+        failed.append(f"창을 띄우기 전에 불러온 무거운 모듈: {', '.join(summary['heavy_modules'])}")
+    if args.max_import_ms and summary['import_ms'] > args.max_import_ms:
+        failed.append(f"모듈 불러오기 {summary['import_ms']}ms > 상한 {args.max_import_ms}ms")
+    if args.max_first_paint_ms and summary.get('first_paint_ms', 0) > args.max_first_paint_ms:
+        failed.append(f"첫 화면 {summary['first_paint_ms']}ms > 상한 {args.max_first_paint_ms}ms")
+    for message in failed:
+        print(f"❌ {message}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""페이지 객체를 바로 파일에 써 나가는 PDF 병합기
+
+PdfWriter는 모든 입력 PDF의 객체를 메모리에 들고 있다가 마지막에 한 번에 쓰므로
+입력이 커질수록 메모리 사용량이 늘어납니다. StreamingPdfMerger는 원본 PDF 하나를
+읽어 그 페이지와 페이지가 참조하는 객체를 곧바로 출력 파일에 쓰고, 다음 파일로
+넘어가기 전에 원본 리더를 버립니다. 메모리에는 객체 위치(xref)와 페이지 번호
+목록만 남습니다.
+
+책갈피(outline), 이름 있는 목적지, 양식 필드 트리는 옮기지 않습니다.
+"""
+import os
+from collections import deque
+
+from pypdf import PdfReader
+from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, NameObject, NumberObject, StreamObject
+
+from pypdf_internals import clear_object_cache, copy_stream_data
+
+PDF_HEADER = b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n"
+# 예약된 객체 번호
+CATALOG_NUMBER = 1
+PAGES_NUMBER = 2
+
+
+class StreamingPdfMerger:
+    """PDF를 하나씩 받아 페이지 단위로 출력 파일에 이어 쓰는 병합기
+
+    출력은 '<경로>.part'에 쓰다가 close()에서 완성된 파일로 바꿉니다.
+    중간에 실패하면 abort()로 미완성 파일을 지웁니다.
+    """
+
+    def __init__(self, output_path):
+        self.output_path = str(output_path)
+        self._part_path = self.output_path + ".part"
+        self._file = open(self._part_path, "wb")
+        self._file.write(PDF_HEADER)
+        # 객체 번호 -> 파일 내 위치 (0번은 xref의 free 항목, 1/2번은 카탈로그/페이지 트리)
+        self._offsets = [None, None, None]
+        self._kids = []
+        # 호출 측이 연 PdfReader별 (원본 객체 -> 출력 번호 대응표, 페이지 번호 목록)
+        # 같은 리더에서 구간을 여러 번 가져와도 공유 객체는 한 번만 씀
+        self._reader_mappings = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    @property
+    def page_count(self):
+        return len(self._kids)
+
+    @property
+    def size(self):
+        """지금 close()하면 나올 파일 크기 (바이트, 아직 안 쓴 페이지 트리와 xref는 추정)"""
+        # xref 항목은 한 줄 20바이트, 페이지 트리의 Kids 참조는 한 개에 최대 약 11바이트
+        return self._file.tell() + 20 * len(self._offsets) + 11 * len(self._kids) + 200
+
+    def _allocate(self):
+        self._offsets.append(None)
+        return len(self._offsets) - 1
+
+    def _write_object(self, number, obj):
+        self._offsets[number] = self._file.tell()
+        self._file.write(f"{number} 0 obj\n".encode())
+        obj.write_to_stream(self._file)
+        self._file.write(b"\nendobj\n")
+
+    def append(self, source, pages=None):
+        """PDF 하나의 페이지를 출력 끝에 덧붙이고 덧붙인 페이지 수를 돌려줍니다.
+
+        source: 경로, 파일 객체 또는 PdfReader (PdfReader는 호출 측이 닫음)
+        pages: (시작, 끝) 페이지 순번 구간 (None이면 전체, PdfWriter.append와 같은 형식)
+        """
+        if isinstance(source, PdfReader):
+            reader_key = id(source)
+            if reader_key not in self._reader_mappings:
+                self._reader_mappings[reader_key] = (source, {}, None)
+            return self._append_pages(pages, reader_key)
+        if isinstance(source, (str, os.PathLike)):
+            # 경로를 넘기면 pypdf가 파일 전체를 메모리에 읽으므로 파일 객체로 넘김
+            with open(source, "rb") as f:
+                return self.append(f, pages)
+        with PdfReader(source) as reader:
+            reader_key = id(reader)
+            self._reader_mappings[reader_key] = (reader, {}, None)
+            try:
+                return self._append_pages(pages, reader_key)
+            finally:
+                # 원본 리더와 객체 번호 대응표는 여기서 버려짐
+                del self._reader_mappings[reader_key]
+
+    def release(self, reader):
+        """호출 측이 넘긴 PdfReader에서 더 가져오지 않을 때 객체 번호 대응표를 버립니다."""
+        self._reader_mappings.pop(id(reader), None)
+
+    def _append_pages(self, page_range, reader_key):
+        # mapping: (원본 객체 번호, 세대) -> 출력 객체 번호
+        reader, mapping, page_numbers = self._reader_mappings[reader_key]
+        pending = deque()  # 아직 쓰지 않은 (원본 참조, 출력 객체 번호)
+        parent = IndirectObject(PAGES_NUMBER, 0, None)
+
+        def translate(obj):
+            """원본 객체를 출력 번호 체계로 옮긴 사본을 만듭니다 (간접 참조는 번호만 배정)."""
+            if isinstance(obj, IndirectObject):
+                key = (obj.idnum, obj.generation)
+                number = mapping.get(key)
+                if number is None:
+                    number = mapping[key] = self._allocate()
+                    pending.append((obj, number))
+                return IndirectObject(number, 0, None)
+            if isinstance(obj, StreamObject):
+                copy = copy_stream_data(obj)
+                for key, value in obj.items():
+                    if key != "/Length":  # 쓸 때 실제 길이로 다시 채워짐
+                        copy[key] = translate(value)
+                return copy
+            if isinstance(obj, DictionaryObject):
+                copy = DictionaryObject()
+                for key, value in obj.items():
+                    copy[key] = translate(value)
+                return copy
+            if isinstance(obj, ArrayObject):
+                return ArrayObject(translate(value) for value in obj)
+            return obj
+
+        # 페이지끼리 서로 참조(링크 등)해도 같은 번호가 되도록 모든 페이지 번호를 먼저 배정
+        # (구간 밖 페이지는 쓰이지 않으므로 그 페이지를 가리키는 참조는 null로 읽힘)
+        if page_numbers is None:
+            page_numbers = []
+            for page in reader.pages:
+                ref = page.indirect_reference
+                number = self._allocate()
+                mapping[(ref.idnum, ref.generation)] = number
+                page_numbers.append(number)
+            self._reader_mappings[reader_key] = (reader, mapping, page_numbers)
+
+        start, stop = page_range if page_range is not None else (0, len(page_numbers))
+        selected = range(start, min(stop, len(page_numbers)))
+        for index in selected:
+            page, number = reader.pages[index], page_numbers[index]
+            if self._offsets[number] is not None:
+                raise ValueError(f"같은 페이지를 두 번 덧붙일 수 없습니다 (페이지 {index + 1})")
+            # 상속 속성(Resources, MediaBox 등)은 reader.pages가 페이지에 풀어 둠
+            copy = DictionaryObject()
+            for key, value in page.items():
+                copy[key] = parent if key == "/Parent" else translate(value)
+            self._write_object(number, copy)
+            while pending:
+                ref, obj_number = pending.popleft()
+                self._write_object(obj_number, translate(ref.get_object()))
+            # 이미 쓴 객체는 다시 읽을 일이 없으므로 리더의 객체 캐시를 비움
+            clear_object_cache(reader)
+
+        self._kids.extend(page_numbers[index] for index in selected)
+        return len(selected)
+
+    def close(self):
+        """페이지 트리, 카탈로그, xref를 쓰고 출력 파일을 완성합니다."""
+        pages = DictionaryObject({
+            NameObject("/Type"): NameObject("/Pages"),
+            NameObject("/Kids"): ArrayObject(IndirectObject(n, 0, None) for n in self._kids),
+            NameObject("/Count"): NumberObject(len(self._kids)),
+        })
+        self._write_object(PAGES_NUMBER, pages)
+        catalog = DictionaryObject({
+            NameObject("/Type"): NameObject("/Catalog"),
+            NameObject("/Pages"): IndirectObject(PAGES_NUMBER, 0, None),
+        })
+        self._write_object(CATALOG_NUMBER, catalog)
+
+        xref_offset = self._file.tell()
+        lines = [f"xref\n0 {len(self._offsets)}\n", "0000000000 65535 f \n"]
+        for offset in self._offsets[1:]:
+            # 실패한 파일에서 번호만 배정되고 쓰이지 않은 객체는 free 항목
+            lines.append("0000000000 00000 f \n" if offset is None else f"{offset:010d} 00000 n \n")
+        lines.append(f"trailer\n<< /Size {len(self._offsets)} /Root {CATALOG_NUMBER} 0 R >>\n")
+        lines.append(f"startxref\n{xref_offset}\n%%EOF\n")
+        self._file.write("".join(lines).encode())
+        self._file.close()
+        self._reader_mappings.clear()
+        os.replace(self._part_path, self.output_path)
+
+    def abort(self):
+        """미완성 출력 파일을 지웁니다."""
+        self._file.close()
+        if os.path.exists(self._part_path):
+            os.remove(self._part_path)